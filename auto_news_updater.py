@@ -1,5 +1,8 @@
+import io
 import time
 import requests
+from http_client import http_get, http_post
+from log_setup import setup_logging
 import logging
 from datetime import datetime
 import pandas as pd
@@ -22,14 +25,11 @@ NEWS_CSV_URL = "https://drive.google.com/uc?export=download&id=1TIHUF9zKnUVA5AZF
 # CONFIGURAÇÃO DE LOGGING
 # ═══════════════════════════════════════════════════════════════════════
 
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s | %(levelname)s | %(message)s',
+# Terminal + arquivo com rotação por tamanho, escritos pela thread do listener
+setup_logging(
+    fmt='%(asctime)s | %(levelname)s | %(message)s',
     datefmt='%d/%m/%Y %H:%M:%S',
-    handlers=[
-        logging.StreamHandler(),
-        logging.FileHandler('auto_news_updater.log', encoding='utf-8')
-    ]
+    log_file='auto_news_updater.log'
 )
 
 logger = logging.getLogger(__name__)
@@ -41,7 +41,7 @@ logger = logging.getLogger(__name__)
 def verificar_servidor():
     """Verifica se o servidor está online"""
     try:
-        response = requests.get(ENDPOINT_HEALTH, timeout=TIMEOUT)
+        response = http_get(ENDPOINT_HEALTH, timeout=TIMEOUT)
         if response.status_code == 200:
             logger.info("✅ Servidor está online")
             return True
@@ -59,7 +59,7 @@ def verificar_servidor():
 def obter_status_servidor():
     """Obtém status detalhado do servidor"""
     try:
-        response = requests.get(ENDPOINT_STATUS, timeout=TIMEOUT)
+        response = http_get(ENDPOINT_STATUS, timeout=TIMEOUT)
         if response.status_code == 200:
             data = response.json()
             logger.info("📊 Status do Servidor:")
@@ -89,7 +89,7 @@ def forcar_atualizacao():
     """Força atualização de calendário e notícias"""
     try:
         logger.info("📥 Forçando atualização...")
-        response = requests.post(ENDPOINT_UPDATE, timeout=TIMEOUT)
+        response = http_post(ENDPOINT_UPDATE, timeout=TIMEOUT)
 
         if response.status_code == 200:
             data = response.json()
@@ -111,7 +111,10 @@ def forcar_atualizacao():
 def verificar_news_calendar():
     """Lê o CSV no Google Drive e verifica se há atualizações"""
     try:
-        df = pd.read_csv(NEWS_CSV_URL)
+        # Sessão por host do http_client (retry/backoff/keep-alive); o pandas só parseia
+        response = http_get(NEWS_CSV_URL, timeout=TIMEOUT)
+        response.raise_for_status()
+        df = pd.read_csv(io.BytesIO(response.content))
         logger.info(f"📰 CSV carregado do Google Drive com {len(df)} registros.")
         if not df.empty:
             ultima_data = df.iloc[-1].get("date", "N/A")
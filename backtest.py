@@ -0,0 +1,368 @@
+#!/usr/bin/env python3
+"""
+Backtest do pipeline de sinais: reproduz barras OHLC com indicadores, o
+calendário econômico arquivado e o feed de notícias arquivado pelas mesmas
+regras do servidor (linha do tempo de bloqueio, sentimento, score) e simula
+o resultado de cada trade.
+
+Uso: python backtest.py --bars barras.csv [--calendar news_calendar.csv]
+                        [--news noticias.json] [--window impact|fixed]
+                        [--sentiment window|decayed] [--out trades.csv]
+"""
+
+import argparse
+import csv
+import json
+import os
+import sqlite3
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from calendar_parsing import parse_calendar_lines
+from calendar_store import build_timeline, event_ts, impact_window, fixed_window
+from news_cache import NewsCache
+from scoring import score_arrays
+from sentiment_engine import SentimentEngine, published_ts
+
+# Janela fixa do goldai_server.py (EVENT_MINUTES_BEFORE / EVENT_MINUTES_AFTER)
+FIXED_MINUTES_BEFORE = 20
+FIXED_MINUTES_AFTER = 30
+
+# Mesmo tamanho padrão do cache de notícias dos servidores
+NEWS_CACHE_SIZE = 100
+
+# Saída dos trades (distâncias em preço) e tempo máximo posicionado
+DEFAULT_TAKE_PROFIT = 5.0
+DEFAULT_STOP_LOSS = 3.0
+DEFAULT_MAX_BARS = 60
+
+# Períodos dos indicadores calculados quando as colunas não vêm no arquivo
+RSI_PERIOD = 14
+ADX_PERIOD = 14
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# INDICADORES
+# ═══════════════════════════════════════════════════════════════════════
+
+def _wilder(values, period):
+    return values.ewm(alpha=1 / period, adjust=False).mean()
+
+
+def compute_indicators(bars):
+    """Preenche ema5/ema15/ema50, rsi e adx que não vierem nas barras"""
+    close = bars['close']
+    for span in (5, 15, 50):
+        name = f'ema{span}'
+        if name not in bars.columns:
+            bars[name] = close.ewm(span=span, adjust=False).mean()
+
+    if 'rsi' not in bars.columns:
+        delta = close.diff()
+        gain = _wilder(delta.clip(lower=0), RSI_PERIOD)
+        loss = _wilder(-delta.clip(upper=0), RSI_PERIOD)
+        bars['rsi'] = (100 - 100 / (1 + gain / loss)).fillna(50)
+
+    if 'adx' not in bars.columns:
+        high, low = bars['high'], bars['low']
+        up = high.diff()
+        down = -low.diff()
+        plus_dm = up.where((up > down) & (up > 0), 0.0)
+        minus_dm = down.where((down > up) & (down > 0), 0.0)
+        true_range = pd.concat([
+            high - low,
+            (high - close.shift()).abs(),
+            (low - close.shift()).abs()
+        ], axis=1).max(axis=1)
+        atr = _wilder(true_range, ADX_PERIOD)
+        plus_di = 100 * _wilder(plus_dm, ADX_PERIOD) / atr
+        minus_di = 100 * _wilder(minus_dm, ADX_PERIOD) / atr
+        dx = 100 * (plus_di - minus_di).abs() / (plus_di + minus_di)
+        bars['adx'] = _wilder(dx.fillna(0), ADX_PERIOD)
+    return bars
+
+
+def technical_columns(bars):
+    """Ação e confiança técnicas por barra.
+
+    Colunas 'action' e 'confidence' no arquivo (o que o bot mandaria em
+    technical_signal/technical_score) têm prioridade. Sem elas: BUY com
+    EMA5 acima da EMA15, SELL abaixo, e confiança = ADX/50 limitada a 1.
+    """
+    if 'action' in bars.columns:
+        action = bars['action'].fillna('NONE').astype(str).str.upper().to_numpy()
+    else:
+        ema5, ema15 = bars['ema5'].to_numpy(), bars['ema15'].to_numpy()
+        action = np.select([ema5 > ema15, ema5 < ema15], ['BUY', 'SELL'], 'NONE')
+    if 'confidence' in bars.columns:
+        confidence = bars['confidence'].fillna(0).to_numpy(dtype=np.float64)
+    else:
+        confidence = np.clip(bars['adx'].to_numpy(dtype=np.float64) / 50, 0, 1)
+    return action, confidence
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# CARGA DOS ARQUIVOS
+# ═══════════════════════════════════════════════════════════════════════
+
+def load_bars(path):
+    """Barras OHLC (CSV) com coluna 'timestamp' (epoch) ou 'time' (horário local)"""
+    bars = pd.read_csv(path)
+    bars.columns = [column.strip().lower() for column in bars.columns]
+    if 'timestamp' not in bars.columns:
+        # Horário local, como o calendário: mesmo datetime.timestamp() do EventStore
+        times = pd.to_datetime(bars['time']).dt.to_pydatetime()
+        bars['timestamp'] = [t.timestamp() for t in times]
+    bars = bars.sort_values('timestamp', kind='stable').reset_index(drop=True)
+    return compute_indicators(bars)
+
+
+def load_calendar(path):
+    """Calendário arquivado no formato do CSV do Google Drive (todos os eventos, sem filtro de futuro)"""
+    with open(path, encoding='utf-8-sig', newline='') as f:
+        events, _ = parse_calendar_lines(f, datetime.min, source='Backtest CSV')
+    return events
+
+
+def load_news(path):
+    """Notícias arquivadas: JSON (lista ou snapshot com 'news'), CSV ou o news_store.db"""
+    if path.endswith('.db'):
+        conn = sqlite3.connect(path)
+        try:
+            conn.row_factory = sqlite3.Row
+            rows = conn.execute(
+                'SELECT title, source, sentiment, score, relevance, url, published, published_ts '
+                'FROM news ORDER BY published_ts'
+            ).fetchall()
+            return [dict(row) for row in rows]
+        finally:
+            conn.close()
+
+    if path.endswith('.csv'):
+        with open(path, encoding='utf-8-sig', newline='') as f:
+            news = list(csv.DictReader(f))
+        for item in news:
+            for field in ('relevance', 'score'):
+                if item.get(field) not in (None, ''):
+                    item[field] = float(item[field])
+        return news
+
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+    return data.get('news', []) if isinstance(data, dict) else data
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# REPLAY
+# ═══════════════════════════════════════════════════════════════════════
+
+def blocked_mask(times, events, window_fn):
+    """Barras dentro da linha do tempo de bloqueio (mesma de EventStore.blocked_at)"""
+    pairs = sorted(((event_ts(e), e) for e in events), key=lambda x: x[0])
+    intervals = build_timeline(pairs, window_fn)
+    if not intervals:
+        return np.zeros(len(times), dtype=bool)
+    starts = np.array([iv[0] for iv in intervals])
+    ends = np.array([iv[1] for iv in intervals])
+    i = np.searchsorted(starts, times, side='right') - 1
+    return (i >= 0) & (times <= ends[np.maximum(i, 0)])
+
+
+def _news_timeline(news):
+    """Notícias com horário de publicação, em ordem (empate: ordem do arquivo)"""
+    stamped = [(published_ts(item, default=item.get('published_ts')), n, item) for n, item in enumerate(news)]
+    stamped = [entry for entry in stamped if entry[0] is not None]
+    stamped.sort(key=lambda x: (x[0], x[1]))
+    return [(ts, item) for ts, _, item in stamped]
+
+
+def sentiment_labels(times, news, mode='window', half_life_minutes=None, cache_size=NEWS_CACHE_SIZE):
+    """Rótulo de sentimento visto pelo servidor no horário de cada barra.
+
+    'window': as notícias entram num NewsCache de verdade na ordem de
+    publicação; o rótulo só muda quando chega notícia, então cada barra pega
+    o último rótulo por busca binária. 'decayed': um SentimentEngine de
+    verdade avaliado no horário de cada barra.
+    """
+    timeline = _news_timeline(news)
+    labels = np.full(len(times), 'NEUTRAL', dtype=object)
+
+    if mode == 'decayed':
+        engine = SentimentEngine(half_life_minutes) if half_life_minutes else SentimentEngine()
+        j = 0
+        for i, now in enumerate(times):
+            while j < len(timeline) and timeline[j][0] <= now:
+                engine.add(timeline[j][1], now=now)
+                j += 1
+            if j:
+                labels[i] = engine.label(now)
+        return labels
+
+    cache = NewsCache(cache_size)
+    change_ts, change_labels = [], []
+    for ts, item in timeline:
+        if cache.add(item):
+            label = cache.sentiment()['label']
+            if change_ts and change_ts[-1] == ts:
+                change_labels[-1] = label
+            else:
+                change_ts.append(ts)
+                change_labels.append(label)
+    if change_ts:
+        idx = np.searchsorted(np.array(change_ts), times, side='right') - 1
+        known = idx >= 0
+        labels[known] = np.array(change_labels, dtype=object)[idx[known]]
+    return labels
+
+
+def simulate_trades(bars, action, confidence, signal, take_profit, stop_loss, max_bars):
+    """Uma posição por vez: entra no fechamento da barra do sinal, sai no alvo,
+    no stop (se os dois cabem na mesma barra, conta o stop) ou após `max_bars`"""
+    times = bars['timestamp'].to_numpy(dtype=np.float64)
+    high = bars['high'].to_numpy(dtype=np.float64)
+    low = bars['low'].to_numpy(dtype=np.float64)
+    close = bars['close'].to_numpy(dtype=np.float64)
+    candidates = np.flatnonzero(np.isin(action, ('BUY', 'SELL')))
+    last = len(bars) - 1
+
+    trades = []
+    k = 0
+    while k < len(candidates):
+        i = candidates[k]
+        if i >= last:
+            break
+        side = action[i]
+        entry = close[i]
+        end = min(i + max_bars, last)
+        window_high = high[i + 1:end + 1]
+        window_low = low[i + 1:end + 1]
+        if side == 'BUY':
+            target_hit = window_high >= entry + take_profit
+            stop_hit = window_low <= entry - stop_loss
+        else:
+            target_hit = window_low <= entry - take_profit
+            stop_hit = window_high >= entry + stop_loss
+
+        first_target = np.argmax(target_hit) if target_hit.any() else None
+        first_stop = np.argmax(stop_hit) if stop_hit.any() else None
+        if first_stop is not None and (first_target is None or first_stop <= first_target):
+            exit_index, reason = i + 1 + first_stop, 'STOP'
+            exit_price = entry - stop_loss if side == 'BUY' else entry + stop_loss
+        elif first_target is not None:
+            exit_index, reason = i + 1 + first_target, 'TARGET'
+            exit_price = entry + take_profit if side == 'BUY' else entry - take_profit
+        else:
+            exit_index, reason = end, 'TIMEOUT'
+            exit_price = close[end]
+
+        pnl = exit_price - entry if side == 'BUY' else entry - exit_price
+        trades.append({
+            'entry_time': datetime.fromtimestamp(times[i]).strftime('%Y-%m-%d %H:%M:%S'),
+            'exit_time': datetime.fromtimestamp(times[exit_index]).strftime('%Y-%m-%d %H:%M:%S'),
+            'action': side,
+            'signal': signal[i],
+            'confidence': round(float(confidence[i]), 2),
+            'entry': round(float(entry), 5),
+            'exit': round(float(exit_price), 5),
+            'bars_held': int(exit_index - i),
+            'exit_reason': reason,
+            'pnl': round(float(pnl), 5),
+            'outcome': 'WIN' if pnl > 0 else 'LOSS'
+        })
+        k = np.searchsorted(candidates, exit_index, side='right')
+    return trades
+
+
+def run_backtest(bars, events=(), news=(), window='impact', sentiment_mode='window',
+                 half_life_minutes=None, take_profit=DEFAULT_TAKE_PROFIT,
+                 stop_loss=DEFAULT_STOP_LOSS, max_bars=DEFAULT_MAX_BARS):
+    """Replay completo; retorna {'summary': ..., 'trades': [...]}.
+
+    O relógio simulado é o horário de cada barra: bloqueio por evento e
+    sentimento são calculados para esse instante, e o score de todas as
+    barras sai de uma única chamada vetorizada (scoring.score_arrays).
+    """
+    window_fn = impact_window if window == 'impact' else fixed_window(FIXED_MINUTES_BEFORE, FIXED_MINUTES_AFTER)
+    times = bars['timestamp'].to_numpy(dtype=np.float64)
+
+    blocked = blocked_mask(times, list(events), window_fn)
+    labels = sentiment_labels(times, list(news), sentiment_mode, half_life_minutes)
+    tech_action, tech_confidence = technical_columns(bars)
+
+    scores = score_arrays(
+        tech_action, tech_confidence,
+        bars['adx'].to_numpy(dtype=np.float64), bars['rsi'].to_numpy(dtype=np.float64),
+        bars['ema5'].to_numpy(dtype=np.float64), bars['ema15'].to_numpy(dtype=np.float64),
+        bars['ema50'].to_numpy(dtype=np.float64),
+        news_sentiment=labels.astype(str)
+    )
+    # Barra bloqueada: o servidor responde HOLD/WAIT antes de qualquer score
+    action = np.where(blocked, 'WAIT', scores['action'])
+    signal = np.where(blocked, 'HOLD', scores['signal'])
+
+    trades = simulate_trades(bars, action, scores['final_confidence'], signal, take_profit, stop_loss, max_bars)
+    wins = sum(1 for trade in trades if trade['outcome'] == 'WIN')
+    summary = {
+        'bars': len(bars),
+        'start': datetime.fromtimestamp(times[0]).strftime('%Y-%m-%d %H:%M:%S') if len(times) else None,
+        'end': datetime.fromtimestamp(times[-1]).strftime('%Y-%m-%d %H:%M:%S') if len(times) else None,
+        'blocked_bars': int(blocked.sum()),
+        'signals': {name: int((signal == name).sum()) for name in ('STRONG', 'MODERATE', 'WEAK', 'NONE', 'HOLD')},
+        'trades': len(trades),
+        'wins': wins,
+        'losses': len(trades) - wins,
+        'win_rate': round(wins / len(trades) * 100, 2) if trades else 0,
+        'total_pnl': round(sum(trade['pnl'] for trade in trades), 5),
+        'window': window,
+        'sentiment_mode': sentiment_mode,
+        'take_profit': take_profit,
+        'stop_loss': stop_loss,
+        'max_bars': max_bars
+    }
+    return {'summary': summary, 'trades': trades}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Backtest do pipeline de sinais GoldAI')
+    parser.add_argument('--bars', required=True, help='CSV com time/timestamp, open, high, low, close (+ indicadores)')
+    parser.add_argument('--calendar', help='Calendário arquivado (CSV do Google Drive)')
+    parser.add_argument('--news', help='Notícias arquivadas (.json, .csv ou news_store.db)')
+    parser.add_argument('--window', choices=['impact', 'fixed'], default='impact',
+                        help='impact = server.py (3h/2h ALTOS, 1h/1h), fixed = goldai_server.py (20/30 min)')
+    parser.add_argument('--sentiment', choices=['window', 'decayed'], default='window')
+    parser.add_argument('--half-life', type=float, default=None, help='Meia-vida (min) do modo decayed')
+    parser.add_argument('--take-profit', type=float, default=DEFAULT_TAKE_PROFIT)
+    parser.add_argument('--stop-loss', type=float, default=DEFAULT_STOP_LOSS)
+    parser.add_argument('--max-bars', type=int, default=DEFAULT_MAX_BARS)
+    parser.add_argument('--out', help='Grava os trades neste CSV')
+    args = parser.parse_args()
+
+    bars = load_bars(args.bars)
+    events = load_calendar(args.calendar) if args.calendar else []
+    news = load_news(args.news) if args.news else []
+
+    result = run_backtest(
+        bars, events, news,
+        window=args.window,
+        sentiment_mode=args.sentiment,
+        half_life_minutes=args.half_life,
+        take_profit=args.take_profit,
+        stop_loss=args.stop_loss,
+        max_bars=args.max_bars
+    )
+
+    if args.out:
+        with open(args.out, 'w', newline='', encoding='utf-8') as f:
+            fieldnames = list(result['trades'][0]) if result['trades'] else ['entry_time']
+            writer = csv.DictWriter(f, fieldnames=fieldnames)
+            writer.writeheader()
+            writer.writerows(result['trades'])
+        print(f"[OK] {len(result['trades'])} trades gravados em {os.path.abspath(args.out)}")
+
+    print(json.dumps(result['summary'], indent=2, ensure_ascii=False))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Benchmark do parse do calendário: loop com df.iterrows() (versão anterior
+do goldai_server.load_csv_from_drive) contra o parse colunar de
+calendar_parsing.parse_calendar_frame.
+
+Uso: python benchmarks/bench_calendar_parsing.py [--rows 10000 100000] [--repeat 3]
+"""
+
+import argparse
+import io
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from calendar_parsing import parse_calendar_frame
+
+
+def build_csv(rows, seed=42):
+    """Gera um CSV sintético no formato do Google Drive (Data,Hora,Moeda,Evento,Impacto)"""
+    rng = random.Random(seed)
+    start = datetime.now() - timedelta(days=30)
+    names = ['CPI', 'PPI', 'Fed Speech', 'Initial Jobless Claims', 'Retail Sales', 'NFP']
+    impacts = ['High', 'Medium', 'Low', 'ALTA', 'MÉDIA']
+    lines = ['Data,Hora,Moeda,Evento,Impacto']
+    for _ in range(rows):
+        when = start + timedelta(minutes=rng.randint(0, 60 * 24 * 90))
+        date = when.strftime('%Y-%m-%d') if rng.random() < 0.8 else when.strftime('%d/%m/%Y')
+        lines.append(f"{date},{when.strftime('%H:%M')},USD,{rng.choice(names)},{rng.choice(impacts)}")
+    return '\n'.join(lines).encode('utf-8')
+
+
+def legacy_iterrows_parse(df):
+    """Cópia do loop anterior (df.iterrows + strptime por linha), só para comparação"""
+    csv_events = []
+    for index, row in df.iterrows():
+        try:
+            event_name = str(row.get('Evento', '')).strip()
+            if not event_name or event_name == 'nan':
+                event_name = str(row.get('Event', '')).strip()
+            if not event_name or event_name == 'nan':
+                continue
+
+            event_date = str(row.get('Data', '')).strip()
+            if not event_date or event_date == 'nan':
+                event_date = str(row.get('Date', '')).strip()
+            if not event_date or event_date == 'nan':
+                continue
+
+            impact = str(row.get('Impacto', 'MEDIUM')).strip()
+            if not impact or impact == 'nan':
+                impact = str(row.get('Impact', 'MEDIUM')).strip()
+            impact = impact.upper()
+            if impact not in ['CRITICAL', 'HIGH', 'MEDIUM', 'LOW']:
+                impact = 'MEDIUM'
+
+            currency = str(row.get('Moeda', 'USD')).strip()
+            if not currency or currency == 'nan':
+                currency = str(row.get('Currency', 'USD')).strip()
+            currency = currency.upper()
+
+            event_datetime = None
+            if 'T' in event_date:
+                try:
+                    date_part = event_date.split('+')[0].split('-04:00')[0].split('-05:00')[0]
+                    event_datetime = datetime.fromisoformat(date_part)
+                except:
+                    pass
+
+            if event_datetime is None:
+                for fmt in ["%Y-%m-%d %H:%M", "%d/%m/%Y %H:%M", "%Y-%m-%d", "%d/%m/%Y"]:
+                    try:
+                        event_datetime = datetime.strptime(event_date, fmt)
+                        break
+                    except:
+                        continue
+
+            if event_datetime is None:
+                continue
+
+            csv_events.append({
+                'name': event_name,
+                'time': event_datetime,
+                'impact': impact,
+                'currency': currency,
+                'source': 'Google Drive CSV'
+            })
+        except Exception:
+            continue
+    return csv_events
+
+
+def best_of(func, repeat):
+    """Menor tempo (s) entre `repeat` execuções"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark do parse do calendário CSV')
+    parser.add_argument('--rows', type=int, nargs='+', default=[10000, 100000])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'LINHAS':>8}  {'ITERROWS':>10}  {'COLUNAR':>10}  {'GANHO':>7}")
+    for rows in args.rows:
+        body = build_csv(rows)
+        now = datetime.now()
+
+        legacy = best_of(lambda: legacy_iterrows_parse(pd.read_csv(io.BytesIO(body))), args.repeat)
+        columnar = best_of(lambda: parse_calendar_frame(pd.read_csv(io.BytesIO(body)), now), args.repeat)
+
+        print(f"{rows:>8}  {legacy * 1000:>8.1f}ms  {columnar * 1000:>8.1f}ms  {legacy / columnar:>6.1f}x")
+
+
+if __name__ == '__main__':
+    main()
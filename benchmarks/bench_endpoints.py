@@ -0,0 +1,459 @@
+#!/usr/bin/env python3
+"""
+Benchmark dos endpoints (/signal, /status, /news, /calendar) sob carga.
+
+Sobe o servidor como subprocesso apontado para fontes falsas locais (CSV do
+Drive, calendário da ForexFactory e Alpha Vantage), com calendário e
+histórico de notícias preenchidos em cada tamanho pedido, e dispara
+clientes concorrentes. Mede p50/p95/p99, requisições por segundo e RSS do
+processo por endpoint. Nada sai da máquina: roda offline, inclusive no CI.
+
+O JSON gravado em --out serve de base para comparar versões (--compare).
+
+Uso: python benchmarks/bench_endpoints.py [--server server.py] [--sizes 10 1000 100000]
+                                          [--clients 8] [--requests 2000]
+                                          [--out resultado.json] [--compare base.json]
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from news_store import NewsStore
+
+ENDPOINTS = ['/signal', '/status', '/news', '/calendar']
+
+# Eventos começam depois da maior janela de bloqueio: /signal mede o score, não o bloqueio
+EVENTS_START_HOURS = 24
+EVENTS_SPAN_DAYS = 60
+
+# Payloads distintos do /signal (o resto repete e exercita o cache de sinais)
+SIGNAL_PAYLOADS = 200
+
+FEED_ITEMS = 50
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# FONTES FALSAS
+# ═══════════════════════════════════════════════════════════════════════
+
+def build_calendar_csv(events, now, seed=42):
+    """CSV no formato do Google Drive com `events` eventos futuros"""
+    rng = random.Random(seed)
+    start = now + timedelta(hours=EVENTS_START_HOURS)
+    impacts = ['High', 'Medium', 'Low', 'ALTA', 'MÉDIA']
+    lines = ['Data,Hora,Moeda,Evento,Impacto']
+    for i in range(events):
+        when = start + timedelta(minutes=rng.randint(0, 60 * 24 * EVENTS_SPAN_DAYS))
+        lines.append(f"{when.strftime('%Y-%m-%d')},{when.strftime('%H:%M')},USD,Evento {i},{rng.choice(impacts)}")
+    return '\n'.join(lines).encode('utf-8')
+
+
+def build_forexfactory(now):
+    """Semana da ForexFactory (só entra se o CSV falhar)"""
+    when = now + timedelta(hours=EVENTS_START_HOURS)
+    return json.dumps([
+        {
+            'title': f'FF Evento {i}',
+            'country': 'USD',
+            'currency': 'USD',
+            'impact': 'High' if i % 2 else 'Medium',
+            'date': (when + timedelta(hours=i)).strftime('%Y-%m-%d'),
+            'time': (when + timedelta(hours=i)).strftime('%H:%M:%S')
+        }
+        for i in range(20)
+    ]).encode('utf-8')
+
+
+def news_items(count, now, prefix='seed', seed=7):
+    """Notícias no formato já processado pelo servidor (o mesmo que vai para o NewsStore)"""
+    rng = random.Random(seed)
+    sources = ['Reuters', 'Bloomberg', 'CNBC', 'MarketWatch', 'Benzinga']
+    items = []
+    for i in range(count):
+        score = rng.uniform(-0.6, 0.6)
+        published = (now - timedelta(minutes=rng.randint(0, 60 * 24 * 7))).strftime('%Y%m%dT%H%M%S')
+        items.append({
+            'title': f'Gold {prefix} headline {i}',
+            'source': rng.choice(sources),
+            'sentiment': 'BULLISH' if score > 0.15 else 'BEARISH' if score < -0.15 else 'NEUTRAL',
+            'score': round(score, 3),
+            'time': published[:10],
+            'published': published,
+            'relevance': round(rng.uniform(0.1, 1.0), 2),
+            'url': f'https://example.com/{prefix}/{i}'
+        })
+    return items
+
+
+def build_alpha_vantage(now):
+    """Resposta NEWS_SENTIMENT da Alpha Vantage com FEED_ITEMS itens"""
+    return json.dumps({
+        'items': str(FEED_ITEMS),
+        'feed': [
+            {
+                'title': item['title'],
+                'source': item['source'],
+                'url': item['url'],
+                'time_published': item['published'],
+                'overall_sentiment_score': item['score'],
+                'relevance_score': str(item['relevance'])
+            }
+            for item in news_items(FEED_ITEMS, now, prefix='feed', seed=11)
+        ]
+    }).encode('utf-8')
+
+
+class FakeSources:
+    """Um servidor HTTP local com as três fontes externas"""
+
+    def __init__(self):
+        self.bodies = {}
+        sources = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                path = self.path.split('?', 1)[0]
+                body, content_type = sources.bodies.get(path, (None, None))
+                if body is None:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.httpd.daemon_threads = True
+        self.base = f'http://127.0.0.1:{self.httpd.server_address[1]}'
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def load(self, events, now):
+        self.bodies = {
+            '/drive.csv': (build_calendar_csv(events, now), 'text/csv'),
+            '/ff_calendar_thisweek.json': (build_forexfactory(now), 'application/json'),
+            '/query': (build_alpha_vantage(now), 'application/json'),
+        }
+
+    def env(self):
+        return {
+            'NEWS_CSV_URL': f'{self.base}/drive.csv',
+            'GOLDAI_EXTERNAL_CALENDAR_URL': f'{self.base}/ff_calendar_thisweek.json',
+            'GOLDAI_ALPHA_VANTAGE_URL': f'{self.base}/query',
+        }
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# SERVIDOR SOB TESTE
+# ═══════════════════════════════════════════════════════════════════════
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def read_rss(pid):
+    """RSS atual e pico (MB) do processo, lidos de /proc (None fora do Linux)"""
+    try:
+        with open(f'/proc/{pid}/status') as f:
+            fields = dict(line.split(':', 1) for line in f if ':' in line)
+        return {
+            'rss_mb': round(int(fields['VmRSS'].split()[0]) / 1024, 1),
+            'peak_rss_mb': round(int(fields['VmHWM'].split()[0]) / 1024, 1)
+        }
+    except (OSError, KeyError, ValueError):
+        return {'rss_mb': None, 'peak_rss_mb': None}
+
+
+class AppProcess:
+    """O servidor Flask num subprocesso, com arquivos de estado num diretório temporário"""
+
+    def __init__(self, server_file, fakes, workdir):
+        self.port = free_port()
+        self.base = f'http://127.0.0.1:{self.port}'
+        env = dict(os.environ)
+        env.update(fakes.env())
+        env.update({
+            'PORT': str(self.port),
+            'GOLDAI_SNAPSHOT_PATH': os.path.join(workdir, 'snapshot.json'),
+            'GOLDAI_NEWS_DB': os.path.join(workdir, 'news_store.db'),
+            'GOLDAI_QUOTA_DB': os.path.join(workdir, 'api_quota.db'),
+            'GOLDAI_SIGNAL_LOG_DIR': os.path.join(workdir, 'signals'),
+            'NO_PROXY': '127.0.0.1,localhost',
+            'PYTHONUNBUFFERED': '1',
+        })
+        self.log_path = os.path.join(workdir, 'server.out')
+        self._log = open(self.log_path, 'wb')
+        self.proc = subprocess.Popen(
+            [sys.executable, os.path.join(ROOT, server_file)],
+            cwd=workdir, env=env, stdout=self._log, stderr=subprocess.STDOUT
+        )
+
+    def wait_ready(self, session, events, timeout):
+        """Espera o /calendar enxergar todos os eventos do CSV falso"""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.proc.poll() is not None:
+                break
+            try:
+                response = session.get(f'{self.base}/calendar', timeout=5)
+                if response.status_code == 200 and response.json().get('total', 0) >= events:
+                    return True
+            except requests.RequestException:
+                pass
+            time.sleep(0.2)
+        return False
+
+    def stop(self):
+        self.proc.terminate()
+        try:
+            self.proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            self.proc.kill()
+            self.proc.wait()
+        self._log.close()
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# CARGA E MÉTRICAS
+# ═══════════════════════════════════════════════════════════════════════
+
+def signal_payloads(count, seed=3):
+    """Payloads do bot para o /signal"""
+    rng = random.Random(seed)
+    payloads = []
+    for _ in range(count):
+        ema50 = rng.uniform(1900, 2100)
+        ema15 = ema50 + rng.gauss(0, 5)
+        payloads.append({
+            'symbol': 'XAUUSD',
+            'timeframe': rng.choice(['M1', 'M5', 'M15', 'H1']),
+            'technical_signal': rng.choice(['BUY', 'SELL', 'NONE']),
+            'technical_score': round(rng.uniform(0, 1), 4),
+            'adx': round(rng.uniform(5, 60), 2),
+            'rsi': round(rng.uniform(10, 90), 2),
+            'ema5': round(ema15 + rng.gauss(0, 5), 5),
+            'ema15': round(ema15, 5),
+            'ema50': round(ema50, 5),
+        })
+    return payloads
+
+
+def request_for(endpoint, base, payloads, rng):
+    if endpoint == '/signal':
+        return 'POST', f'{base}/signal', rng.choice(payloads)
+    return 'GET', f'{base}{endpoint}', None
+
+
+def percentile(ordered, p):
+    """Percentil com interpolação linear sobre uma lista já ordenada"""
+    if not ordered:
+        return None
+    k = (len(ordered) - 1) * p / 100
+    low = int(k)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (k - low)
+
+
+def run_load(endpoint, base, clients, total, warmup, payloads):
+    """`total` requisições em `clients` threads (cada uma com sua sessão keep-alive)"""
+    per_client = [total // clients + (1 if i < total % clients else 0) for i in range(clients)]
+    latencies = [[] for _ in range(clients)]
+    errors = [0] * clients
+    barrier = threading.Barrier(clients + 1)
+
+    def worker(index):
+        rng = random.Random(index)
+        session = requests.Session()
+        session.trust_env = False
+        for _ in range(warmup // clients):
+            method, url, body = request_for(endpoint, base, payloads, rng)
+            session.request(method, url, json=body, timeout=30)
+        barrier.wait()
+        for _ in range(per_client[index]):
+            method, url, body = request_for(endpoint, base, payloads, rng)
+            start = time.perf_counter()
+            try:
+                response = session.request(method, url, json=body, timeout=30)
+                response.content
+                ok = response.status_code == 200
+            except requests.RequestException:
+                ok = False
+            latencies[index].append(time.perf_counter() - start)
+            if not ok:
+                errors[index] += 1
+        session.close()
+
+    threads = [threading.Thread(target=worker, args=(i,), daemon=True) for i in range(clients)]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    ordered = sorted(latency for chunk in latencies for latency in chunk)
+    return {
+        'requests': len(ordered),
+        'errors': sum(errors),
+        'seconds': round(elapsed, 3),
+        'rps': round(len(ordered) / elapsed, 1) if elapsed else None,
+        'p50_ms': round(percentile(ordered, 50) * 1000, 2),
+        'p95_ms': round(percentile(ordered, 95) * 1000, 2),
+        'p99_ms': round(percentile(ordered, 99) * 1000, 2),
+        'max_ms': round(ordered[-1] * 1000, 2),
+    }
+
+
+def bench_size(server_file, fakes, size, args):
+    """Um servidor novo por tamanho: calendário e histórico com `size` itens"""
+    now = datetime.now()
+    fakes.load(size, now)
+    payloads = signal_payloads(SIGNAL_PAYLOADS)
+
+    with tempfile.TemporaryDirectory(prefix='bench_endpoints_') as workdir:
+        # Histórico de notícias pré-carregado direto no SQLite que o servidor vai abrir
+        NewsStore(os.path.join(workdir, 'news_store.db')).add_many(
+            news_items(size, now), fetched_ts=time.time()
+        )
+
+        started = time.perf_counter()
+        app = AppProcess(server_file, fakes, workdir)
+        session = requests.Session()
+        session.trust_env = False
+        try:
+            if not app.wait_ready(session, size, args.startup_timeout):
+                with open(app.log_path, errors='replace') as f:
+                    tail = f.read()[-2000:]
+                raise RuntimeError(f"Servidor não ficou pronto com {size} eventos:\n{tail}")
+            result = {
+                'size': size,
+                'startup_seconds': round(time.perf_counter() - started, 2),
+                'idle': read_rss(app.proc.pid),
+                'endpoints': {}
+            }
+            for endpoint in args.endpoints:
+                stats = run_load(endpoint, app.base, args.clients, args.requests, args.warmup, payloads)
+                stats.update(read_rss(app.proc.pid))
+                result['endpoints'][endpoint] = stats
+                print(
+                    f"{size:>8}  {endpoint:<10}  {stats['p50_ms']:>8.2f}  {stats['p95_ms']:>8.2f}  "
+                    f"{stats['p99_ms']:>8.2f}  {stats['rps']:>8.1f}  {stats['rss_mb'] or 0:>7.1f}  {stats['errors']:>5}"
+                )
+            signal_cache = session.get(f'{app.base}/status', timeout=10).json().get('signal_cache')
+            if signal_cache:
+                result['signal_cache'] = signal_cache
+            return result
+        finally:
+            session.close()
+            app.stop()
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# RESULTADOS
+# ═══════════════════════════════════════════════════════════════════════
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline_path):
+    """Diferença percentual de p50/p95/p99/RPS contra um JSON anterior"""
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = json.load(f)
+    base_runs = {run['size']: run for run in baseline['results']}
+    print(f"\nComparação com {baseline_path} (commit {baseline['meta'].get('commit')})")
+    print(f"{'EVENTOS':>8}  {'ENDPOINT':<10}  {'P50':>8}  {'P95':>8}  {'P99':>8}  {'RPS':>8}")
+    for run in results:
+        base_run = base_runs.get(run['size'])
+        if not base_run:
+            continue
+        for endpoint, stats in run['endpoints'].items():
+            base_stats = base_run['endpoints'].get(endpoint)
+            if not base_stats:
+                continue
+            deltas = [
+                (stats[key] - base_stats[key]) / base_stats[key] * 100 if base_stats[key] else 0.0
+                for key in ('p50_ms', 'p95_ms', 'p99_ms', 'rps')
+            ]
+            print(f"{run['size']:>8}  {endpoint:<10}  " + '  '.join(f"{delta:>+7.1f}%" for delta in deltas))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de latência e vazão dos endpoints')
+    parser.add_argument('--server', default='server.py', choices=['server.py', 'goldai_server.py'])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 1000, 100000],
+                        help='eventos no calendário e notícias no histórico')
+    parser.add_argument('--endpoints', nargs='+', default=ENDPOINTS, choices=ENDPOINTS)
+    parser.add_argument('--clients', type=int, default=8)
+    parser.add_argument('--requests', type=int, default=2000, help='requisições medidas por endpoint')
+    parser.add_argument('--warmup', type=int, default=80, help='requisições de aquecimento por endpoint')
+    parser.add_argument('--startup-timeout', type=float, default=180)
+    parser.add_argument('--out', help='grava os resultados em JSON')
+    parser.add_argument('--compare', help='JSON de uma execução anterior para comparar')
+    args = parser.parse_args()
+
+    fakes = FakeSources()
+    results = []
+    print(f"{'EVENTOS':>8}  {'ENDPOINT':<10}  {'P50 MS':>8}  {'P95 MS':>8}  {'P99 MS':>8}  {'RPS':>8}  {'RSS MB':>7}  {'ERROS':>5}")
+    try:
+        for size in args.sizes:
+            results.append(bench_size(args.server, fakes, size, args))
+    finally:
+        fakes.close()
+
+    report = {
+        'meta': {
+            'commit': git_commit(),
+            'server': args.server,
+            'clients': args.clients,
+            'requests': args.requests,
+            'warmup': args.warmup,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpus': os.cpu_count(),
+            'generated_at': datetime.now(timezone.utc).isoformat()
+        },
+        'results': results
+    }
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResultados gravados em {args.out}")
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == '__main__':
+    main()
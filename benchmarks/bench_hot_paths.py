@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmarks das funções quentes do servidor, isoladas (estilo timeit):
+
+- check_news_impact conforme cresce o calendário (fora e dentro de janela)
+- _analyze_news_sentiment conforme cresce o news_cache
+- _calculate_technical_strength e _combine_signals
+- load_csv_from_drive (download local + parse + merge) por número de linhas
+- fetch_gold_news com o feed gravado de 50 itens (fixtures/)
+
+Rede só em 127.0.0.1 (fontes falsas do bench_endpoints). O resultado sai em
+JSON; com --baseline, qualquer função mais lenta que o limite faz o script
+sair com código 1. Para aceitar novos números, grave de novo o baseline
+com --out benchmarks/hot_paths_baseline.json.
+
+Uso: python benchmarks/bench_hot_paths.py [--server server.py] [--out resultado.json]
+                                          [--baseline benchmarks/hot_paths_baseline.json]
+                                          [--threshold 0.5] [--min-delta-us 1.0]
+"""
+
+import argparse
+import importlib
+import json
+import logging
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import timeit
+from datetime import datetime, timedelta, timezone
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, ROOT)
+
+from bench_endpoints import FakeSources, build_calendar_csv, git_commit, news_items, signal_payloads
+
+FEED_FIXTURE = os.path.join(BENCH_DIR, 'fixtures', 'alpha_vantage_news_50.json')
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, 'hot_paths_baseline.json')
+
+REPEAT = 7
+SCORING_PAYLOADS = 1000
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# HARNESS
+# ═══════════════════════════════════════════════════════════════════════
+
+def measure(func, setup=None, number=None, repeat=REPEAT, inner=1):
+    """Tempo por chamada (µs) com timeit: `setup` roda antes de cada repetição.
+
+    `number=None` calibra as voltas com autorange (>= 0.2 s por repetição);
+    `inner` divide o tempo quando `func` faz várias chamadas de uma vez.
+    """
+    timer = timeit.Timer(func, setup=setup or (lambda: None))
+    if number is None:
+        number, _ = timer.autorange()
+    per_call = [total / number / inner * 1e6 for total in timer.repeat(repeat=repeat, number=number)]
+    return {
+        'loops': number * inner,
+        'repeat': repeat,
+        'min_us': round(min(per_call), 3),
+        'median_us': round(statistics.median(per_call), 3),
+        'mean_us': round(statistics.mean(per_call), 3),
+        'stdev_us': round(statistics.stdev(per_call), 3) if repeat > 1 else 0.0
+    }
+
+
+def load_server(server_file, fakes, workdir):
+    """Importa o módulo do servidor sem thread de background e com estado no `workdir`"""
+    os.environ.update(fakes.env())
+    os.environ.update({
+        'GOLDAI_BACKGROUND_UPDATES': '0',
+        'GOLDAI_CLOCK': 'real',
+        'GOLDAI_SNAPSHOT_PATH': os.path.join(workdir, 'snapshot.json'),
+        'GOLDAI_NEWS_DB': os.path.join(workdir, 'news_store.db'),
+        'GOLDAI_QUOTA_DB': os.path.join(workdir, 'api_quota.db'),
+        'GOLDAI_SIGNAL_LOG_DIR': os.path.join(workdir, 'signals'),
+        'NO_PROXY': '127.0.0.1,localhost',
+    })
+    # Sem I/O de log: mede a função, não o terminal
+    logging.disable(logging.INFO)
+    module = importlib.import_module(os.path.splitext(server_file)[0])
+    server = module.gold_server
+    # Cota sem limite: cada repetição do fetch_gold_news reserva uma chamada
+    server.quota = module.QuotaLedger(
+        os.path.join(workdir, 'bench_quota.db'), service='bench', daily_limit=10 ** 9, clock=server.clock
+    )
+    return module, server
+
+
+def calendar_events(count, now, blocked, seed=5):
+    """`count` eventos futuros a partir de amanhã; com `blocked`, um HIGH daqui a 10 min"""
+    rng = random.Random(seed)
+    impacts = ['HIGH', 'MEDIUM', 'LOW']
+    start = now + timedelta(days=1)
+    events = [
+        {
+            'name': f'Evento {i}',
+            'time': start + timedelta(minutes=rng.randint(0, 60 * 24 * 60)),
+            'impact': rng.choice(impacts),
+            'currency': 'USD',
+            'source': 'Bench'
+        }
+        for i in range(count - 1 if blocked else count)
+    ]
+    if blocked:
+        events.append({
+            'name': 'Evento na janela', 'time': now + timedelta(minutes=10),
+            'impact': 'HIGH', 'currency': 'USD', 'source': 'Bench'
+        })
+    return events
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# BENCHMARKS
+# ═══════════════════════════════════════════════════════════════════════
+
+def bench_check_news_impact(module, server, sizes):
+    results = {}
+    for blocked in (False, True):
+        state = 'bloqueado' if blocked else 'livre'
+        for size in sizes:
+            server.calendar = module.EventStore()
+            server.calendar.refresh(calendar_events(size, server.clock.now(), blocked))
+            if server.check_news_impact().get('has_event') != blocked:
+                raise AssertionError(f"check_news_impact: esperado has_event={blocked} com {size} eventos")
+            results[f'check_news_impact[{state},events={size}]'] = measure(server.check_news_impact)
+    return results
+
+
+def bench_news_sentiment(module, server, sizes):
+    results = {}
+    now = server.clock.now()
+    for size in sizes:
+        server.news_cache = module.NewsCache(maxlen=size)
+        server.news_cache.extend(news_items(size, now))
+        results[f'_analyze_news_sentiment[news={size}]'] = measure(server._analyze_news_sentiment)
+    return results
+
+
+def bench_scoring(module, server):
+    payloads = [module._technical_data(payload) for payload in signal_payloads(SCORING_PAYLOADS)]
+    strengths = [server._calculate_technical_strength(tech_data) for tech_data in payloads]
+    rows = list(zip(payloads, strengths))
+
+    def strength_all():
+        for tech_data in payloads:
+            server._calculate_technical_strength(tech_data)
+
+    def combine_all():
+        for tech_data, strength in rows:
+            server._combine_signals(tech_data['action'], tech_data['confidence'], 'BULLISH', strength, tech_data)
+
+    return {
+        '_calculate_technical_strength': measure(strength_all, inner=len(payloads)),
+        '_combine_signals': measure(combine_all, inner=len(rows)),
+    }
+
+
+def bench_load_csv(module, server, fakes, rows_list):
+    results = {}
+    for rows in rows_list:
+        fakes.bodies['/drive.csv'] = (build_calendar_csv(rows, server.clock.now()), 'text/csv')
+        server.calendar = module.EventStore()
+
+        # Sem reset o fetcher reconhece o mesmo hash e pula o parse
+        def setup():
+            server.csv_fetcher.reset()
+
+        setup()
+        if not server.load_csv_from_drive() or len(server.calendar) != rows:
+            raise AssertionError(f"load_csv_from_drive não carregou {rows} eventos")
+        results[f'load_csv_from_drive[rows={rows}]'] = measure(server.load_csv_from_drive, setup=setup, number=1)
+    return results
+
+
+def bench_fetch_news(module, server, fakes, workdir, repeat):
+    with open(FEED_FIXTURE, 'rb') as f:
+        fakes.bodies['/query'] = (f.read(), 'application/json')
+    runs = iter(range(repeat + 1))
+
+    # Cache, sentimento e histórico zerados: todas as notícias do feed são novas
+    def setup():
+        server.news_cache = module.NewsCache(maxlen=module.NEWS_CACHE_SIZE)
+        server.sentiment_engine = module.SentimentEngine(module.SENTIMENT_HALF_LIFE_MINUTES)
+        server.news_store = module.NewsStore(os.path.join(workdir, f'bench_news_{next(runs)}.db'))
+
+    setup()
+    server.fetch_gold_news()
+    if len(server.news_cache) != 30:
+        raise AssertionError(f"fetch_gold_news: esperado 30 notícias, veio {len(server.news_cache)}")
+    return {'fetch_gold_news[feed=50]': measure(server.fetch_gold_news, setup=setup, number=1, repeat=repeat)}
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# BASELINE
+# ═══════════════════════════════════════════════════════════════════════
+
+def compare(results, baseline_path, threshold, min_delta_us):
+    """Compara o min_us com o baseline; retorna os nomes que passaram do limite.
+
+    Diferenças abaixo de `min_delta_us` não contam: em funções de fração de
+    microssegundo o ruído da máquina passa fácil dos 25%.
+    """
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = json.load(f)
+    base = baseline['benchmarks']
+    regressions = []
+    print(f"\nBaseline {baseline_path} (commit {baseline['meta'].get('commit')}, limite +{threshold:.0%})")
+    print(f"{'BENCHMARK':<48}  {'BASE µs':>11}  {'ATUAL µs':>11}  {'DIF':>8}")
+    for name, stats in results.items():
+        if name not in base:
+            print(f"{name:<48}  {'-':>11}  {stats['min_us']:>11.3f}  {'novo':>8}")
+            continue
+        before = base[name]['min_us']
+        delta = (stats['min_us'] - before) / before if before else 0.0
+        flag = '  REGRESSÃO' if delta > threshold and stats['min_us'] - before > min_delta_us else ''
+        if flag:
+            regressions.append(name)
+        print(f"{name:<48}  {before:>11.3f}  {stats['min_us']:>11.3f}  {delta:>+7.1%}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Micro-benchmarks das funções quentes do servidor')
+    parser.add_argument('--server', default='server.py', choices=['server.py', 'goldai_server.py'])
+    parser.add_argument('--events', type=int, nargs='+', default=[10, 1000, 100000])
+    parser.add_argument('--news', type=int, nargs='+', default=[100, 1000, 10000])
+    parser.add_argument('--csv-rows', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--fetch-repeat', type=int, default=20)
+    parser.add_argument('--out', help='grava os resultados em JSON')
+    parser.add_argument('--baseline', help=f'JSON de referência (ex.: {os.path.relpath(DEFAULT_BASELINE, ROOT)})')
+    # Em máquina compartilhada a mesma função varia uns 30% entre execuções
+    parser.add_argument('--threshold', type=float, default=0.5, help='aumento máximo aceito (0.5 = +50%%)')
+    parser.add_argument('--min-delta-us', type=float, default=1.0, help='diferença absoluta mínima para contar regressão')
+    args = parser.parse_args()
+
+    fakes = FakeSources()
+    fakes.load(0, datetime.now())
+    results = {}
+    try:
+        with tempfile.TemporaryDirectory(prefix='bench_hot_paths_') as workdir:
+            module, server = load_server(args.server, fakes, workdir)
+            results.update(bench_check_news_impact(module, server, args.events))
+            results.update(bench_news_sentiment(module, server, args.news))
+            results.update(bench_scoring(module, server))
+            results.update(bench_load_csv(module, server, fakes, args.csv_rows))
+            results.update(bench_fetch_news(module, server, fakes, workdir, args.fetch_repeat))
+    finally:
+        fakes.close()
+
+    print(f"{'BENCHMARK':<48}  {'MIN µs':>11}  {'MEDIANA µs':>11}  {'DESVIO µs':>10}  {'VOLTAS':>8}")
+    for name, stats in results.items():
+        print(f"{name:<48}  {stats['min_us']:>11.3f}  {stats['median_us']:>11.3f}  {stats['stdev_us']:>10.3f}  {stats['loops']:>8}")
+
+    report = {
+        'meta': {
+            'commit': git_commit(),
+            'server': args.server,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'generated_at': datetime.now(timezone.utc).isoformat()
+        },
+        'benchmarks': results
+    }
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResultados gravados em {args.out}")
+
+    if args.baseline:
+        regressions = compare(results, args.baseline, args.threshold, args.min_delta_us)
+        if regressions:
+            print(f"\n[FAIL] {len(regressions)} benchmark(s) acima do limite: {', '.join(regressions)}")
+            sys.exit(1)
+        print("\n[OK] Nenhuma regressão acima do limite")
+
+
+if __name__ == '__main__':
+    main()
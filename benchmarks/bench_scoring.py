@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Benchmark do score dos sinais: caminho escalar (technical_strength +
+combine_signals, um payload por vez) contra o vetorizado (score_arrays).
+
+Uso: python benchmarks/bench_scoring.py [--rows 1 1000 1000000] [--repeat 3]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scoring import technical_strength, combine_signals, score_arrays
+
+
+def build_columns(rows, seed=42):
+    """Colunas sintéticas no formato dos payloads do bot"""
+    rng = np.random.default_rng(seed)
+    ema50 = rng.uniform(1900, 2100, rows)
+    ema15 = ema50 + rng.normal(0, 5, rows)
+    ema5 = ema15 + rng.normal(0, 5, rows)
+    return {
+        'action': rng.choice(np.array(['BUY', 'SELL', 'NONE']), rows, p=[0.45, 0.45, 0.1]),
+        'confidence': rng.uniform(0, 1, rows),
+        'adx': rng.uniform(5, 60, rows),
+        'rsi': rng.uniform(10, 90, rows),
+        'ema5': ema5,
+        'ema15': ema15,
+        'ema50': ema50,
+    }
+
+
+def scalar_path(payloads, news_sentiment):
+    """Loop por payload, como o /signal faz"""
+    results = []
+    for tech_data in payloads:
+        strength = technical_strength(tech_data)
+        signal = combine_signals(tech_data['action'], tech_data['confidence'], news_sentiment, strength)
+        results.append((strength, signal['confidence'], signal['signal']))
+    return results
+
+
+def best_of(func, repeat):
+    """Menor tempo (s) entre `repeat` execuções"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def check_same(payloads, columns, news_sentiment):
+    """Confere que os dois caminhos dão o mesmo resultado (força, confiança final e rótulo, com o mesmo tipo)"""
+    scores = score_arrays(news_sentiment=news_sentiment, **columns)
+    for i, tech_data in enumerate(payloads):
+        strength = technical_strength(tech_data)
+        signal = combine_signals(tech_data['action'], tech_data['confidence'], news_sentiment, strength)
+        # combine_signals arredonda a confiança na saída: compara com o vetor arredondado igual
+        confidence = round(float(scores['final_confidence'][i]), 2)
+        if (
+            strength != scores['technical_strength'][i]
+            or signal['signal'] != scores['signal'][i]
+            or abs(signal['confidence'] - confidence) >= 1e-9
+            or type(signal['confidence']) is not float
+        ):
+            raise AssertionError(f"Divergência na linha {i}: {tech_data}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark do score escalar x vetorizado')
+    parser.add_argument('--rows', type=int, nargs='+', default=[1, 1000, 1000000])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--sentiment', default='BULLISH', choices=['BULLISH', 'BEARISH', 'NEUTRAL'])
+    args = parser.parse_args()
+
+    print(f"{'LINHAS':>8}  {'ESCALAR':>10}  {'NUMPY':>10}  {'LINHAS/S ESC':>13}  {'LINHAS/S NP':>13}  {'GANHO':>7}")
+    for rows in args.rows:
+        columns = build_columns(rows)
+        payloads = [
+            {name: values[i].item() for name, values in columns.items()}
+            for i in range(rows)
+        ]
+        check_same(payloads[:10000], {name: values[:10000] for name, values in columns.items()}, args.sentiment)
+
+        scalar = best_of(lambda: scalar_path(payloads, args.sentiment), args.repeat)
+        vector = best_of(lambda: score_arrays(news_sentiment=args.sentiment, **columns), args.repeat)
+
+        print(
+            f"{rows:>8}  {scalar * 1000:>8.2f}ms  {vector * 1000:>8.2f}ms  "
+            f"{rows / scalar:>13,.0f}  {rows / vector:>13,.0f}  {scalar / vector:>6.1f}x"
+        )
+
+
+if __name__ == '__main__':
+    main()
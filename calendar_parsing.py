@@ -0,0 +1,251 @@
+# ═══════════════════════════════════════════════════════════════════════
+# GOLDAI PRO - PARSE DO CALENDÁRIO ECONÔMICO (CSV)
+# ═══════════════════════════════════════════════════════════════════════
+
+import codecs
+import csv
+from datetime import datetime
+
+try:
+    import pandas as pd
+except ImportError:  # server.py roda sem pandas
+    pd = None
+
+# Aliases das colunas (português primeiro, depois inglês)
+NAME_COLUMNS = ['Evento', 'Event']
+DATE_COLUMNS = ['Data', 'Date']
+TIME_COLUMNS = ['Hora', 'Time']
+IMPACT_COLUMNS = ['Impacto', 'Impact']
+CURRENCY_COLUMNS = ['Moeda', 'Currency']
+
+# Formatos aceitos, na ordem em que são tentados
+CSV_DATETIME_FORMATS = [
+    "%Y-%m-%d %H:%M",
+    "%d/%m/%Y %H:%M",
+    "%Y-%m-%d %H:%M:%S",
+    "%d/%m/%Y %H:%M:%S",
+    "%Y-%m-%d",
+    "%d/%m/%Y",
+]
+
+# Impactos aceitos pelo parse sem pandas (server.py mantém os rótulos em português)
+KNOWN_IMPACTS = ['CRITICAL', 'HIGH', 'MEDIUM', 'LOW', 'ALTA', 'MÉDIA', 'MÉDIO', 'BAIXA']
+
+# Rótulos de impacto normalizados (português -> inglês)
+IMPACT_LABELS = {
+    'CRITICAL': 'CRITICAL',
+    'HIGH': 'HIGH',
+    'MEDIUM': 'MEDIUM',
+    'LOW': 'LOW',
+    'ALTA': 'HIGH',
+    'MÉDIA': 'MEDIUM',
+    'MÉDIO': 'MEDIUM',
+    'BAIXA': 'LOW',
+}
+
+
+def _column(df, aliases, default=''):
+    """Primeiro valor não vazio entre as colunas `aliases`, linha a linha"""
+    result = pd.Series(default, index=df.index, dtype=object)
+    filled = pd.Series(False, index=df.index)
+    for name in aliases:
+        if name not in df.columns:
+            continue
+        values = df[name].fillna('').astype(str).str.strip()
+        valid = (values != '') & (values.str.lower() != 'nan')
+        take = valid & ~filled
+        result[take] = values[take]
+        filled |= valid
+    return result, filled
+
+
+def _parse_datetimes(stamps):
+    """Converte strings em datetime, tentando um formato por vez em bloco"""
+    parsed = pd.Series(pd.NaT, index=stamps.index, dtype='datetime64[ns]')
+    if stamps.empty:
+        return parsed
+
+    # ISO 8601: o fuso é descartado (horário local do CSV)
+    iso = stamps.str.contains('T', regex=False)
+    if iso.any():
+        naive = stamps[iso].str.replace(r'(Z|[+-]\d{2}:?\d{2})$', '', regex=True)
+        parsed[iso] = pd.to_datetime(naive, format='ISO8601', errors='coerce')
+
+    for fmt in CSV_DATETIME_FORMATS:
+        missing = parsed.isna()
+        if not missing.any():
+            break
+        parsed[missing] = pd.to_datetime(stamps[missing], format=fmt, errors='coerce')
+    return parsed
+
+
+def parse_calendar_frame(df, now, source='Google Drive CSV'):
+    """Converte o DataFrame do calendário em eventos futuros, em bloco.
+
+    Retorna (eventos, stats). Linhas sem nome ou data são ignoradas; linhas
+    com data que não parseia são só contadas em stats['invalid'].
+    """
+    names, has_name = _column(df, NAME_COLUMNS)
+    dates, has_date = _column(df, DATE_COLUMNS)
+    times, has_time = _column(df, TIME_COLUMNS)
+    impacts, _ = _column(df, IMPACT_COLUMNS, default='MEDIUM')
+    currencies, _ = _column(df, CURRENCY_COLUMNS, default='USD')
+
+    impacts = impacts.str.upper().map(IMPACT_LABELS).fillna('MEDIUM')
+    currencies = currencies.str.upper()
+
+    # Data + Hora quando a hora existe; senão só a data
+    stamps = dates.where(~has_time, dates + ' ' + times)
+    parsed = _parse_datetimes(stamps)
+
+    # Se Data+Hora não parseou, tenta só a data
+    retry = parsed.isna() & has_time
+    if retry.any():
+        parsed[retry] = _parse_datetimes(dates[retry])
+
+    candidates = has_name & has_date
+    valid = candidates & parsed.notna()
+    future = valid & (parsed > pd.Timestamp(now))
+
+    event_times = pd.DatetimeIndex(parsed[future]).to_pydatetime()
+    events = [
+        {
+            'name': name,
+            'time': event_time,
+            'impact': impact,
+            'currency': currency,
+            'source': source
+        }
+        for name, event_time, impact, currency in zip(
+            names[future], event_times, impacts[future], currencies[future]
+        )
+    ]
+
+    stats = {
+        'rows': len(df),
+        'valid': int(valid.sum()),
+        'invalid': int((candidates & ~valid).sum()),
+        'future': len(events)
+    }
+    return events, stats
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# PARSE EM STREAMING (SEM PANDAS)
+# ═══════════════════════════════════════════════════════════════════════
+
+def iter_text_lines(chunks, encoding='utf-8-sig'):
+    """Decodifica chunks de bytes e devolve linhas, sem juntar o corpo inteiro"""
+    decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+    pending = ''
+    for chunk in chunks:
+        pending += decoder.decode(chunk)
+        lines = pending.split('\n')
+        pending = lines.pop()
+        for line in lines:
+            yield line
+    pending += decoder.decode(b'', final=True)
+    if pending:
+        yield pending
+
+
+def _first(row, aliases, default=''):
+    for name in aliases:
+        value = (row.get(name) or '').strip()
+        if value:
+            return value
+    return default
+
+
+class FormatLearner:
+    """Descobre o formato de data/hora uma vez por arquivo.
+
+    A primeira linha que parseia fixa o formato; as seguintes tentam só ele
+    e caem na lista completa apenas quando não batem. Strings repetidas
+    (mesma Data+Hora) reaproveitam o resultado anterior.
+    """
+
+    def __init__(self, formats=CSV_DATETIME_FORMATS):
+        self.formats = formats
+        self.learned = None
+        self.fallbacks = 0
+        self._seen = {}
+
+    def parse(self, value):
+        if value in self._seen:
+            return self._seen[value]
+        parsed = self._parse(value)
+        self._seen[value] = parsed
+        return parsed
+
+    def _parse(self, value):
+        if self.learned:
+            try:
+                return datetime.strptime(value, self.learned)
+            except ValueError:
+                self.fallbacks += 1
+        for fmt in self.formats:
+            if fmt == self.learned:
+                continue
+            try:
+                parsed = datetime.strptime(value, fmt)
+            except ValueError:
+                continue
+            if self.learned is None:
+                self.learned = fmt
+            return parsed
+        return None
+
+
+def parse_calendar_lines(lines, now, source='Google Drive CSV'):
+    """Converte linhas de CSV em eventos futuros, linha a linha.
+
+    Retorna (eventos, stats). Linhas com data inválida não geram log: são
+    contadas em stats['invalid'], com até 3 exemplos em stats['samples'].
+    """
+    reader = csv.DictReader(lines)
+    learner = FormatLearner()
+    events = []
+    stats = {'rows': 0, 'valid': 0, 'invalid': 0, 'future': 0, 'samples': []}
+
+    for row in reader:
+        stats['rows'] += 1
+
+        # Pular linhas vazias
+        if not any(row.values()):
+            continue
+
+        event_name = _first(row, NAME_COLUMNS)
+        event_date = _first(row, DATE_COLUMNS)
+        if not event_name or not event_date:
+            continue
+
+        event_time_str = _first(row, TIME_COLUMNS, default='09:30')
+        impact = _first(row, IMPACT_COLUMNS, default='MEDIUM').upper()
+        if impact not in KNOWN_IMPACTS:
+            impact = 'MEDIUM'
+        currency = _first(row, CURRENCY_COLUMNS, default='USD').upper()
+
+        datetime_str = f"{event_date} {event_time_str}"
+        event_datetime = learner.parse(datetime_str)
+        if event_datetime is None:
+            stats['invalid'] += 1
+            if len(stats['samples']) < 3:
+                stats['samples'].append(f"{datetime_str} ({event_name})")
+            continue
+
+        stats['valid'] += 1
+        if event_datetime > now:
+            events.append({
+                'name': event_name,
+                'time': event_datetime,
+                'impact': impact,
+                'currency': currency,
+                'source': source
+            })
+
+    stats['future'] = len(events)
+    stats['columns'] = reader.fieldnames
+    stats['format'] = learner.learned
+    stats['fallbacks'] = learner.fallbacks
+    return events, stats
@@ -0,0 +1,229 @@
+# ═══════════════════════════════════════════════════════════════════════
+# GOLDAI PRO - ARMAZENAMENTO DO CALENDÁRIO ECONÔMICO
+# ═══════════════════════════════════════════════════════════════════════
+
+import threading
+from itertools import islice
+from bisect import bisect_left, bisect_right
+
+# Impactos que usam a janela longa de bloqueio
+HIGH_IMPACT_LEVELS = ['ALTA', 'HIGH', 'CRITICAL']
+
+# Prioridade de impacto (menor = mais importante)
+IMPACT_PRIORITY = {
+    'CRITICAL': 0, 'HIGH': 1, 'ALTA': 1,
+    'MEDIUM': 2, 'MÉDIA': 2, 'MÉDIO': 2,
+    'LOW': 3, 'BAIXA': 3
+}
+
+
+def impact_window(event):
+    """Janela de bloqueio (minutos antes, minutos depois) conforme o impacto"""
+    if event['impact'] in HIGH_IMPACT_LEVELS:
+        return 180, 120  # 3h antes, 2h depois
+    return 60, 60        # 1h antes, 1h depois
+
+
+def fixed_window(minutes_before, minutes_after):
+    """Janela de bloqueio fixa, independente do impacto"""
+    def window(event):
+        return minutes_before, minutes_after
+    return window
+
+
+def event_key(event):
+    """Identidade estável de um evento: (nome, horário, moeda, fonte)"""
+    return (
+        event['name'],
+        event['time'],
+        event['currency'],
+        event.get('source', 'Unknown')
+    )
+
+
+def event_ts(event):
+    """Horário do evento em segundos epoch (aceita datetime com ou sem fuso)"""
+    return event['time'].timestamp()
+
+
+def build_timeline(pairs, window_fn):
+    """Converte pares (ts, evento) em intervalos de bloqueio fundidos e ordenados.
+
+    Cada intervalo é [início, fim, evento dominante, total de eventos], com
+    início/fim em segundos epoch. O dominante é o de maior impacto; em caso
+    de empate, o mais cedo.
+    """
+    raw = []
+    for ts, event in pairs:
+        before, after = window_fn(event)
+        raw.append((ts - before * 60, ts + after * 60, ts, event))
+    raw.sort(key=lambda x: (x[0], x[2]))
+
+    merged = []
+    for start, end, ts, event in raw:
+        if merged and start <= merged[-1][1]:
+            last = merged[-1]
+            last[1] = max(last[1], end)
+            rank = IMPACT_PRIORITY.get(event['impact'], 4)
+            last_rank = IMPACT_PRIORITY.get(last[2]['impact'], 4)
+            if rank < last_rank or (rank == last_rank and ts < last[4]):
+                last[2] = event
+                last[4] = ts
+            last[3] += 1
+        else:
+            merged.append([start, end, event, 1, ts])
+    return [m[:4] for m in merged]
+
+
+class EventStore:
+    """Calendário deduplicado, atualizado de forma incremental.
+
+    Mantém um índice ordenado por horário (segundos epoch) para consultas
+    por intervalo com busca binária, e a linha do tempo de bloqueio gerada
+    por `window_fn`. Ambos são trocados de uma vez só a cada mudança, então
+    leitores nunca veem um estado parcial. `version` cresce a cada mudança
+    efetiva (refresh sem diferença não conta).
+    """
+
+    def __init__(self, window_fn=impact_window):
+        self._lock = threading.RLock()
+        self._events = {}
+        self._index = ([], [])
+        self._timeline = ([], [])
+        self.window_fn = window_fn
+        self.last_refresh = None
+        self.version = 0
+
+    def __len__(self):
+        return len(self._events)
+
+    def __bool__(self):
+        return bool(self._events)
+
+    def events(self):
+        """Lista ordenada por horário (somente leitura)"""
+        return self._index[1]
+
+    def window(self, start_ts, end_ts):
+        """Eventos com start_ts <= horário <= end_ts, como pares (ts, evento)"""
+        times, events = self._index
+        lo = bisect_left(times, start_ts)
+        hi = bisect_right(times, end_ts)
+        return list(zip(times[lo:hi], events[lo:hi]))
+
+    def after(self, ts, limit=None):
+        """Eventos estritamente depois de ts, em ordem"""
+        times, events = self._index
+        lo = bisect_right(times, ts)
+        hi = len(events) if limit is None else lo + limit
+        return events[lo:hi]
+
+    def count_after(self, ts):
+        """Quantidade de eventos estritamente depois de ts"""
+        times, events = self._index
+        return len(times) - bisect_right(times, ts)
+
+    def next_event(self, ts):
+        """Próximo evento depois de ts (ou None)"""
+        upcoming = self.after(ts, limit=1)
+        return upcoming[0] if upcoming else None
+
+    def blocked_at(self, ts):
+        """Intervalo de bloqueio que contém ts (ou None) - uma busca binária"""
+        starts, intervals = self._timeline
+        i = bisect_right(starts, ts) - 1
+        if i >= 0 and ts <= intervals[i][1]:
+            return intervals[i]
+        return None
+
+    def timeline(self, start_ts, end_ts):
+        """Janelas BLOCKED/ALLOWED que cobrem [start_ts, end_ts], em ordem"""
+        starts, intervals = self._timeline
+        i = max(bisect_right(starts, start_ts) - 1, 0)
+        windows = []
+        cursor = start_ts
+        for start, end, event, total in islice(intervals, i, None):
+            if start > end_ts:
+                break
+            if end < cursor:
+                continue
+            if start > cursor:
+                windows.append({'state': 'ALLOWED', 'start': cursor, 'end': start})
+            windows.append({
+                'state': 'BLOCKED',
+                'start': max(start, cursor),
+                'end': min(end, end_ts),
+                'event': event,
+                'total_events': total
+            })
+            cursor = end
+        if cursor < end_ts:
+            windows.append({'state': 'ALLOWED', 'start': cursor, 'end': end_ts})
+        return windows
+
+    def refresh(self, events, sources=None):
+        """Aplica um refresh e retorna o que mudou.
+
+        `sources` limita quais fontes são substituídas pelo refresh; eventos
+        dessas fontes que não vierem em `events` são removidos. Com None,
+        o refresh substitui o calendário inteiro.
+        """
+        incoming = {}
+        for event in events:
+            incoming[event_key(event)] = event
+
+        with self._lock:
+            if sources is None:
+                scope = set(self._events)
+            else:
+                scope = {k for k in self._events if k[3] in sources}
+
+            inserted = updated = unchanged = 0
+            for key, event in incoming.items():
+                current = self._events.get(key)
+                if current is None:
+                    inserted += 1
+                    self._events[key] = event
+                elif current != event:
+                    updated += 1
+                    self._events[key] = event
+                else:
+                    unchanged += 1
+
+            removed_keys = scope - incoming.keys()
+            for key in removed_keys:
+                del self._events[key]
+
+            if inserted or updated or removed_keys:
+                self._rebuild()
+
+            self.last_refresh = {
+                'inserted': inserted,
+                'updated': updated,
+                'removed': len(removed_keys),
+                'unchanged': unchanged,
+                'total': len(self._events),
+                'version': self.version
+            }
+            return self.last_refresh
+
+    def prune(self, now):
+        """Remove eventos que já passaram; retorna quantos saíram"""
+        with self._lock:
+            times, events = self._index
+            past = events[:bisect_right(times, now.timestamp())]
+            for event in past:
+                del self._events[event_key(event)]
+            if past:
+                self._rebuild()
+            return len(past)
+
+    def _rebuild(self):
+        pairs = sorted(
+            ((event_ts(e), e) for e in self._events.values()),
+            key=lambda x: x[0]
+        )
+        self._index = ([p[0] for p in pairs], [p[1] for p in pairs])
+        intervals = build_timeline(pairs, self.window_fn)
+        self._timeline = ([iv[0] for iv in intervals], intervals)
+        self.version += 1
@@ -0,0 +1,124 @@
+# ═══════════════════════════════════════════════════════════════════════
+# GOLDAI PRO - RELÓGIO (REAL OU SIMULADO)
+# ═══════════════════════════════════════════════════════════════════════
+
+import os
+import threading
+import time
+from datetime import datetime
+
+# Quanto tempo (real) advance() espera uma thread acordada voltar a dormir
+SETTLE_TIMEOUT_SECONDS = 5.0
+
+
+class RealClock:
+    """Relógio do sistema: o padrão em produção"""
+
+    simulated = False
+
+    def now(self):
+        return datetime.now()
+
+    def time(self):
+        return time.time()
+
+    def monotonic(self):
+        return time.monotonic()
+
+    def sleep(self, seconds):
+        time.sleep(seconds)
+
+    def state(self):
+        return {'mode': 'real'}
+
+
+class SimulatedClock:
+    """Relógio que só anda quando alguém chama `advance()`.
+
+    `sleep()` bloqueia até o tempo simulado chegar ao prazo. `advance()`
+    avança de prazo em prazo: acorda as threads cujo sleep venceu e espera
+    cada uma voltar a dormir antes do próximo passo. Assim um loop em
+    background com tick de 30 s roda todos os ticks de um dia inteiro, na
+    ordem, em segundos de tempo real.
+    """
+
+    simulated = True
+
+    def __init__(self, start=None, settle_timeout=SETTLE_TIMEOUT_SECONDS):
+        self._ts = time.time() if start is None else float(start)
+        self._cond = threading.Condition()
+        self._sleepers = {}        # thread -> prazo do sleep
+        self._woken = set()        # acordadas por advance(), ainda trabalhando
+        self.settle_timeout = settle_timeout
+
+    def now(self):
+        return datetime.fromtimestamp(self._ts)
+
+    def time(self):
+        return self._ts
+
+    def monotonic(self):
+        return self._ts
+
+    def sleep(self, seconds):
+        tid = threading.get_ident()
+        with self._cond:
+            self._woken.discard(tid)
+            deadline = self._ts + max(0.0, seconds)
+            self._sleepers[tid] = deadline
+            self._cond.notify_all()
+            self._cond.wait_for(lambda: self._ts >= deadline)
+            if self._sleepers.get(tid) == deadline:
+                del self._sleepers[tid]
+
+    def advance(self, seconds):
+        """Avança `seconds` de tempo simulado, rodando cada sleep que vencer no caminho"""
+        with self._cond:
+            target = self._ts + seconds
+            while True:
+                due = [deadline for deadline in self._sleepers.values() if deadline <= target]
+                if not due:
+                    break
+                self._ts = max(self._ts, min(due))
+                woken = {tid for tid, deadline in self._sleepers.items() if deadline <= self._ts}
+                for tid in woken:
+                    del self._sleepers[tid]
+                self._woken |= woken
+                self._cond.notify_all()
+                # Thread que não volta a dormir (terminou ou travou) não segura a simulação
+                if not self._cond.wait_for(lambda: not (self._woken & woken), timeout=self.settle_timeout):
+                    self._woken -= woken
+            self._ts = max(self._ts, target)
+            self._cond.notify_all()
+
+    def wait_for_sleepers(self, count=1, timeout=None):
+        """Espera (tempo real) até `count` threads estarem em sleep; útil antes do primeiro advance()"""
+        with self._cond:
+            return self._cond.wait_for(lambda: len(self._sleepers) >= count, timeout=timeout)
+
+    def advance_to(self, ts):
+        """Avança até o epoch `ts` (nunca volta no tempo)"""
+        self.advance(max(0.0, ts - self._ts))
+
+    def state(self):
+        with self._cond:
+            return {
+                'mode': 'simulated',
+                'now': self.now().strftime('%Y-%m-%d %H:%M:%S'),
+                'sleepers': len(self._sleepers)
+            }
+
+
+def _parse_start(value):
+    try:
+        return float(value)
+    except ValueError:
+        return datetime.fromisoformat(value).timestamp()
+
+
+def clock_from_env():
+    """GOLDAI_CLOCK=simulated (início opcional em GOLDAI_CLOCK_START: epoch ou ISO) ou real"""
+    if os.environ.get('GOLDAI_CLOCK', 'real').lower() == 'simulated':
+        start = os.environ.get('GOLDAI_CLOCK_START')
+        return SimulatedClock(_parse_start(start) if start else None)
+    return RealClock()
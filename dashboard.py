@@ -5,6 +5,7 @@ Monitora o bot em tempo real com estatísticas reais
 """
 
 import requests
+from http_client import http_get, http_post
 import json
 import time
 from datetime import datetime, timedelta
@@ -23,7 +24,7 @@ class TraderIAMonitor:
     def check_server(self):
         """Verifica se servidor está online"""
         try:
-            response = requests.get(f"{self.server_url}/status", timeout=5)
+            response = http_get(f"{self.server_url}/status", timeout=5)
             if response.status_code == 200:
                 data = response.json()
                 return True, data
@@ -44,7 +45,7 @@ class TraderIAMonitor:
                 "technical_score": 0.5
             }
             
-            response = requests.post(
+            response = http_post(
                 f"{self.server_url}/signal",
                 json=test_data,
                 timeout=10
@@ -65,6 +66,32 @@ class TraderIAMonitor:
             print(f"❌ Erro ao enviar teste: {e}")
             return None
     
+    def send_test_batch(self, payloads):
+        """Envia vários sinais de teste (símbolos/timeframes) numa única requisição"""
+        try:
+            response = http_post(
+                f"{self.server_url}/signal/batch",
+                json=payloads,
+                timeout=10
+            )
+            
+            if response.status_code == 200:
+                received_at = datetime.now().isoformat()
+                results = response.json().get('results', [])
+                for signal_data in results:
+                    signal_data['received_at'] = received_at
+                return results
+            else:
+                print(f"❌ Servidor retornou erro: {response.status_code}")
+                return None
+                
+        except requests.exceptions.Timeout:
+            print("❌ Timeout ao conectar com servidor")
+            return None
+        except Exception as e:
+            print(f"❌ Erro ao enviar lote: {e}")
+            return None
+    
     def clear_screen(self):
         """Limpa tela de forma compatível"""
         os.system('cls' if os.name == 'nt' else 'clear')
@@ -0,0 +1,58 @@
+# ═══════════════════════════════════════════════════════════════════════
+# GOLDAI PRO - PIPELINE DE BUSCA CONCORRENTE
+# ═══════════════════════════════════════════════════════════════════════
+
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+# Pool compartilhado e limitado: uma rodada tem no máximo uma tarefa por fonte
+MAX_FETCH_WORKERS = 4
+
+_executor = ThreadPoolExecutor(max_workers=MAX_FETCH_WORKERS, thread_name_prefix='fetch')
+
+
+def _timed(func):
+    start = time.monotonic()
+    value = func()
+    return value, time.monotonic() - start
+
+
+def run_sources(sources):
+    """Roda fontes independentes em paralelo, cada uma com seu próprio timeout.
+
+    `sources` é um dict nome -> (função sem argumentos, timeout em segundos).
+    Retorna nome -> {'ok', 'value', 'error', 'seconds'} quando todas
+    terminarem ou estourarem o timeout. Um erro ou timeout em uma fonte não
+    afeta as outras; uma tarefa que estourou o timeout continua rodando no
+    pool até o timeout HTTP dela, mas o resultado é descartado.
+    """
+    started = time.monotonic()
+    pending = {
+        name: (_executor.submit(_timed, func), timeout)
+        for name, (func, timeout) in sources.items()
+    }
+
+    results = {}
+    for name, (future, timeout) in pending.items():
+        remaining = max(0.0, started + timeout - time.monotonic())
+        try:
+            value, seconds = future.result(timeout=remaining)
+            results[name] = {'ok': True, 'value': value, 'error': None, 'seconds': round(seconds, 3)}
+        except FutureTimeout:
+            results[name] = {'ok': False, 'value': None, 'error': f'timeout ({timeout}s)', 'seconds': timeout}
+        except Exception as e:
+            results[name] = {
+                'ok': False,
+                'value': None,
+                'error': str(e),
+                'seconds': round(time.monotonic() - started, 3)
+            }
+    return results
+
+
+def summarize(results):
+    """Resumo da rodada sem os valores (para logs e /status)"""
+    return {
+        name: {'ok': r['ok'], 'seconds': r['seconds'], 'error': r['error']}
+        for name, r in results.items()
+    }
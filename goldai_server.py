@@ -1,17 +1,31 @@
 from flask import Flask, jsonify, request
-import requests
 from datetime import datetime, timedelta
 import threading
-import time
 import json
 from collections import deque
 import logging
 from functools import wraps
 import sys
 import os
-import csv
+import io
 import pandas as pd  # ADICIONADO
 
+from calendar_store import EventStore, HIGH_IMPACT_LEVELS, fixed_window, IMPACT_PRIORITY
+from http_client import ConditionalFetcher, http_get, host_stats, request_not_sent
+from snapshot import save_snapshot, load_snapshot
+from clock import clock_from_env
+from news_cache import NewsCache
+from news_store import NewsStore, parse_since
+from signal_log import SignalLog
+from signal_cache import SignalCache, signal_key
+from scoring import technical_strength, combine_signals, signal_records
+from quota_ledger import QuotaLedger
+from news_scheduler import NewsPollScheduler, HOT_WINDOW_BEFORE_MINUTES, HOT_WINDOW_AFTER_MINUTES
+from sentiment_engine import SentimentEngine, BUCKET_RESOLUTIONS
+from calendar_parsing import parse_calendar_frame
+from fetch_pipeline import run_sources, summarize
+from log_setup import setup_logging, add_log_file
+
 app = Flask(__name__)
 
 # ═══════════════════════════════════════════════════════════════════════
@@ -27,13 +41,8 @@ if sys.platform == 'win32':
         sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'strict')
         sys.stderr = codecs.getwriter('utf-8')(sys.stderr.buffer, 'strict')
 
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(sys.stdout)
-    ]
-)
+# Fila + listener: formatação e escrita fora da thread do request (ver log_setup.py)
+setup_logging()
 logger = logging.getLogger(__name__)
 
 # ═══════════════════════════════════════════════════════════════════════
@@ -42,7 +51,31 @@ logger = logging.getLogger(__name__)
 ALPHA_VANTAGE_KEY = "1SNBE21SNHMIW6LP"
 API_RATE_LIMIT = 500
 CACHE_DURATION_MINUTES = 15
-NEWS_CSV_URL = "https://drive.google.com/uc?export=download&id=1TIHUF9zKnUVA5AZFHJHOTmytdQd3_YZ6"  # MODIFICADO
+SNAPSHOT_PATH = os.environ.get('GOLDAI_SNAPSHOT_PATH', 'goldai_snapshot.json')
+SNAPSHOT_MAX_AGE_HOURS = 6
+CALENDAR_REFRESH_SECONDS = 900  # 15 minutos
+SCHEDULER_TICK_SECONDS = 30
+BACKGROUND_UPDATES = os.environ.get('GOLDAI_BACKGROUND_UPDATES', '1') != '0'  # 0 = sem thread (benchmarks)
+NEWS_BUDGET_RESERVE = 50
+NEWS_DB_PATH = os.environ.get('GOLDAI_NEWS_DB', 'news_store.db')
+NEWS_RETENTION_DAYS = 30
+SIGNAL_LOG_DIR = os.environ.get('GOLDAI_SIGNAL_LOG_DIR', 'goldai_signals')
+LOG_FILE = 'goldai_server.log'  # um arquivo por processo: a rotação não é segura entre processos
+SIGNAL_CACHE_SIZE = 1024
+SIGNAL_BATCH_MAX = 100
+SIGNAL_CACHE_TTL_SECONDS = 900  # mudanças de calendário/notícias invalidam antes pela versão
+QUOTA_DB_PATH = os.environ.get('GOLDAI_QUOTA_DB', 'api_quota.db')
+NEWS_CACHE_SIZE = int(os.environ.get('GOLDAI_NEWS_CACHE_SIZE', 100))
+SENTIMENT_MODE = os.environ.get('GOLDAI_SENTIMENT_MODE', 'window')  # 'window' ou 'decayed'
+SENTIMENT_HALF_LIFE_MINUTES = int(os.environ.get('GOLDAI_SENTIMENT_HALF_LIFE', 60))
+NEWS_CSV_URL = os.environ.get('NEWS_CSV_URL', "https://drive.google.com/uc?export=download&id=1TIHUF9zKnUVA5AZFHJHOTmytdQd3_YZ6")  # MODIFICADO
+EXTERNAL_CALENDAR_URL = os.environ.get('GOLDAI_EXTERNAL_CALENDAR_URL', "https://nfs.faireconomy.media/ff_calendar_thisweek.json")
+# Resposta inteira da Alpha Vantage abaixo dos 20 s da tarefa no pipeline (+ até 1 leitura de 5 s)
+NEWS_HTTP_DEADLINE_SECONDS = 12
+NEWS_HTTP_READ_TIMEOUT_SECONDS = 5
+ALPHA_VANTAGE_URL = os.environ.get('GOLDAI_ALPHA_VANTAGE_URL', "https://www.alphavantage.co/query")
+EVENT_MINUTES_BEFORE = 20  # Janela de bloqueio antes do evento
+EVENT_MINUTES_AFTER = 30   # Janela de bloqueio depois do evento
 
 # ═══════════════════════════════════════════════════════════════════════
 # DECORADORES
@@ -54,7 +87,7 @@ def error_handler(func):
         try:
             return func(*args, **kwargs)
         except Exception as e:
-            logger.error(f"Erro em {func.__name__}: {str(e)}")
+            logger.error("Erro em %s: %s", func.__name__, e)
             return jsonify({
                 'error': str(e),
                 'function': func.__name__
@@ -66,15 +99,19 @@ def error_handler(func):
 # ═══════════════════════════════════════════════════════════════════════
 
 class GoldTradingServer:
-    def __init__(self):
+    def __init__(self, clock=None):
+        self.clock = clock or clock_from_env()
         self.alpha_key = ALPHA_VANTAGE_KEY
         self.csv_url = NEWS_CSV_URL  # MODIFICADO
+        self.csv_fetcher = ConditionalFetcher(self.csv_url, timeout=30)
         
         # Cache
-        self.economic_events = []
-        self.news_cache = deque(maxlen=100)
+        self.calendar = EventStore(fixed_window(EVENT_MINUTES_BEFORE, EVENT_MINUTES_AFTER))
+        self.news_cache = NewsCache(maxlen=NEWS_CACHE_SIZE)
+        self.sentiment_engine = SentimentEngine(SENTIMENT_HALF_LIFE_MINUTES)
+        self.news_store = NewsStore(NEWS_DB_PATH, retention_days=NEWS_RETENTION_DAYS)
         self.price_cache = deque(maxlen=500)
-        self.signal_cache = {}
+        self.signal_cache = SignalCache(maxsize=SIGNAL_CACHE_SIZE, ttl=SIGNAL_CACHE_TTL_SECONDS, clock=self.clock)
         
         # Timestamps
         self.last_news_fetch = None
@@ -85,119 +122,125 @@ class GoldTradingServer:
         # Estatísticas
         self.total_signals = 0
         self.accurate_signals = 0
-        self.api_calls_today = 0
-        self.api_reset_time = datetime.now().replace(hour=0, minute=0, second=0) + timedelta(days=1)
+        self.quota = QuotaLedger(QUOTA_DB_PATH, service='alpha_vantage', daily_limit=API_RATE_LIMIT, clock=self.clock)
+        self.api_reset_time = self.clock.now().replace(hour=0, minute=0, second=0) + timedelta(days=1)
         
         # Performance tracking
-        self.signal_history = deque(maxlen=200)
+        self.signal_history = SignalLog(SIGNAL_LOG_DIR)
         self.prediction_accuracy = {}
         
+        # Rodadas de atualização (pipeline concorrente)
+        self.refresh_lock = threading.Lock()
+        self.last_refresh_round = None
+        self.last_calendar_round = None
+        
+        # Agendador das buscas de notícias (cota Alpha Vantage)
+        self.news_scheduler = NewsPollScheduler(reserve=NEWS_BUDGET_RESERVE)
+        self.poller_id = f"{os.path.basename(__file__)}:{os.getpid()}"
+        
+        # Warm start: snapshot em disco
+        self.snapshot_path = SNAPSHOT_PATH
+        self.last_snapshot = None
+        self.warm_started = self.restore_snapshot()
+        if self.warm_started and self.last_news_fetch:
+            # Notícias do snapshot contam como a última busca
+            self.news_scheduler.record_success(self.last_news_fetch.timestamp())
+        
         logger.info("[OK] Servidor GoldAI Pro v2.0 inicializado")
-        self.start_background_updates()  # MODIFICADO
+        if BACKGROUND_UPDATES:
+            self.start_background_updates()  # MODIFICADO
     
-    def load_csv_from_drive(self):  # MÉTODO NOVO
-        """Carrega eventos do CSV do Google Drive"""
+    @property
+    def api_calls_today(self):
+        """Chamadas de hoje à Alpha Vantage, somando todos os processos (ledger)"""
+        return self.quota.used()
+    
+    @property
+    def economic_events(self):
+        """Eventos do calendário ordenados por horário"""
+        return self.calendar.events()
+    
+    def restore_snapshot(self):
+        """Carrega eventos, notícias e timestamps do último snapshot"""
         try:
-            logger.info(f"[API] Buscando CSV do Google Drive: {self.csv_url}")
-            
-            # Usar pandas para ler o CSV diretamente da URL
-            df = pd.read_csv(self.csv_url)
-            logger.info(f"[OK] CSV carregado com {len(df)} registros")
-            
-            csv_events = []
-            
-            for index, row in df.iterrows():
-                try:
-                    # Extrair evento
-                    event_name = str(row.get('Evento', '')).strip()
-                    if not event_name or event_name == 'nan':
-                        event_name = str(row.get('Event', '')).strip()
-                    
-                    if not event_name or event_name == 'nan':
-                        continue
-                    
-                    # Extrair data
-                    event_date = str(row.get('Data', '')).strip()
-                    if not event_date or event_date == 'nan':
-                        event_date = str(row.get('Date', '')).strip()
-                    
-                    if not event_date or event_date == 'nan':
-                        continue
-                    
-                    # Extrair impacto
-                    impact = str(row.get('Impacto', 'MEDIUM')).strip()
-                    if not impact or impact == 'nan':
-                        impact = str(row.get('Impact', 'MEDIUM')).strip()
-                    
-                    impact = impact.upper()
-                    if impact not in ['CRITICAL', 'HIGH', 'MEDIUM', 'LOW']:
-                        impact = 'MEDIUM'
-                    
-                    # Extrair moeda
-                    currency = str(row.get('Moeda', 'USD')).strip()
-                    if not currency or currency == 'nan':
-                        currency = str(row.get('Currency', 'USD')).strip()
-                    currency = currency.upper()
-                    
-                    # Parsear data
-                    event_datetime = None
-                    
-                    # Tentar formato ISO 8601
-                    if 'T' in event_date:
-                        try:
-                            date_part = event_date.split('+')[0].split('-04:00')[0].split('-05:00')[0]
-                            event_datetime = datetime.fromisoformat(date_part)
-                        except:
-                            try:
-                                event_datetime = datetime.fromisoformat(event_date.replace('Z', '+00:00'))
-                            except:
-                                pass
-                    
-                    # Tentar formatos alternativos
-                    if event_datetime is None:
-                        formatos = [
-                            "%Y-%m-%d %H:%M",
-                            "%d/%m/%Y %H:%M",
-                            "%Y-%m-%d",
-                            "%d/%m/%Y",
-                        ]
-                        
-                        for fmt in formatos:
-                            try:
-                                event_datetime = datetime.strptime(event_date, fmt)
-                                break
-                            except:
-                                continue
-                    
-                    if event_datetime is None:
-                        logger.warning(f"[WARN] Não consegui parsear data: '{event_date}' ({event_name})")
-                        continue
-                    
-                    csv_events.append({
-                        'name': event_name,
-                        'time': event_datetime,
-                        'impact': impact,
-                        'currency': currency,
-                        'source': 'Google Drive CSV'
-                    })
-                    
-                except Exception as e:
-                    logger.warning(f"[WARN] Erro ao processar linha {index}: {e}")
-                    continue
-            
-            # Atualizar eventos
-            self.economic_events = csv_events
-            self.economic_events.sort(key=lambda x: x['time'])
-            self.last_csv_fetch = datetime.now()
+            data = load_snapshot(self.snapshot_path, SNAPSHOT_MAX_AGE_HOURS * 3600)
+            if not data:
+                return False
             
-            logger.info(f"[OK] Calendário carregado do Google Drive: {len(csv_events)} eventos válidos")
+            self.calendar.refresh(data.get('events', []))
+            self.calendar.prune(self.clock.now())
+            self.news_cache.extend(data.get('news', []))
+            for news_item in self.news_cache:
+                self.sentiment_engine.add(news_item, now=self.clock.time())
             
-            if csv_events:
-                for event in csv_events[:5]:
-                    logger.info(f"     - {event['name']} ({event['time'].strftime('%d/%m %H:%M')}) - {event['impact']}")
+            self.last_news_fetch = data.get('last_news_fetch')
+            self.last_csv_fetch = data.get('last_csv_fetch')
+            self.csv_fetcher.restore(data.get('csv_validators'))
             
+            logger.info(f"[SNAPSHOT] Warm start: {len(self.calendar)} eventos, {len(self.news_cache)} notícias (idade: {data['age_seconds']:.0f}s)")
             return True
             
+        except Exception as e:
+            logger.error(f"[ERROR] Carregando snapshot: {e}")
+            return False
+    
+    def write_snapshot(self):
+        """Grava eventos, notícias e timestamps no disco"""
+        try:
+            self.last_snapshot = save_snapshot(self.snapshot_path, {
+                'events': list(self.economic_events),
+                'news': list(self.news_cache),
+                'last_news_fetch': self.last_news_fetch,
+                'last_csv_fetch': self.last_csv_fetch,
+                'csv_validators': self.csv_fetcher.state(),
+            })
+        except Exception as e:
+            logger.error(f"[ERROR] Gravando snapshot: {e}")
+    
+    def download_csv_events(self):
+        """Baixa e parseia o CSV do Drive; retorna os eventos ou None se não mudou"""
+        logger.info(f"[API] Buscando CSV do Google Drive: {self.csv_url}")
+        
+        # Download condicional (ETag/Last-Modified + hash do conteúdo)
+        body = self.csv_fetcher.fetch()
+        if body is None:
+            logger.info("[CACHE] CSV do Google Drive não mudou, pulando parse")
+            return None
+        
+        df = pd.read_csv(io.BytesIO(body))
+        logger.info(f"[OK] CSV carregado com {len(df)} registros")
+        
+        # Parse colunar: aliases, impacto, Data+Hora e filtro de futuros em bloco
+        csv_events, parse_stats = parse_calendar_frame(df, self.clock.now())
+        if parse_stats['invalid']:
+            logger.warning(f"[WARN] {parse_stats['invalid']} linhas com data inválida ignoradas")
+        
+        logger.info(f"[OK] CSV parseado: {len(csv_events)} eventos futuros ({parse_stats['valid']} válidos)")
+        return csv_events
+    
+    def apply_csv_events(self, csv_events):
+        """Aplica os eventos do CSV (o CSV substitui o calendário inteiro)"""
+        changes = self.calendar.refresh(csv_events)
+        self.csv_fetcher.mark_applied()
+        self.last_csv_fetch = self.clock.now()
+        
+        logger.info(f"[OK] Calendário carregado do Google Drive: {len(csv_events)} eventos futuros")
+        logger.info(f"[CALENDAR] Drive: +{changes['inserted']} ~{changes['updated']} -{changes['removed']} (total: {changes['total']})")
+        
+        if csv_events:
+            for event in self.economic_events[:5]:
+                logger.info(f"     - {event['name']} ({event['time'].strftime('%d/%m %H:%M')}) - {event['impact']}")
+        
+        return True
+    
+    def load_csv_from_drive(self):  # MÉTODO NOVO
+        """Carrega eventos do CSV do Google Drive"""
+        try:
+            csv_events = self.download_csv_events()
+            if csv_events is None:
+                return True
+            return self.apply_csv_events(csv_events)
+            
         except Exception as e:
             logger.error(f"[ERROR] Carregando CSV do Google Drive: {e}")
             return False
@@ -205,10 +248,10 @@ class GoldTradingServer:
     def fetch_external_calendar(self):
         """Busca calendário de fonte pública (fallback)"""
         try:
-            url = "https://nfs.faireconomy.media/ff_calendar_thisweek.json"
+            url = EXTERNAL_CALENDAR_URL
             logger.info(f"[API] Buscando calendário externo de {url}")
             
-            response = requests.get(url, timeout=10)
+            response = http_get(url, timeout=10)
             data = response.json()
             
             events = data if isinstance(data, list) else data.get("events", [])
@@ -268,48 +311,114 @@ class GoldTradingServer:
             else:
                 # Fallback para API externa
                 logger.info("[INFO] Fallback para API externa...")
-                external_events = self.fetch_external_calendar()
-                if external_events:
-                    self.economic_events = external_events
-                    self.economic_events.sort(key=lambda x: x['time'])
-                    self.last_csv_fetch = datetime.now()
-                    logger.info(f"[OK] {len(external_events)} eventos carregados da API externa")
-                    return True
-            
-            return False
+                return self.apply_external_events(self.fetch_external_calendar())
             
         except Exception as e:
             logger.error(f"[ERROR] Carregando eventos: {e}")
             return False
     
+    def apply_external_events(self, external_events):
+        """Aplica os eventos da API externa no lugar do calendário inteiro"""
+        if not external_events:
+            return False
+        
+        changes = self.calendar.refresh(external_events)
+        # O calendário não é mais o do CSV: o próximo download precisa ser aplicado
+        self.csv_fetcher.reset()
+        self.last_csv_fetch = self.clock.now()
+        logger.info(f"[OK] {len(external_events)} eventos carregados da API externa")
+        logger.info(f"[CALENDAR] Externa: +{changes['inserted']} ~{changes['updated']} -{changes['removed']} (total: {changes['total']})")
+        return True
+    
+    def refresh_all(self, fetch_news=True, fetch_calendar=True):
+        """Busca Drive, calendário externo e notícias em paralelo e aplica tudo de uma vez"""
+        sources = {}
+        if fetch_calendar:
+            sources['drive_csv'] = (self.download_csv_events, 35)
+            sources['external_calendar'] = (self.fetch_external_calendar, 15)
+        if fetch_news:
+            sources['news'] = (self.download_gold_news, 20)
+        
+        results = run_sources(sources)
+        
+        # Merge único, depois que todas as fontes terminaram (ou estouraram o timeout)
+        with self.refresh_lock:
+            if fetch_calendar:
+                drive = results['drive_csv']
+                if not drive['ok']:
+                    logger.error(f"[ERROR] Carregando CSV do Google Drive: {drive['error']}")
+                    logger.info("[INFO] Fallback para API externa...")
+                    self.apply_external_events(results['external_calendar']['value'])
+                elif drive['value'] is not None:
+                    self.apply_csv_events(drive['value'])
+            
+            news = results.get('news')
+            if news and not news['ok']:
+                logger.error(f"[ERROR] Notícias: {news['error']}")
+                self.news_scheduler.record_failure(self.clock.time(), news['error'])
+            elif news and news['value'] is not None:
+                self.apply_gold_news(news['value'])
+        
+        if fetch_calendar:
+            self.last_calendar_round = self.clock.time()
+        self.last_refresh_round = summarize(results)
+        logger.info(f"[PIPELINE] Rodada concluída: {self.last_refresh_round}")
+        return self.last_refresh_round
+    
+    def plan_news_fetch(self, now_ts=None):
+        """Atualiza o plano do agendador com a cota restante e os eventos de alto impacto"""
+        now_ts = self.clock.time() if now_ts is None else now_ts
+        reset_ts = self.api_reset_time.timestamp()
+        event_times = [
+            ts for ts, event in self.calendar.window(
+                now_ts - HOT_WINDOW_AFTER_MINUTES * 60,
+                reset_ts + HOT_WINDOW_BEFORE_MINUTES * 60
+            )
+            if event['impact'] in HIGH_IMPACT_LEVELS
+        ]
+        # Outros processos no mesmo ledger: planeja só a parte deste
+        pollers = self.quota.heartbeat(self.poller_id)
+        return self.news_scheduler.update_plan(
+            now_ts, API_RATE_LIMIT - self.api_calls_today, reset_ts, event_times, pollers=pollers
+        )
+    
     def start_background_updates(self):
         """Inicia threads de atualização em background"""
         def update_loop():
             while True:
                 try:
-                    # Resetar contador de API diariamente
-                    if datetime.now() >= self.api_reset_time:
-                        self.api_calls_today = 0
+                    # Novo dia: o ledger passa a contar em uma linha nova
+                    if self.clock.now() >= self.api_reset_time:
                         self.api_reset_time += timedelta(days=1)
                         logger.info("[RESET] Contador de API resetado")
                     
-                    # Carregar eventos do calendário
-                    self.load_calendar_events()  # MODIFICADO
+                    now_ts = self.clock.time()
+                    fetch_calendar = (
+                        self.last_calendar_round is None
+                        or now_ts - self.last_calendar_round >= CALENDAR_REFRESH_SECONDS
+                    )
                     
-                    # Atualizar dados da API (se disponível)
-                    if self.api_calls_today < API_RATE_LIMIT - 50:
-                        self.fetch_gold_news()
-                    else:
-                        logger.warning("[WARN] Limite de API próximo, pulando atualização")
+                    # Notícias só quando o agendador manda (cota + eventos de alto impacto)
+                    plan = self.plan_news_fetch(now_ts)
+                    fetch_news = self.news_scheduler.due(now_ts)
+                    if fetch_news:
+                        logger.info(f"[SCHED] Buscando notícias (modo {plan['mode']}, intervalo {plan['interval_seconds']}s, cota restante {plan['remaining_budget']})")
                     
-                    # Limpar cache antigo
-                    self.clean_old_cache()
+                    if fetch_calendar or fetch_news:
+                        # Drive, calendário externo e notícias em paralelo
+                        self.refresh_all(fetch_news=fetch_news, fetch_calendar=fetch_calendar)
+                        
+                        # Limpar cache antigo
+                        self.clean_old_cache()
+                        
+                        # Snapshot para o próximo boot
+                        self.write_snapshot()
                     
-                    time.sleep(900)  # 15 minutos
+                    self.clock.sleep(SCHEDULER_TICK_SECONDS)
                     
                 except Exception as e:
                     logger.error(f"[ERROR] Background: {e}")
-                    time.sleep(300)
+                    self.clock.sleep(300)
         
         threading.Thread(target=update_loop, daemon=True).start()
         logger.info("[OK] Thread de atualização iniciada")
@@ -317,98 +426,141 @@ class GoldTradingServer:
     def clean_old_cache(self):
         """Remove dados antigos do cache"""
         try:
-            now = datetime.now()
+            now = self.clock.now()
             
             # Remover eventos passados
-            self.economic_events = [
-                e for e in self.economic_events 
-                if e['time'] > now
-            ]
-            
-            # Limpar sinais antigos (> 1 hora)
-            old_signals = [
-                k for k, v in self.signal_cache.items()
-                if (now - v['timestamp']).total_seconds() > 3600
-            ]
-            for k in old_signals:
-                del self.signal_cache[k]
+            self.calendar.prune(now)
+            
+            # Histórico de notícias além da retenção
+            self.news_store.prune(now.timestamp())
+            
+            # Limpar sinais vencidos
+            self.signal_cache.purge_expired()
                 
         except Exception as e:
             logger.error(f"[ERROR] Limpando cache: {e}")
     
-    def fetch_gold_news(self):
-        """Busca notícias sobre ouro"""
+    def download_gold_news(self):
+        """Busca o feed de notícias; retorna a lista de itens (ou None)"""
+        # Reserva atômica no ledger compartilhado antes de qualquer chamada
+        if not self.quota.reserve():
+            logger.warning("[WARN] Limite diário de API atingido")
+            return None
+        
+        url = ALPHA_VANTAGE_URL
+        params = {
+            'function': 'NEWS_SENTIMENT',
+            'topics': 'economy_fiscal,economy_monetary,financial_markets',
+            'tickers': 'FOREX:USD',
+            'apikey': self.alpha_key,
+            'limit': 50
+        }
+        
+        # Sem retry: cada tentativa gastaria uma chamada não reservada
         try:
-            if self.api_calls_today >= API_RATE_LIMIT:
-                logger.warning("[WARN] Limite diário de API atingido")
-                return
-            
-            url = "https://www.alphavantage.co/query"
-            params = {
-                'function': 'NEWS_SENTIMENT',
-                'topics': 'economy_fiscal,economy_monetary,financial_markets',
-                'tickers': 'FOREX:USD',
-                'apikey': self.alpha_key,
-                'limit': 50
-            }
-            
-            response = requests.get(url, params=params, timeout=15)
-            self.api_calls_today += 1
-            
-            if response.status_code == 200:
-                data = response.json()
-                
-                if 'feed' not in data:
-                    logger.warning(f"[WARN] Resposta inesperada da API")
-                    return
+            response = http_get(
+                url, params=params, timeout=NEWS_HTTP_READ_TIMEOUT_SECONDS,
+                retries=0, deadline=NEWS_HTTP_DEADLINE_SECONDS
+            )
+        except Exception as e:
+            if request_not_sent(e):
+                # Nada chegou à API: a reserva volta para o ledger
+                self.quota.release()
+            raise
+        
+        if response.status_code != 200:
+            logger.warning(f"[WARN] API status {response.status_code}")
+            self.news_scheduler.record_failure(self.clock.time(), f"HTTP {response.status_code}")
+            return None
+        
+        data = response.json()
+        
+        if 'feed' not in data:
+            # 'Note'/'Information' = limite de chamadas da Alpha Vantage
+            throttle = data.get('Note') or data.get('Information')
+            if throttle:
+                logger.warning(f"[WARN] API limitou as chamadas: {throttle[:120]}")
+                self.news_scheduler.record_failure(self.clock.time(), 'throttle')
+            else:
+                logger.warning(f"[WARN] Resposta inesperada da API")
+                self.news_scheduler.record_failure(self.clock.time(), 'unexpected')
+            return None
+        
+        items = []
+        for item in data.get('feed', [])[:30]:
+            try:
+                sentiment_score = float(item.get('overall_sentiment_score', 0))
                 
-                feed = data.get('feed', [])
-                new_items = 0
+                if sentiment_score > 0.15:
+                    sentiment = 'BULLISH'
+                elif sentiment_score < -0.15:
+                    sentiment = 'BEARISH'
+                else:
+                    sentiment = 'NEUTRAL'
                 
-                for item in feed[:30]:
-                    try:
-                        sentiment_score = float(item.get('overall_sentiment_score', 0))
-                        
-                        if sentiment_score > 0.15:
-                            sentiment = 'BULLISH'
-                        elif sentiment_score < -0.15:
-                            sentiment = 'BEARISH'
-                        else:
-                            sentiment = 'NEUTRAL'
-                        
-                        news_item = {
-                            'title': item.get('title', '')[:120],
-                            'source': item.get('source', 'Unknown'),
-                            'sentiment': sentiment,
-                            'score': round(sentiment_score, 3),
-                            'time': item.get('time_published', '')[:10],
-                            'relevance': round(float(item.get('relevance_score', 0.5)), 2),
-                            'url': item.get('url', '')
-                        }
-                        
-                        if news_item not in self.news_cache:
-                            self.news_cache.append(news_item)
-                            new_items += 1
-                            
-                    except Exception as e:
-                        continue
+                items.append({
+                    'title': item.get('title', '')[:120],
+                    'source': item.get('source', 'Unknown'),
+                    'sentiment': sentiment,
+                    'score': round(sentiment_score, 3),
+                    'time': item.get('time_published', '')[:10],
+                    'published': item.get('time_published', ''),
+                    'relevance': round(float(item.get('relevance_score', 0.5)), 2),
+                    'url': item.get('url', '')
+                })
                 
-                self.last_news_fetch = datetime.now()
-                logger.info(f"[OK] Notícias: +{new_items} novos (total: {len(self.news_cache)})")
-            else:
-                logger.warning(f"[WARN] API status {response.status_code}")
+            except Exception as e:
+                continue
+        
+        return items
+    
+    def apply_gold_news(self, items):
+        """Adiciona ao cache as notícias que ainda não estão nele"""
+        # Sucesso só quando o resultado é aplicado (não se o pipeline o descartou)
+        self.news_scheduler.record_success(self.clock.time())
+        new_items = 0
+        for news_item in items:
+            if self.news_cache.add(news_item):
+                self.sentiment_engine.add(news_item, now=self.clock.time())
+                new_items += 1
+        
+        # Histórico em disco (INSERT OR IGNORE pela mesma chave do cache)
+        stored = self.news_store.add_many(items, fetched_ts=self.clock.time())
+        
+        self.last_news_fetch = self.clock.now()
+        logger.info(f"[OK] Notícias: +{new_items} novos (total: {len(self.news_cache)}, histórico: +{stored})")
+        return new_items
+    
+    def fetch_gold_news(self):
+        """Busca notícias sobre ouro"""
+        try:
+            items = self.download_gold_news()
+            if items is not None:
+                self.apply_gold_news(items)
                 
         except Exception as e:
             logger.error(f"[ERROR] Notícias: {e}")
+            self.news_scheduler.record_failure(self.clock.time(), str(e))
     
-    def check_news_impact(self, minutes_before=20, minutes_after=30):
+    def check_news_impact(self, minutes_before=EVENT_MINUTES_BEFORE, minutes_after=EVENT_MINUTES_AFTER):
         """Verifica eventos próximos"""
         try:
-            now = datetime.now()
+            now_ts = self.clock.time()
             critical_events = []
             
-            for event in self.economic_events:
-                time_diff = (event['time'] - now).total_seconds() / 60
+            # Com a janela padrão, a linha do tempo pré-calculada responde direto
+            default_window = (minutes_before, minutes_after) == (EVENT_MINUTES_BEFORE, EVENT_MINUTES_AFTER)
+            if default_window and self.calendar.blocked_at(now_ts) is None:
+                return {'has_event': False}
+            
+            # Só os eventos dentro da janela (busca binária no índice)
+            candidates = self.calendar.window(
+                now_ts - minutes_after * 60,
+                now_ts + minutes_before * 60
+            )
+            
+            for event_ts, event in candidates:
+                time_diff = (event_ts - now_ts) / 60
                 
                 if -minutes_after <= time_diff <= minutes_before:
                     critical_events.append({
@@ -421,7 +573,7 @@ class GoldTradingServer:
             
             if critical_events:
                 critical_events.sort(key=lambda x: (
-                    {'CRITICAL': 0, 'HIGH': 1, 'MEDIUM': 2, 'LOW': 3}.get(x['impact'], 4),
+                    IMPACT_PRIORITY.get(x['impact'], 4),
                     abs(x['minutes_away'])
                 ))
                 
@@ -434,231 +586,177 @@ class GoldTradingServer:
             return {'has_event': False}
             
         except Exception as e:
-            logger.error(f"[ERROR] Verificando eventos: {e}")
+            logger.error("[ERROR] Verificando eventos: %s", e)
             return {'has_event': False}
     
     def generate_trading_signal(self, technical_data):
         """Gera sinal de trading"""
         try:
-            action = technical_data.get('action', 'NONE')
-            confidence = technical_data.get('confidence', 0)
-            ema5 = technical_data.get('ema5', 0)
-            ema15 = technical_data.get('ema15', 0)
-            ema50 = technical_data.get('ema50', 0)
-            adx = technical_data.get('adx', 0)
-            rsi = technical_data.get('rsi', 50)
-            current_price = technical_data.get('current_price', 0)
+            # CORREÇÃO: Verifica eventos primeiro (agora com janela maior)
+            news_impact = self.check_news_impact()
             
-            signal_hash = f"{action}_{int(confidence)}_{int(adx)}_{int(rsi)}"
+            if news_impact['has_event']:
+                return self._event_signal(news_impact)
             
-            if signal_hash in self.signal_cache:
-                cached = self.signal_cache[signal_hash]
-                if (datetime.now() - cached['timestamp']).total_seconds() < 120:
-                    logger.debug("[CACHE] Retornando sinal do cache")
-                    return cached['signal']
+            return self._evaluate_signal(technical_data, self._data_versions(), self._current_sentiment())
             
+        except Exception as e:
+            return self._error_signal(e)
+    
+    def generate_trading_signals(self, batch):
+        """Gera sinais para vários payloads com um único snapshot de calendário e sentimento"""
+        try:
             news_impact = self.check_news_impact()
             
             if news_impact['has_event']:
-                result = {
-                    'signal': 'HOLD',
-                    'action': 'WAIT',
-                    'confidence': 0,
-                    'reason': f"Evento próximo: {news_impact['event_name']}",
-                    'event_warning': True,
-                    'event_name': news_impact['event_name'],
-                    'minutes_to_event': news_impact['minutes_away'],
-                    'impact_level': news_impact['impact'],
-                    'event_source': news_impact.get('source', 'Unknown'),
-                    'total_events': news_impact.get('total_events', 1)
-                }
-                
-                logger.warning(f"[EVENT] {news_impact['event_name']} em {news_impact['minutes_away']}min")
-                return result
+                blocked = self._event_signal(news_impact)
+                return [dict(blocked) for _ in batch]
+            
+            versions = self._data_versions()
+            news_sentiment = self._current_sentiment()
+            
+        except Exception as e:
+            error = self._error_signal(e)
+            return [dict(error) for _ in batch]
+        
+        results = [None] * len(batch)
+        # cache_key -> (primeiro payload, posições no lote): payloads iguais são calculados uma vez só
+        misses = {}
+        for i, technical_data in enumerate(batch):
+            try:
+                cache_key = signal_key(technical_data)
+            except Exception as e:
+                results[i] = self._error_signal(e)
+                continue
+            if cache_key in misses:
+                misses[cache_key][1].append(i)
+                continue
+            cached = self.signal_cache.get(cache_key, versions)
+            if cached is not None:
+                results[i] = cached
+            else:
+                misses[cache_key] = (technical_data, [i])
+        
+        if misses:
+            # Um único cálculo vetorizado para todos os payloads fora do cache
+            try:
+                scored = signal_records([technical_data for technical_data, _ in misses.values()], news_sentiment, self.clock.now())
+            except Exception as e:
+                error = self._error_signal(e)
+                for _, positions in misses.values():
+                    for i in positions:
+                        results[i] = dict(error)
+                return results
+            for (cache_key, (technical_data, positions)), final_signal in zip(misses.items(), scored):
+                stored = self._store_signal(cache_key, versions, final_signal, technical_data)
+                for i in positions:
+                    results[i] = stored
+        
+        return results
+    
+    def _event_signal(self, news_impact):
+        """Sinal de bloqueio por evento próximo"""
+        result = {
+            'signal': 'HOLD',
+            'action': 'WAIT',
+            'confidence': 0,
+            'reason': f"Evento próximo: {news_impact['event_name']}",
+            'event_warning': True,
+            'event_name': news_impact['event_name'],
+            'minutes_to_event': news_impact['minutes_away'],
+            'impact_level': news_impact['impact'],
+            'event_source': news_impact.get('source', 'Unknown'),
+            'total_events': news_impact.get('total_events', 1)
+        }
+        
+        logger.warning("[EVENT] %s em %smin", news_impact['event_name'], news_impact['minutes_away'])
+        return result
+    
+    def _current_sentiment(self):
+        if SENTIMENT_MODE == 'decayed':
+            return self.sentiment_engine.label(self.clock.time())
+        return self._analyze_news_sentiment()
+    
+    def _evaluate_signal(self, technical_data, versions, news_sentiment):
+        """Sinal de um payload, já fora de janela de evento"""
+        try:
+            action = technical_data.get('action', 'NONE')
+            confidence = technical_data.get('confidence', 0)
+            
+            # Cache só depois do bloqueio: um evento que entrou na janela não é mascarado
+            cache_key = signal_key(technical_data)
+            cached = self.signal_cache.get(cache_key, versions)
+            if cached is not None:
+                logger.debug("[CACHE] Retornando sinal do cache")
+                return cached
             
-            news_sentiment = self._analyze_news_sentiment()
             technical_strength = self._calculate_technical_strength(technical_data)
             final_signal = self._combine_signals(
                 action, confidence, news_sentiment, 
                 technical_strength, technical_data
             )
             
-            self.signal_cache[signal_hash] = {
-                'signal': final_signal,
-                'timestamp': datetime.now()
-            }
-            
-            self.total_signals += 1
-            self.signal_history.append({
-                'action': final_signal['action'],
-                'confidence': final_signal['confidence'],
-                'timestamp': datetime.now().isoformat(),
-                'price': current_price
-            })
-            
-            logger.info(f"[SIGNAL] {final_signal['action']} (Conf: {final_signal['confidence']:.1f}%)")
-            
-            return final_signal
+            return self._store_signal(cache_key, versions, final_signal, technical_data)
             
         except Exception as e:
-            logger.error(f"[ERROR] Gerando sinal: {e}")
-            return {
-                'signal': 'ERROR',
-                'action': 'HOLD',
-                'confidence': 0,
-                'reason': f'Erro: {str(e)}'
-            }
+            return self._error_signal(e)
+    
+    def _store_signal(self, cache_key, versions, final_signal, technical_data):
+        """Guarda no cache, conta e registra no histórico um sinal recém-calculado"""
+        current_price = technical_data.get('current_price', 0)
+        self.signal_cache.put(cache_key, final_signal, versions)
+        
+        self.total_signals += 1
+        self.signal_history.append({
+            'symbol': technical_data.get('symbol'),
+            'timeframe': technical_data.get('timeframe'),
+            'action': final_signal['action'],
+            'confidence': final_signal['confidence'],
+            'timestamp': self.clock.now().isoformat(),
+            'price': current_price
+        }, now=self.clock.time())
+        
+        logger.info("[SIGNAL] %s (Conf: %.1f%%)", final_signal['action'], final_signal['confidence'])
+        
+        return final_signal
+    
+    def _error_signal(self, e):
+        logger.error("[ERROR] Gerando sinal: %s", e)
+        return {
+            'signal': 'ERROR',
+            'action': 'HOLD',
+            'confidence': 0,
+            'reason': f'Erro: {str(e)}'
+        }
     
     def _analyze_news_sentiment(self):
-        """Analisa sentimento"""
+        """Analisa sentimento (agregado mantido pelo NewsCache)"""
         try:
-            if not self.news_cache:
-                return 'NEUTRAL'
-            
-            recent_news = [
-                news for news in self.news_cache
-                if news.get('relevance', 0) > 0.3
-            ][:15]
-            
-            if not recent_news:
-                return 'NEUTRAL'
-            
-            bullish_score = 0
-            bearish_score = 0
-            
-            for news in recent_news:
-                relevance = news.get('relevance', 0.5)
-                sentiment = news.get('sentiment', 'NEUTRAL')
-                
-                if sentiment == 'BULLISH':
-                    bullish_score += relevance
-                elif sentiment == 'BEARISH':
-                    bearish_score += relevance
-            
-            diff = abs(bullish_score - bearish_score)
-            
-            if diff < 0.3:
-                return 'NEUTRAL'
-            elif bullish_score > bearish_score:
-                return 'BULLISH'
-            else:
-                return 'BEARISH'
+            return self.news_cache.sentiment()['label']
                 
         except Exception as e:
-            logger.error(f"[ERROR] Sentimento: {e}")
+            logger.error("[ERROR] Sentimento: %s", e)
             return 'NEUTRAL'
     
     def _calculate_technical_strength(self, tech_data):
         """Calcula força técnica"""
         try:
-            score = 0
-            
-            adx = tech_data.get('adx', 0)
-            if adx >= 40:
-                score += 20
-            elif adx >= 30:
-                score += 15
-            elif adx >= 25:
-                score += 10
-            
-            rsi = tech_data.get('rsi', 50)
-            action = tech_data.get('action', 'NONE')
-            
-            if action == 'BUY':
-                if 40 <= rsi <= 60:
-                    score += 20
-                elif 30 <= rsi < 40:
-                    score += 15
-                elif rsi > 70:
-                    score -= 10
-            elif action == 'SELL':
-                if 40 <= rsi <= 60:
-                    score += 20
-                elif 60 < rsi <= 70:
-                    score += 15
-                elif rsi < 30:
-                    score -= 10
-            
-            ema5 = tech_data.get('ema5', 0)
-            ema15 = tech_data.get('ema15', 0)
-            ema50 = tech_data.get('ema50', 0)
-            
-            if action == 'BUY' and ema5 > ema15 > ema50:
-                score += 30
-            elif action == 'BUY' and ema5 > ema15:
-                score += 20
-            elif action == 'SELL' and ema5 < ema15 < ema50:
-                score += 30
-            elif action == 'SELL' and ema5 < ema15:
-                score += 20
-            
-            confidence = tech_data.get('confidence', 0) * 100
-            score += min(confidence * 0.3, 30)
-            
-            return min(score, 100)
+            return technical_strength(tech_data)
             
         except Exception as e:
-            logger.error(f"[ERROR] Força técnica: {e}")
+            logger.error("[ERROR] Força técnica: %s", e)
             return 0
     
+    def _data_versions(self):
+        """Versões de calendário e notícias contra as quais um sinal é calculado"""
+        if SENTIMENT_MODE == 'decayed':
+            # O rótulo decaído muda com o tempo, mesmo sem notícia nova
+            return (self.calendar.version, self.news_cache.version, self.sentiment_engine.label(self.clock.time()))
+        return (self.calendar.version, self.news_cache.version)
+    
     def _combine_signals(self, action, confidence, news_sentiment, technical_strength, tech_data):
         """Combina sinais"""
-        
-        if action == 'NONE':
-            return {
-                'signal': 'NONE',
-                'action': 'WAIT',
-                'confidence': 0,
-                'reason': 'Sem sinal técnico',
-                'technical_strength': technical_strength,
-                'news_sentiment': news_sentiment
-            }
-        
-        base_confidence = confidence * 100 if confidence <= 1 else confidence
-        adjusted_confidence = base_confidence
-        
-        if action == 'BUY':
-            if news_sentiment == 'BULLISH':
-                adjusted_confidence += 12
-            elif news_sentiment == 'BEARISH':
-                adjusted_confidence -= 18
-        elif action == 'SELL':
-            if news_sentiment == 'BEARISH':
-                adjusted_confidence += 12
-            elif news_sentiment == 'BULLISH':
-                adjusted_confidence -= 18
-        
-        final_confidence = (adjusted_confidence * 0.6) + (technical_strength * 0.4)
-        final_confidence = max(0, min(100, final_confidence))
-        
-        if final_confidence < 60:
-            signal_type = 'WEAK'
-            final_action = 'WAIT'
-            reason = f'Confiança baixa: {final_confidence:.1f}%'
-        elif final_confidence < 75:
-            signal_type = 'MODERATE'
-            final_action = action
-            reason = f'Sinal moderado: {final_confidence:.1f}%'
-        else:
-            signal_type = 'STRONG'
-            final_action = action
-            reason = f'Sinal forte: {final_confidence:.1f}%'
-        
-        return {
-            'signal': signal_type,
-            'action': final_action,
-            'confidence': round(final_confidence, 2),
-            'reason': reason,
-            'news_sentiment': news_sentiment,
-            'technical_strength': round(technical_strength, 2),
-            'base_confidence': round(base_confidence, 2),
-            'timestamp': datetime.now().isoformat(),
-            'components': {
-                'technical_score': round(base_confidence, 1),
-                'news_adjustment': round(adjusted_confidence - base_confidence, 1),
-                'technical_strength': round(technical_strength, 1)
-            }
-        }
+        return combine_signals(action, confidence, news_sentiment, technical_strength, self.clock.now())
     
     def get_system_stats(self):
         """Estatísticas do sistema"""
@@ -667,10 +765,10 @@ class GoldTradingServer:
             if self.accurate_signals > 0:
                 win_rate = (self.accurate_signals / self.total_signals) * 100
             
-            next_event = None
-            if self.economic_events:
-                next_event = self.economic_events[0]
-                minutes_away = (next_event['time'] - datetime.now()).total_seconds() / 60
+            now_ts = self.clock.time()
+            next_event = self.calendar.next_event(now_ts)
+            if next_event:
+                minutes_away = (next_event['time'].timestamp() - now_ts) / 60
                 next_event = {
                     'name': next_event['name'],
                     'time': next_event['time'].strftime('%d/%m %H:%M'),
@@ -681,19 +779,20 @@ class GoldTradingServer:
                 }
             
             overall_sentiment = self._analyze_news_sentiment()
+            api_calls_today = self.api_calls_today
             
             return {
                 'status': 'running',
-                'uptime': str(datetime.now() - self.last_csv_fetch) if self.last_csv_fetch else 'N/A',
+                'uptime': str(self.clock.now() - self.last_csv_fetch) if self.last_csv_fetch else 'N/A',
                 'statistics': {
                     'total_signals': self.total_signals,
                     'accurate_signals': self.accurate_signals,
                     'win_rate': round(win_rate, 2),
-                    'api_calls_today': self.api_calls_today,
-                    'api_remaining': API_RATE_LIMIT - self.api_calls_today
+                    'api_calls_today': api_calls_today,
+                    'api_remaining': API_RATE_LIMIT - api_calls_today
                 },
                 'cache': {
-                    'economic_events': len(self.economic_events),
+                    'economic_events': len(self.calendar),
                     'news_cached': len(self.news_cache),
                     'signals_cached': len(self.signal_cache),
                     'price_points': len(self.price_cache)
@@ -705,11 +804,40 @@ class GoldTradingServer:
                 'csv_info': {
                     'source': 'Google Drive',
                     'url': self.csv_url,
-                    'last_fetch': self.last_csv_fetch.strftime('%d/%m %H:%M:%S') if self.last_csv_fetch else None
+                    'last_fetch': self.last_csv_fetch.strftime('%d/%m %H:%M:%S') if self.last_csv_fetch else None,
+                    **self.csv_fetcher.stats()
+                },
+                'calendar_changes': self.calendar.last_refresh,
+                'last_refresh_round': self.last_refresh_round,
+                'http': host_stats(),
+                'clock': self.clock.state(),
+                'news_scheduler': self.news_scheduler.plan,
+                'signal_cache': self.signal_cache.stats(),
+                'data_versions': {
+                    'calendar': self.calendar.version,
+                    'news': self.news_cache.version
+                },
+                'signal_log': self.signal_history.stats(),
+                'quota': {
+                    'service': self.quota.service,
+                    'daily_limit': self.quota.daily_limit,
+                    'used_today': api_calls_today,
+                    'remaining': max(0, API_RATE_LIMIT - api_calls_today),
+                    'ledger': self.quota.path,
+                    'history': self.quota.history()
+                },
+                'snapshot': {
+                    'path': self.snapshot_path,
+                    'warm_start': self.warm_started,
+                    'last_write': datetime.fromtimestamp(self.last_snapshot).strftime('%H:%M:%S') if self.last_snapshot else None
                 },
                 'next_event': next_event,
                 'market_sentiment': overall_sentiment,
-                'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                'sentiment_engine': {
+                    'mode': SENTIMENT_MODE,
+                    **self.sentiment_engine.value(self.clock.time())
+                },
+                'timestamp': self.clock.now().strftime('%Y-%m-%d %H:%M:%S')
             }
             
         except Exception as e:
@@ -721,61 +849,152 @@ class GoldTradingServer:
 gold_server = GoldTradingServer()
 
 # Endpoints
-@app.route('/signal', methods=['POST'])
-@error_handler
-def signal():
-    data = request.get_json() or {}
-    technical_data = {
-        'action': data.get('technical_signal', 'NONE'),
-        'confidence': data.get('technical_score', 0),
+def _technical_data(data):
+    """Payload do bot -> entradas do gerador de sinais"""
+    return {
+        'action': data.get('technical_signal', data.get('action', 'NONE')),
+        'confidence': data.get('technical_score', data.get('score', 0)),
         'ema5': data.get('ema5', 0),
         'ema15': data.get('ema15', 0),
         'ema50': data.get('ema50', 0),
         'adx': data.get('adx', 0),
         'rsi': data.get('rsi', 50),
-        'current_price': data.get('current_price', 0)
+        'current_price': data.get('current_price', 0),
+        'symbol': data.get('symbol'),
+        'timeframe': data.get('timeframe')
     }
-    return jsonify(gold_server.generate_trading_signal(technical_data)), 200
+
+@app.route('/signal', methods=['POST'])
+@error_handler
+def signal():
+    data = request.get_json() or {}
+    return jsonify(gold_server.generate_trading_signal(_technical_data(data))), 200
+
+@app.route('/signal/batch', methods=['POST'])
+@error_handler
+def signal_batch():
+    data = request.get_json(silent=True)
+    payloads = data.get('signals') if isinstance(data, dict) else data
+    if not isinstance(payloads, list) or not all(isinstance(p, dict) for p in payloads):
+        return jsonify({'error': 'Envie uma lista de payloads (ou {"signals": [...]})'}), 400
+    if len(payloads) > SIGNAL_BATCH_MAX:
+        return jsonify({'error': f"Máximo de {SIGNAL_BATCH_MAX} payloads por lote"}), 400
+    
+    signals = gold_server.generate_trading_signals([_technical_data(p) for p in payloads])
+    results = [
+        {'symbol': p.get('symbol'), 'timeframe': p.get('timeframe'), **result}
+        for p, result in zip(payloads, signals)
+    ]
+    return jsonify({
+        'count': len(results),
+        'results': results,
+        'generated_at': gold_server.clock.now().strftime('%Y-%m-%d %H:%M:%S')
+    }), 200
 
 @app.route('/calendar', methods=['GET'])
 @error_handler
 def calendar():
-    now = datetime.now()
+    now_ts = gold_server.clock.time()
     upcoming = []
-    for event in gold_server.economic_events:
-        if event['time'] > now:
-            minutes_away = int((event['time'] - now).total_seconds() / 60)
-            upcoming.append({
-                'event': event['name'],
-                'time': event['time'].strftime('%Y-%m-%d %H:%M'),
+    for event in gold_server.calendar.after(now_ts, limit=15):
+        minutes_away = int((event['time'].timestamp() - now_ts) / 60)
+        upcoming.append({
+            'event': event['name'],
+            'time': event['time'].strftime('%Y-%m-%d %H:%M'),
+            'impact': event['impact'],
+            'currency': event['currency'],
+            'source': event.get('source', 'Unknown'),
+            'minutes_away': minutes_away
+        })
+    return jsonify({
+        'total': gold_server.calendar.count_after(now_ts),
+        'events': upcoming,
+        'last_update': gold_server.last_csv_fetch.strftime('%H:%M:%S') if gold_server.last_csv_fetch else None
+    }), 200
+
+@app.route('/timeline', methods=['GET'])
+@error_handler
+def timeline():
+    hours = request.args.get('hours', 24, type=int)
+    hours = max(1, min(hours, 48))
+    now_ts = gold_server.clock.time()
+    windows = []
+    for window in gold_server.calendar.timeline(now_ts, now_ts + hours * 3600):
+        item = {
+            'state': window['state'],
+            'start': datetime.fromtimestamp(window['start']).strftime('%Y-%m-%d %H:%M:%S'),
+            'end': datetime.fromtimestamp(window['end']).strftime('%Y-%m-%d %H:%M:%S'),
+            'start_ts': int(window['start']),
+            'end_ts': int(window['end'])
+        }
+        if window['state'] == 'BLOCKED':
+            event = window['event']
+            item.update({
+                'event_name': event['name'],
+                'event_time': event['time'].strftime('%Y-%m-%d %H:%M'),
                 'impact': event['impact'],
                 'currency': event['currency'],
                 'source': event.get('source', 'Unknown'),
-                'minutes_away': minutes_away
+                'total_events': window['total_events']
             })
-    upcoming.sort(key=lambda x: x['time'])
+        windows.append(item)
     return jsonify({
-        'total': len(upcoming),
-        'events': upcoming[:15],
-        'last_update': gold_server.last_csv_fetch.strftime('%H:%M:%S') if gold_server.last_csv_fetch else None
+        'blocked': gold_server.calendar.blocked_at(now_ts) is not None,
+        'hours': hours,
+        'windows': windows,
+        'generated_at': datetime.fromtimestamp(now_ts).strftime('%Y-%m-%d %H:%M:%S')
+    }), 200
+
+@app.route('/sentiment/series', methods=['GET'])
+@error_handler
+def sentiment_series():
+    resolution = request.args.get('resolution', '5m')
+    if resolution not in BUCKET_RESOLUTIONS:
+        return jsonify({
+            'error': f"Resolução inválida: {resolution}",
+            'valid': list(BUCKET_RESOLUTIONS)
+        }), 400
+    seconds, size = BUCKET_RESOLUTIONS[resolution]
+    # O mesmo valor limitado vai para a resposta e para series() (0/negativo não vira a série inteira)
+    points = max(1, min(request.args.get('points', 60, type=int), size))
+    return jsonify({
+        'resolution': resolution,
+        'bucket_seconds': seconds,
+        'points': points,
+        'current': gold_server.sentiment_engine.value(gold_server.clock.time()),
+        'series': gold_server.sentiment_engine.series(resolution, points, gold_server.clock.time())
     }), 200
 
 @app.route('/news', methods=['GET'])
 @error_handler
 def news():
-    limit = request.args.get('limit', 20, type=int)
-    recent = list(gold_server.news_cache)
-    recent.reverse()
-    sentiment_summary = {
-        'BULLISH': sum(1 for n in recent if n['sentiment'] == 'BULLISH'),
-        'BEARISH': sum(1 for n in recent if n['sentiment'] == 'BEARISH'),
-        'NEUTRAL': sum(1 for n in recent if n['sentiment'] == 'NEUTRAL')
+    limit = max(1, min(request.args.get('limit', 20, type=int), 500))
+    filters = {
+        'sentiment': request.args.get('sentiment'),
+        'source': request.args.get('source'),
+        'min_relevance': request.args.get('min_relevance', type=float),
+        'since': None
     }
+    if request.args.get('since'):
+        try:
+            filters['since'] = parse_since(request.args['since'])
+        except ValueError:
+            return jsonify({'error': f"since inválido: {request.args['since']}"}), 400
+    
+    # Filtros resolvidos no SQLite (índices por publicação, sentimento, fonte e relevância)
+    sentiment_summary = gold_server.news_store.sentiment_counts(**filters)
+    aggregate = gold_server.news_cache.sentiment()
     return jsonify({
-        'total': len(gold_server.news_cache),
-        'news': recent[:limit],
+        'total': sum(sentiment_summary.values()),
+        'news': gold_server.news_store.query(limit=limit, **filters),
+        'filters': {k: v for k, v in filters.items() if v is not None},
         'sentiment_summary': sentiment_summary,
-        'overall_sentiment': gold_server._analyze_news_sentiment()
+        'overall_sentiment': aggregate['label'],
+        'sentiment_totals': {
+            'bullish': round(aggregate['bullish'], 2),
+            'bearish': round(aggregate['bearish'], 2),
+            'news_used': aggregate['count']
+        }
     }), 200
 
 @app.route('/status', methods=['GET'])
@@ -786,10 +1005,28 @@ def status():
 @app.route('/history', methods=['GET'])
 @error_handler
 def history():
-    limit = request.args.get('limit', 50, type=int)
-    recent = list(gold_server.signal_history)[-limit:]
-    recent.reverse()
-    return jsonify({'total': len(gold_server.signal_history), 'signals': recent}), 200
+    limit = max(1, min(request.args.get('limit', 50, type=int), 1000))
+    after = request.args.get('after', type=int)
+    before = request.args.get('before', type=int)
+    try:
+        since = parse_since(request.args['since']) if request.args.get('since') else None
+        until = parse_since(request.args['until']) if request.args.get('until') else None
+    except ValueError:
+        return jsonify({'error': 'since/until inválido'}), 400
+    
+    # Sem `after`: mais novo primeiro; com `after`: mais antigo primeiro
+    signals = gold_server.signal_history.page(
+        after=after, before=before, since=since, until=until, limit=limit
+    )
+    seqs = [signal['seq'] for signal in signals]
+    return jsonify({
+        'total': gold_server.signal_history.records,
+        'signals': signals,
+        'cursor': {
+            'before': min(seqs) if seqs else None,
+            'after': max(seqs) if seqs else None
+        }
+    }), 200
 
 @app.route('/health', methods=['GET'])
 def health():
@@ -803,10 +1040,13 @@ def home():
         'status': 'running',
         'endpoints': {
             'POST /signal': 'Gerar sinal de trading',
+            'POST /signal/batch': 'Gerar sinais em lote (varios simbolos/timeframes)',
             'GET /calendar': 'Calendario economico (Google Drive)',
+            'GET /timeline': 'Janelas de bloqueio (proximas 24-48h)',
+            'GET /sentiment/series': 'Sentimento por buckets (1m/5m/1h) com decaimento',
             'GET /news': 'Noticias recentes',
             'GET /status': 'Status do sistema',
-            'GET /history': 'Historico de sinais',
+            'GET /history': 'Historico de sinais (after/before/limit, since/until)',
             'GET /health': 'Health check'
         }
     }), 200
@@ -814,12 +1054,9 @@ def home():
 @app.route('/force-update', methods=['POST'])
 @error_handler
 def force_update():
-    threading.Thread(target=gold_server.load_calendar_events).start()  # MODIFICADO
-    if gold_server.api_calls_today < API_RATE_LIMIT - 10:
-        threading.Thread(target=gold_server.fetch_gold_news).start()
-        news_status = 'updating'
-    else:
-        news_status = 'skipped (API limit)'
+    fetch_news = gold_server.api_calls_today < API_RATE_LIMIT - 10
+    threading.Thread(target=gold_server.refresh_all, kwargs={'fetch_news': fetch_news}).start()
+    news_status = 'updating' if fetch_news else 'skipped (API limit)'
     return jsonify({
         'message': 'Atualizacao iniciada',
         'calendar': 'updating (Google Drive + External API)',
@@ -843,31 +1080,30 @@ if __name__ == '__main__':
     print(f"  - Alpha Vantage (Limite: {API_RATE_LIMIT}/dia)")
     print("\n[INFO] Endpoints disponiveis:")
     print("  POST /signal       -> Gerar sinal de trading")
+    print("  POST /signal/batch -> Sinais em lote (varios simbolos/timeframes)")
     print("  GET  /calendar     -> Proximos eventos")
+    print("  GET  /timeline     -> Janelas de bloqueio (24-48h)")
+    print("  GET  /sentiment/series -> Sentimento por buckets (1m/5m/1h)")
     print("  GET  /news         -> Noticias recentes")
     print("  GET  /status       -> Status do sistema")
-    print("  GET  /history      -> Historico de sinais")
+    print("  GET  /history      -> Historico de sinais (cursor after/before)")
     print("  POST /force-update -> Forcar atualizacao")
     print("  GET  /health       -> Health check")
     print("\n" + "="*70)
     
     try:
-        file_handler = logging.FileHandler('goldai_server.log', encoding='utf-8')
-        file_handler.setLevel(logging.INFO)
-        file_handler.setFormatter(logging.Formatter(
-            '%(asctime)s - %(levelname)s - %(message)s'
-        ))
-        logger.addHandler(file_handler)
+        # Rotação por tamanho (GOLDAI_LOG_MAX_BYTES / GOLDAI_LOG_BACKUPS)
+        add_log_file(LOG_FILE)
     except Exception as e:
         print(f"[WARN] Nao foi possivel criar arquivo de log: {e}")
     
-    # Carregar calendário na inicialização
-    logger.info("[START] Iniciando carregamento do calendário...")
-    gold_server.load_calendar_events()
-    
-    # Atualizar dados da API
-    logger.info("[START] Iniciando atualizacao de noticias...")
-    gold_server.fetch_gold_news()
+    if gold_server.warm_started:
+        # Snapshot carregado: responde na hora, a thread de background atualiza
+        logger.info("[START] Warm start pelo snapshot, atualização segue em background")
+    else:
+        # Carregar calendário e notícias na inicialização (em paralelo)
+        logger.info("[START] Iniciando carregamento do calendário e notícias...")
+        gold_server.refresh_all()
     logger.info("[OK] Sistema pronto!")
     
     # Iniciar servidor (CONFIGURAÇÃO RENDER)
@@ -0,0 +1,416 @@
+# ═══════════════════════════════════════════════════════════════════════
+# GOLDAI PRO - CLIENTE HTTP DE SAÍDA
+# ═══════════════════════════════════════════════════════════════════════
+
+import hashlib
+import random
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import NewConnectionError
+
+# Tentativas extras para métodos idempotentes (POST não repete por padrão)
+DEFAULT_RETRIES = 2
+IDEMPOTENT_METHODS = {'GET', 'HEAD', 'OPTIONS'}
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Backoff exponencial com jitter completo: uniform(0, min(MAX, BASE * 2^tentativa))
+BACKOFF_BASE_SECONDS = 0.5
+BACKOFF_MAX_SECONDS = 8.0
+
+# Conexões keep-alive por host
+POOL_MAXSIZE = 8
+
+# Início do corpo guardado como impressão digital: igual ao último aplicado,
+# o download em streaming confirma o hash antes de qualquer parse
+HEAD_BYTES = 64 * 1024
+
+_sessions = {}
+_host_stats = {}
+_registry_lock = threading.Lock()
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# SESSÕES POOLED POR HOST
+# ═══════════════════════════════════════════════════════════════════════
+
+class HostStats:
+    """Contadores de latência e erro de um host"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+        self.retries = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.last_ms = None
+        self.last_status = None
+        self.last_error = None
+
+    def record(self, seconds, status=None, error=None):
+        elapsed_ms = seconds * 1000
+        with self._lock:
+            self.requests += 1
+            self.total_ms += elapsed_ms
+            self.max_ms = max(self.max_ms, elapsed_ms)
+            self.last_ms = elapsed_ms
+            self.last_status = status
+            if error is not None or status in RETRY_STATUSES:
+                self.errors += 1
+                self.last_error = str(error) if error is not None else f"HTTP {status}"
+
+    def retried(self):
+        with self._lock:
+            self.retries += 1
+
+    def to_dict(self):
+        with self._lock:
+            return {
+                'requests': self.requests,
+                'errors': self.errors,
+                'retries': self.retries,
+                'avg_ms': round(self.total_ms / self.requests, 1) if self.requests else None,
+                'max_ms': round(self.max_ms, 1),
+                'last_ms': round(self.last_ms, 1) if self.last_ms is not None else None,
+                'last_status': self.last_status,
+                'last_error': self.last_error
+            }
+
+
+def _host(url):
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def get_session(url):
+    """Session compartilhada do host da URL (criada na primeira chamada)"""
+    host = _host(url)
+    with _registry_lock:
+        session = _sessions.get(host)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=POOL_MAXSIZE)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            _sessions[host] = session
+            _host_stats[host] = HostStats()
+        return session, _host_stats[host]
+
+
+def _retry_after(response):
+    try:
+        return float(response.headers.get('Retry-After'))
+    except (TypeError, ValueError):
+        return None
+
+
+def _backoff(attempt, retry_after=None):
+    if retry_after is not None:
+        return min(retry_after, BACKOFF_MAX_SECONDS)
+    return random.uniform(0, min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * 2 ** attempt))
+
+
+def _read_until(response, deadline):
+    """Lê o corpo inteiro; passou do `deadline` (monotonic), levanta Timeout"""
+    raw = response.raw
+    # read1 (urllib3 2.x) devolve o que já chegou; sem ele, leituras pequenas
+    if hasattr(raw, 'read1'):
+        read = lambda: raw.read1(64 * 1024, decode_content=True)
+    else:
+        read = lambda: raw.read(1024, decode_content=True)
+    chunks = []
+    try:
+        while True:
+            chunk = read()
+            if not chunk:
+                break
+            chunks.append(chunk)
+            if time.monotonic() > deadline:
+                raise requests.exceptions.Timeout(f"resposta incompleta no prazo total: {response.url}")
+    finally:
+        response.close()
+    response._content = b''.join(chunks)
+    return response
+
+
+def http_request(method, url, retries=None, deadline=None, **kwargs):
+    """Requisição pela Session pooled do host, com retry e backoff.
+
+    Repete em erro de conexão, timeout e status 429/5xx. Esgotadas as
+    tentativas, a exceção original sobe (ou a última resposta é devolvida),
+    então os `except requests.exceptions...` de quem chama continuam valendo.
+    O `timeout` do requests vale por leitura; com `deadline` (segundos) o
+    corpo é lido em chunks e a resposta inteira precisa chegar nesse prazo
+    (pode passar no máximo um `timeout` de leitura).
+    """
+    session, stats = get_session(url)
+    if retries is None:
+        retries = DEFAULT_RETRIES if method.upper() in IDEMPOTENT_METHODS else 0
+    if deadline is not None:
+        # Sem compressão: cada byte que chega conta para o prazo
+        kwargs['headers'] = {'Accept-Encoding': 'identity', **(kwargs.get('headers') or {})}
+        kwargs['stream'] = True
+        deadline = time.monotonic() + deadline
+
+    attempt = 0
+    while True:
+        start = time.monotonic()
+        retry_after = None
+        try:
+            response = session.request(method, url, **kwargs)
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            stats.record(time.monotonic() - start, error=e)
+            if attempt >= retries:
+                raise
+        else:
+            stats.record(time.monotonic() - start, status=response.status_code)
+            if response.status_code not in RETRY_STATUSES or attempt >= retries:
+                return response if deadline is None else _read_until(response, deadline)
+            retry_after = _retry_after(response)
+            response.close()
+
+        attempt += 1
+        stats.retried()
+        time.sleep(_backoff(attempt, retry_after))
+
+
+def http_get(url, **kwargs):
+    return http_request('GET', url, **kwargs)
+
+
+def http_post(url, **kwargs):
+    return http_request('POST', url, **kwargs)
+
+
+def request_not_sent(exc):
+    """True se a falha foi antes de a requisição sair (DNS, conexão recusada, connect timeout)"""
+    if isinstance(exc, requests.exceptions.ConnectTimeout):
+        return True
+    if not isinstance(exc, requests.exceptions.ConnectionError) or not exc.args:
+        return False
+    # "Connection aborted"/reset depois do envio não conta: o servidor pode ter recebido
+    return isinstance(getattr(exc.args[0], 'reason', None), NewConnectionError)
+
+
+def host_stats():
+    """Contadores por host (para o /status)"""
+    with _registry_lock:
+        hosts = list(_host_stats.items())
+    return {host: stats.to_dict() for host, stats in hosts}
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# DOWNLOAD CONDICIONAL
+# ═══════════════════════════════════════════════════════════════════════
+
+class ConditionalFetcher:
+    """Download condicional: validadores HTTP + hash do último conteúdo.
+
+    Envia If-None-Match/If-Modified-Since quando a fonte mandou ETag ou
+    Last-Modified. Se a resposta for 304, ou se o corpo tiver o mesmo hash
+    do último conteúdo aplicado, `fetch()` retorna None e conta um cache hit.
+    Os validadores só passam a valer depois de `mark_applied()`, para que um
+    conteúdo que falhou ao ser processado seja baixado de novo. Junto com o
+    hash ficam o Content-Length e o hash dos primeiros HEAD_BYTES, usados
+    pelo streaming para decidir se confere o hash antes de parsear.
+    """
+
+    def __init__(self, url, timeout=30):
+        self.url = url
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self.etag = None
+        self.last_modified = None
+        self.content_hash = None
+        self.content_length = None
+        self.head_hash = None
+        self._pending = None
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.last_status = None
+
+    def _conditional_headers(self):
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+    def _record(self, digest, response_headers, head_hash, count_miss=True):
+        """Registra o hash do corpo baixado; retorna True se nada mudou"""
+        with self._lock:
+            if digest == self.content_hash:
+                self.cache_hits += 1
+                return True
+            if count_miss:
+                self.cache_misses += 1
+            self._pending = (
+                response_headers.get('ETag'),
+                response_headers.get('Last-Modified'),
+                digest,
+                response_headers.get('Content-Length'),
+                head_hash
+            )
+            return False
+
+    def _not_modified(self, response):
+        self.last_status = response.status_code
+        if response.status_code == 304:
+            with self._lock:
+                self.cache_hits += 1
+            response.close()
+            return True
+        response.raise_for_status()
+        return False
+
+    def fetch(self):
+        """Retorna o corpo (bytes) se mudou, ou None se nada mudou"""
+        response = http_get(self.url, headers=self._conditional_headers(), timeout=self.timeout)
+        if self._not_modified(response):
+            return None
+
+        body = response.content
+        if self._record(hashlib.sha256(body).hexdigest(), response.headers, _head_digest(body)):
+            return None
+        return body
+
+    def open_stream(self, chunk_size=64 * 1024):
+        """Como fetch(), mas o corpo chega em chunks (None se 304).
+
+        O hash é calculado enquanto os chunks são consumidos; depois de
+        percorrer o stream inteiro, `stream.unchanged` diz se o conteúdo é o
+        mesmo do último aplicado. Quando `stream.looks_unchanged()`, o
+        chamador pode usar `stream.drain()` para confirmar pelo hash sem
+        parsear nada.
+        """
+        response = http_get(
+            self.url,
+            headers=self._conditional_headers(),
+            timeout=self.timeout,
+            stream=True
+        )
+        if self._not_modified(response):
+            return None
+        return StreamedBody(self, response, chunk_size)
+
+    def mark_applied(self):
+        """Confirma que o último corpo retornado foi processado"""
+        with self._lock:
+            if self._pending:
+                (self.etag, self.last_modified, self.content_hash,
+                 self.content_length, self.head_hash) = self._pending
+                self._pending = None
+
+    def reset(self):
+        """Esquece validadores e hash: o próximo fetch baixa e processa tudo"""
+        with self._lock:
+            self.etag = None
+            self.last_modified = None
+            self.content_hash = None
+            self.content_length = None
+            self.head_hash = None
+            self._pending = None
+
+    def state(self):
+        """Validadores atuais (para snapshot em disco)"""
+        return {
+            'etag': self.etag,
+            'last_modified': self.last_modified,
+            'content_hash': self.content_hash,
+            'content_length': self.content_length,
+            'head_hash': self.head_hash
+        }
+
+    def restore(self, state):
+        """Restaura validadores salvos por `state()`"""
+        if not state:
+            return
+        with self._lock:
+            self.etag = state.get('etag')
+            self.last_modified = state.get('last_modified')
+            self.content_hash = state.get('content_hash')
+            self.content_length = state.get('content_length')
+            self.head_hash = state.get('head_hash')
+
+    def stats(self):
+        """Contadores para o /status"""
+        return {
+            'cache_hits': self.cache_hits,
+            'cache_misses': self.cache_misses,
+            'etag': self.etag,
+            'last_modified': self.last_modified,
+            'content_hash': self.content_hash[:12] if self.content_hash else None,
+            'last_status': self.last_status
+        }
+
+
+def _head_digest(data):
+    return hashlib.sha256(data[:HEAD_BYTES]).hexdigest()
+
+
+class StreamedBody:
+    """Corpo de resposta lido em chunks, com hash incremental.
+
+    Os primeiros HEAD_BYTES são lidos já na abertura, para comparar com o
+    início do último corpo aplicado antes de decidir se o corpo é parseado.
+    """
+
+    def __init__(self, fetcher, response, chunk_size):
+        self.fetcher = fetcher
+        self.response = response
+        self.chunk_size = chunk_size
+        self.unchanged = None
+        self._confirming = False
+        self._chunks = response.iter_content(chunk_size)
+        try:
+            self._head = self._read_head()
+        except Exception:
+            response.close()
+            raise
+
+    def _read_head(self):
+        head = b''
+        for chunk in self._chunks:
+            head += chunk
+            if len(head) >= HEAD_BYTES:
+                break
+        return head
+
+    def looks_unchanged(self):
+        """Mesmo início (e mesmo Content-Length, se a fonte mandou) do último corpo aplicado"""
+        fetcher = self.fetcher
+        if fetcher.head_hash is None or _head_digest(self._head) != fetcher.head_hash:
+            return False
+        length = self.response.headers.get('Content-Length')
+        return length is None or fetcher.content_length is None or length == fetcher.content_length
+
+    def drain(self):
+        """Consome o resto do corpo só calculando o hash; retorna `unchanged`.
+
+        Se o corpo mudou, o miss não é contado aqui: quem chama baixa de novo
+        para parsear, e é esse download que conta.
+        """
+        self._confirming = True
+        for _ in self:
+            pass
+        return self.unchanged
+
+    def __iter__(self):
+        hasher = hashlib.sha256()
+        try:
+            if self._head:
+                hasher.update(self._head)
+                yield self._head
+            for chunk in self._chunks:
+                hasher.update(chunk)
+                yield chunk
+        finally:
+            self.response.close()
+        self.unchanged = self.fetcher._record(
+            hasher.hexdigest(), self.response.headers, _head_digest(self._head), count_miss=not self._confirming
+        )
@@ -0,0 +1,242 @@
+# ═══════════════════════════════════════════════════════════════════════
+# GOLDAI PRO - LOGGING (FILA + ESCRITA FORA DA THREAD DO REQUEST)
+# ═══════════════════════════════════════════════════════════════════════
+#
+# Compartilhado por server.py, goldai_server.py e auto_news_updater.py.
+# A thread que loga só filtra e põe o registro numa fila; formatação e
+# escrita (terminal, arquivo rotativo) ficam com a thread do QueueListener.
+
+import atexit
+import json
+import logging
+import os
+import queue
+import sys
+import threading
+import time
+from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+LOG_LEVEL = os.environ.get('GOLDAI_LOG_LEVEL', 'INFO').upper()
+LOG_JSON = os.environ.get('GOLDAI_LOG_JSON', '0') == '1'
+LOG_MAX_BYTES = int(os.environ.get('GOLDAI_LOG_MAX_BYTES', 10 * 1024 * 1024))
+LOG_BACKUP_COUNT = int(os.environ.get('GOLDAI_LOG_BACKUPS', 5))
+# "server=10,werkzeug=100": 1 a cada N linhas abaixo de WARNING, por logger
+LOG_SAMPLE = os.environ.get('GOLDAI_LOG_SAMPLE', '')
+# "server=20": no máximo N linhas/s de uma mesma mensagem abaixo de WARNING
+LOG_RATE_LIMIT = os.environ.get('GOLDAI_LOG_RATE', '')
+
+DEFAULT_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+
+# Argumentos que podem ir para a fila sem formatar (não mudam depois do log)
+_IMMUTABLE = (str, int, float, bool, type(None), bytes)
+
+_lock = threading.Lock()
+_state = {'listener': None, 'queue': None, 'handlers': [], 'formatter': None}
+
+
+def parse_logger_limits(spec):
+    """"server=10,werkzeug=100" -> {'server': 10.0, 'werkzeug': 100.0}"""
+    limits = {}
+    for part in spec.split(','):
+        name, _, value = part.partition('=')
+        if name.strip() and value.strip():
+            limits[name.strip()] = float(value)
+    return limits
+
+
+def _limit_for(limits, logger_name):
+    """Limite do logger ou do pai mais próximo ('server' vale para 'server.api')"""
+    name = logger_name
+    while name:
+        if name in limits:
+            return limits[name]
+        name = name.rpartition('.')[0]
+    return None
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# FILTROS (RODAM NA THREAD QUE LOGA, ANTES DA FILA)
+# ═══════════════════════════════════════════════════════════════════════
+
+class SamplingFilter(logging.Filter):
+    """Deixa passar 1 a cada N registros abaixo de WARNING, contado por logger"""
+
+    def __init__(self, every):
+        super().__init__()
+        self.every = every
+        self._counts = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING:
+            return True
+        every = _limit_for(self.every, record.name)
+        if not every or every <= 1:
+            return True
+        with self._lock:
+            count = self._counts.get(record.name, 0)
+            self._counts[record.name] = count + 1
+        return count % int(every) == 0
+
+
+class RateLimitFilter(logging.Filter):
+    """Token bucket por (logger, mensagem) para registros abaixo de WARNING.
+
+    Com formatação preguiçosa a mensagem é o template ("%s em %dmin"), então
+    a mesma linha repetida com valores diferentes cai no mesmo balde. O
+    registro que passa depois de uma rajada leva em `suppressed` quantos
+    foram descartados.
+    """
+
+    def __init__(self, per_second, clock=time.monotonic):
+        super().__init__()
+        self.per_second = per_second
+        self._clock = clock
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = _limit_for(self.per_second, record.name)
+        if not rate:
+            return True
+        key = (record.name, record.msg if isinstance(record.msg, str) else repr(record.msg))
+        now = self._clock()
+        with self._lock:
+            tokens, last, dropped = self._buckets.get(key, (rate, now, 0))
+            tokens = min(rate, tokens + (now - last) * rate)
+            if tokens < 1:
+                self._buckets[key] = (tokens, now, dropped + 1)
+                return False
+            self._buckets[key] = (tokens - 1, now, 0)
+        if dropped:
+            record.suppressed = dropped
+        return True
+
+
+class DeferredQueueHandler(QueueHandler):
+    """QueueHandler que não formata na thread que loga.
+
+    O QueueHandler padrão monta a mensagem em `prepare()` (pensado para
+    filas entre processos). Aqui a fila é do próprio processo: o registro
+    vai como está e só é congelado com getMessage() quando algum argumento
+    é mutável e poderia mudar antes do listener formatar.
+    """
+
+    def prepare(self, record):
+        args = record.args
+        if args and not (isinstance(args, tuple) and all(isinstance(arg, _IMMUTABLE) for arg in args)):
+            record.msg = record.getMessage()
+            record.args = None
+        return record
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# FORMATADORES (RODAM NA THREAD DO LISTENER)
+# ═══════════════════════════════════════════════════════════════════════
+
+class TextFormatter(logging.Formatter):
+    """Formato de texto de sempre, com o total suprimido pelo rate limit"""
+
+    def format(self, record):
+        text = super().format(record)
+        suppressed = getattr(record, 'suppressed', 0)
+        if suppressed:
+            text += f" [+{suppressed} suprimidas]"
+        return text
+
+
+class JsonFormatter(logging.Formatter):
+    """Uma linha JSON por registro"""
+
+    def format(self, record):
+        entry = {
+            'ts': datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'thread': record.threadName,
+            'message': record.getMessage()
+        }
+        suppressed = getattr(record, 'suppressed', 0)
+        if suppressed:
+            entry['suppressed'] = suppressed
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# CONFIGURAÇÃO
+# ═══════════════════════════════════════════════════════════════════════
+
+def _restart_listener(log_queue):
+    if _state['listener']:
+        _state['listener'].stop()
+    listener = QueueListener(log_queue, *_state['handlers'], respect_handler_level=True)
+    listener.start()
+    _state['listener'] = listener
+
+
+def setup_logging(fmt=DEFAULT_FORMAT, datefmt=None, log_file=None, level=LOG_LEVEL,
+                  json_output=LOG_JSON, sample=LOG_SAMPLE, rate_limit=LOG_RATE_LIMIT):
+    """Liga o logging do processo: raiz -> fila -> listener -> stdout (+ arquivo rotativo)"""
+    with _lock:
+        root = logging.getLogger()
+        root.setLevel(level)
+        if _state['listener']:
+            return
+
+        formatter = JsonFormatter() if json_output else TextFormatter(fmt, datefmt)
+        _state['formatter'] = formatter
+        console = logging.StreamHandler(sys.stdout)
+        console.setFormatter(formatter)
+        _state['handlers'] = [console]
+
+        log_queue = queue.SimpleQueue()
+        queue_handler = DeferredQueueHandler(log_queue)
+        sample_every = parse_logger_limits(sample)
+        if sample_every:
+            queue_handler.addFilter(SamplingFilter(sample_every))
+        per_second = parse_logger_limits(rate_limit)
+        if per_second:
+            queue_handler.addFilter(RateLimitFilter(per_second))
+
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+        root.addHandler(queue_handler)
+        _state['queue'] = log_queue
+        _restart_listener(log_queue)
+        # Esvazia a fila na saída do processo
+        atexit.register(shutdown_logging)
+
+    if log_file:
+        add_log_file(log_file)
+
+
+def add_log_file(path, level=logging.INFO, max_bytes=LOG_MAX_BYTES, backup_count=LOG_BACKUP_COUNT):
+    """Acrescenta um arquivo com rotação por tamanho (path.1 ... path.N).
+
+    Cada processo precisa do seu próprio `path`: dois RotatingFileHandler
+    no mesmo arquivo perdem linhas na rotação (e no Windows o rename falha).
+    """
+    handler = RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8')
+    handler.setLevel(level)
+    with _lock:
+        if not _state['listener']:
+            raise RuntimeError('setup_logging() precisa ser chamado antes de add_log_file()')
+        handler.setFormatter(_state['formatter'])
+        _state['handlers'].append(handler)
+        _restart_listener(_state['queue'])
+    return handler
+
+
+def shutdown_logging():
+    """Para o listener depois de escrever o que ainda está na fila"""
+    with _lock:
+        if _state['listener']:
+            _state['listener'].stop()
+            _state['listener'] = None
+        for handler in _state['handlers']:
+            handler.close()
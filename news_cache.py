@@ -0,0 +1,145 @@
+# ═══════════════════════════════════════════════════════════════════════
+# GOLDAI PRO - CACHE DE NOTÍCIAS COM ÍNDICE DE DEDUPLICAÇÃO
+# ═══════════════════════════════════════════════════════════════════════
+
+import re
+import threading
+from collections import deque
+from itertools import islice
+
+_NON_WORD = re.compile(r'[^\w]+')
+
+# Agregado de sentimento: as 15 primeiras notícias com relevância > 0.3
+SENTIMENT_WINDOW = 15
+SENTIMENT_MIN_RELEVANCE = 0.3
+SENTIMENT_DEAD_BAND = 0.3
+
+SENTIMENT_LABELS = ('BULLISH', 'BEARISH', 'NEUTRAL')
+
+
+def _is_relevant(item):
+    return item.get('relevance', 0) > SENTIMENT_MIN_RELEVANCE
+
+
+def news_key(item):
+    """Chave de deduplicação: URL do artigo, ou o título normalizado"""
+    url = (item.get('url') or '').strip()
+    if url:
+        return url
+    title = _NON_WORD.sub(' ', (item.get('title') or '').lower()).strip()
+    return f"title:{title}"
+
+
+class NewsCache:
+    """Notícias em ordem de chegada (deque limitado) + índice por chave.
+
+    O índice acompanha o deque: quando a notícia mais antiga sai por causa
+    do limite, a chave dela sai junto. A checagem de duplicata é O(1) e não
+    depende de score/relevance, que mudam entre uma busca e outra.
+
+    O agregado de sentimento (mesma regra de antes: as SENTIMENT_WINDOW
+    primeiras notícias relevantes, zona neutra de SENTIMENT_DEAD_BAND) é
+    atualizado na inserção e na remoção; a leitura é O(1). `version` cresce
+    a cada notícia nova.
+    """
+
+    def __init__(self, maxlen=100):
+        self.maxlen = maxlen
+        self._lock = threading.RLock()
+        self._items = deque()
+        self._keys = set()
+        self._relevant = deque()
+        self._counts = dict.fromkeys(SENTIMENT_LABELS, 0)
+        self._sentiment = {'label': 'NEUTRAL', 'bullish': 0, 'bearish': 0, 'count': 0}
+        self.version = 0
+
+    def __len__(self):
+        return len(self._items)
+
+    def __bool__(self):
+        return bool(self._items)
+
+    def __iter__(self):
+        return iter(self.items())
+
+    def __contains__(self, item):
+        return news_key(item) in self._keys
+
+    def items(self):
+        """Cópia das notícias, da mais antiga para a mais nova"""
+        with self._lock:
+            return list(self._items)
+
+    def add(self, item):
+        """Adiciona a notícia se a chave for nova; retorna True se entrou"""
+        key = news_key(item)
+        with self._lock:
+            if key in self._keys:
+                return False
+            self._items.append(item)
+            self._keys.add(key)
+            self._count(item, 1)
+            window_changed = False
+            if _is_relevant(item):
+                self._relevant.append(item)
+                window_changed = len(self._relevant) <= SENTIMENT_WINDOW
+
+            while len(self._items) > self.maxlen:
+                old = self._items.popleft()
+                self._keys.discard(news_key(old))
+                self._count(old, -1)
+                if _is_relevant(old):
+                    self._relevant.popleft()
+                    window_changed = True
+
+            if window_changed:
+                self._update_sentiment()
+            self.version += 1
+            return True
+
+    def extend(self, items):
+        """Adiciona várias notícias; retorna quantas eram novas"""
+        with self._lock:
+            return sum(1 for item in items if self.add(item))
+
+    def _count(self, item, delta):
+        sentiment = item.get('sentiment')
+        if sentiment in self._counts:
+            self._counts[sentiment] += delta
+
+    def _update_sentiment(self):
+        # Soma na mesma ordem do cálculo original (resultado idêntico em float)
+        bullish_score = 0
+        bearish_score = 0
+        window = list(islice(self._relevant, SENTIMENT_WINDOW))
+        for news in window:
+            relevance = news.get('relevance', 0.5)
+            sentiment = news.get('sentiment', 'NEUTRAL')
+
+            if sentiment == 'BULLISH':
+                bullish_score += relevance
+            elif sentiment == 'BEARISH':
+                bearish_score += relevance
+
+        if abs(bullish_score - bearish_score) < SENTIMENT_DEAD_BAND:
+            label = 'NEUTRAL'
+        elif bullish_score > bearish_score:
+            label = 'BULLISH'
+        else:
+            label = 'BEARISH'
+
+        self._sentiment = {
+            'label': label,
+            'bullish': bullish_score,
+            'bearish': bearish_score,
+            'count': len(window)
+        }
+
+    def sentiment(self):
+        """Sentimento agregado: rótulo + totais de relevância bullish/bearish"""
+        return dict(self._sentiment)
+
+    def sentiment_counts(self):
+        """Quantidade de notícias por sentimento, no cache inteiro"""
+        with self._lock:
+            return dict(self._counts)
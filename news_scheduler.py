@@ -0,0 +1,112 @@
+# ═══════════════════════════════════════════════════════════════════════
+# GOLDAI PRO - AGENDADOR DE BUSCA DE NOTÍCIAS (COTA ALPHA VANTAGE)
+# ═══════════════════════════════════════════════════════════════════════
+
+from datetime import datetime
+
+# Janela "quente" em torno de eventos de alto impacto
+HOT_WINDOW_BEFORE_MINUTES = 120
+HOT_WINDOW_AFTER_MINUTES = 60
+
+# Peso do tempo quente quando a cota está apertada
+HOT_WEIGHT = 4
+
+# Intervalos: fora das janelas quentes nunca mais rápido que a cadência antiga
+NORMAL_INTERVAL_SECONDS = 900
+MIN_INTERVAL_SECONDS = 120
+MAX_INTERVAL_SECONDS = 3600
+
+# Backoff em erro/limite da API: 2 min, 4 min, 8 min... até 1 hora
+BACKOFF_BASE_SECONDS = 120
+MAX_BACKOFF_SECONDS = 3600
+
+
+def hot_windows(event_times, start_ts, end_ts):
+    """Janelas quentes (mescladas) dos eventos, cortadas em [start_ts, end_ts]"""
+    before = HOT_WINDOW_BEFORE_MINUTES * 60
+    after = HOT_WINDOW_AFTER_MINUTES * 60
+    windows = []
+    for ts in sorted(event_times):
+        start, end = max(start_ts, ts - before), min(end_ts, ts + after)
+        if start >= end:
+            continue
+        if windows and start <= windows[-1][1]:
+            windows[-1][1] = max(windows[-1][1], end)
+        else:
+            windows.append([start, end])
+    return windows
+
+
+class NewsPollScheduler:
+    """Distribui a cota restante do dia entre agora e o reset do contador.
+
+    O tempo até o reset é dividido em normal e quente (perto de eventos de
+    alto impacto). Com R chamadas disponíveis, o intervalo normal é o maior
+    entre NORMAL_INTERVAL_SECONDS e (normal + HOT_WEIGHT * quente) / R; o
+    que sobra da cota vai para as janelas quentes. Seguindo o plano, a cota
+    não acaba antes do reset. Erros e respostas de limite da API aplicam
+    backoff exponencial; sem cota, nada é buscado até o reset. Com vários
+    processos no mesmo ledger, cada um planeja só a sua parte (`pollers`).
+    """
+
+    def __init__(self, reserve=10):
+        self.reserve = reserve
+        self.last_fetch = None
+        self.failures = 0
+        self.last_failure = None
+        self.backoff_until = None
+        self.plan = {}
+
+    def update_plan(self, now, remaining, reset_ts, event_times, pollers=1):
+        """Recalcula o intervalo e a próxima busca; retorna o plano"""
+        windows = hot_windows(event_times, now, reset_ts)
+        hot = sum(end - start for start, end in windows)
+        normal = max(0.0, reset_ts - now - hot)
+        in_hot = any(start <= now < end for start, end in windows)
+        spendable = (remaining - self.reserve) // max(1, pollers)
+
+        if spendable <= 0:
+            interval = None
+            next_fetch = reset_ts
+        else:
+            normal_interval = max(NORMAL_INTERVAL_SECONDS, (normal + HOT_WEIGHT * hot) / spendable)
+            hot_budget = spendable - normal / normal_interval
+            hot_interval = hot / hot_budget if hot and hot_budget > 0 else normal_interval
+            hot_interval = max(MIN_INTERVAL_SECONDS, min(normal_interval, hot_interval))
+            interval = min(MAX_INTERVAL_SECONDS, hot_interval if in_hot else normal_interval)
+            next_fetch = now if self.last_fetch is None else self.last_fetch + interval
+            if self.backoff_until:
+                next_fetch = max(next_fetch, self.backoff_until)
+
+        self.plan = {
+            'mode': 'HOT' if in_hot else 'NORMAL',
+            'interval_seconds': round(interval) if interval else None,
+            'next_fetch_ts': next_fetch,
+            'next_fetch': datetime.fromtimestamp(next_fetch).strftime('%Y-%m-%d %H:%M:%S'),
+            'remaining_budget': remaining,
+            'spendable_budget': max(0, spendable),
+            'pollers': pollers,
+            'hot_minutes_until_reset': round(hot / 60),
+            'failures': self.failures,
+            'last_failure': self.last_failure,
+            'backoff_until': (
+                datetime.fromtimestamp(self.backoff_until).strftime('%H:%M:%S')
+                if self.backoff_until and self.backoff_until > now else None
+            )
+        }
+        return self.plan
+
+    def due(self, now):
+        return bool(self.plan) and now >= self.plan['next_fetch_ts']
+
+    def record_success(self, now):
+        self.last_fetch = now
+        self.failures = 0
+        self.backoff_until = None
+
+    def record_failure(self, now, reason):
+        """Erro ou limite da API: a próxima tentativa espera mais a cada falha"""
+        self.last_fetch = now
+        self.failures += 1
+        self.last_failure = reason
+        self.backoff_until = now + min(MAX_BACKOFF_SECONDS, BACKOFF_BASE_SECONDS * 2 ** (self.failures - 1))
@@ -0,0 +1,154 @@
+# ═══════════════════════════════════════════════════════════════════════
+# GOLDAI PRO - HISTÓRICO DE NOTÍCIAS EM SQLITE (WAL)
+# ═══════════════════════════════════════════════════════════════════════
+
+import sqlite3
+import time
+from datetime import datetime
+
+from news_cache import news_key
+from sentiment_engine import published_ts
+
+_SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS news (
+        key TEXT PRIMARY KEY,
+        published_ts REAL NOT NULL,
+        fetched_ts REAL NOT NULL,
+        title TEXT,
+        source TEXT,
+        sentiment TEXT,
+        score REAL,
+        relevance REAL,
+        time TEXT,
+        published TEXT,
+        url TEXT
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_news_published ON news (published_ts)",
+    "CREATE INDEX IF NOT EXISTS idx_news_sentiment ON news (sentiment, published_ts)",
+    "CREATE INDEX IF NOT EXISTS idx_news_source ON news (source, published_ts)",
+    "CREATE INDEX IF NOT EXISTS idx_news_relevance ON news (relevance, published_ts)",
+]
+
+_COLUMNS = ('title', 'source', 'sentiment', 'score', 'time', 'relevance', 'url', 'published')
+
+
+def parse_since(value):
+    """`since` do /news: epoch em segundos, ISO 8601 ou formato da Alpha Vantage"""
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    ts = published_ts({'published': value})
+    if ts is not None:
+        return ts
+    return datetime.fromisoformat(value).timestamp()
+
+
+class NewsStore:
+    """Notícias persistidas em SQLite, indexadas para os filtros do /news.
+
+    A chave é a mesma do NewsCache (URL ou título normalizado), então a
+    mesma notícia buscada de novo é ignorada. O horário de publicação vem
+    do campo 'published'; sem ele, vale o horário da busca.
+    """
+
+    def __init__(self, path, retention_days=30):
+        self.path = path
+        self.retention_days = retention_days
+        conn = self._connect()
+        try:
+            conn.execute('PRAGMA journal_mode=WAL')
+            for statement in _SCHEMA:
+                conn.execute(statement)
+        finally:
+            conn.close()
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=10, isolation_level=None)
+
+    def add_many(self, items, fetched_ts=None):
+        """Grava as notícias novas; retorna quantas entraram"""
+        fetched_ts = time.time() if fetched_ts is None else fetched_ts
+        rows = [
+            (
+                news_key(item),
+                published_ts(item, default=fetched_ts),
+                fetched_ts,
+                *(item.get(column) for column in _COLUMNS)
+            )
+            for item in items
+        ]
+        conn = self._connect()
+        try:
+            conn.execute('BEGIN')
+            before = conn.total_changes
+            conn.executemany(
+                'INSERT OR IGNORE INTO news (key, published_ts, fetched_ts, title, source, sentiment, '
+                'score, time, relevance, url, published) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                rows
+            )
+            inserted = conn.total_changes - before
+            conn.execute('COMMIT')
+            return inserted
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _where(sentiment=None, source=None, min_relevance=None, since=None):
+        clauses, params = [], []
+        if sentiment:
+            clauses.append('sentiment = ?')
+            params.append(sentiment.upper())
+        if source:
+            clauses.append('source = ?')
+            params.append(source)
+        if min_relevance is not None:
+            clauses.append('relevance >= ?')
+            params.append(min_relevance)
+        if since is not None:
+            clauses.append('published_ts >= ?')
+            params.append(since)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ''
+        return where, params
+
+    def query(self, limit=20, **filters):
+        """Notícias que batem com os filtros, da mais recente para a mais antiga"""
+        where, params = self._where(**filters)
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM news {where} "
+                "ORDER BY published_ts DESC LIMIT ?",
+                (*params, limit)
+            ).fetchall()
+            return [dict(zip(_COLUMNS, row)) for row in rows]
+        finally:
+            conn.close()
+
+    def sentiment_counts(self, **filters):
+        """Total por sentimento entre as notícias que batem com os filtros"""
+        where, params = self._where(**filters)
+        conn = self._connect()
+        try:
+            counts = {'BULLISH': 0, 'BEARISH': 0, 'NEUTRAL': 0}
+            for sentiment, count in conn.execute(
+                f"SELECT sentiment, COUNT(*) FROM news {where} GROUP BY sentiment", params
+            ):
+                counts[sentiment] = count
+            return counts
+        finally:
+            conn.close()
+
+    def prune(self, now=None):
+        """Remove notícias publicadas há mais de `retention_days`"""
+        now = time.time() if now is None else now
+        conn = self._connect()
+        try:
+            return conn.execute(
+                'DELETE FROM news WHERE published_ts < ?',
+                (now - self.retention_days * 86400,)
+            ).rowcount
+        finally:
+            conn.close()
@@ -0,0 +1,151 @@
+# ═══════════════════════════════════════════════════════════════════════
+# GOLDAI PRO - LEDGER DE COTA DE API (COMPARTILHADO ENTRE PROCESSOS)
+# ═══════════════════════════════════════════════════════════════════════
+
+import sqlite3
+import time
+from datetime import datetime
+
+# Processo sem heartbeat há mais que isso deixa de dividir a cota
+POLLER_TTL_SECONDS = 600
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS quota_usage (
+    service TEXT NOT NULL,
+    day TEXT NOT NULL,
+    used INTEGER NOT NULL DEFAULT 0,
+    updated_at TEXT,
+    PRIMARY KEY (service, day)
+)
+"""
+
+_POLLERS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS quota_pollers (
+    service TEXT NOT NULL,
+    poller TEXT NOT NULL,
+    last_seen REAL NOT NULL,
+    PRIMARY KEY (service, poller)
+)
+"""
+
+
+def _today(clock=None):
+    return (clock.now() if clock else datetime.now()).strftime('%Y-%m-%d')
+
+
+class QuotaLedger:
+    """Contador diário de chamadas em SQLite, visto por todos os processos.
+
+    server.py e goldai_server.py usam a mesma chave da Alpha Vantage: cada
+    chamada precisa de `reserve()` antes de sair. A reserva é atômica
+    (BEGIN IMMEDIATE), então os dois processos juntos nunca passam do
+    limite, e a contagem sobrevive a restarts. Uma reserva usada conta
+    mesmo que a chamada falhe; `release()` devolve só o que não saiu.
+    Cada processo que busca notícias chama `heartbeat()` para saber entre
+    quantos pollers a cota restante precisa ser dividida.
+    """
+
+    def __init__(self, path, service='alpha_vantage', daily_limit=500, clock=None):
+        self.path = path
+        self.service = service
+        self.daily_limit = daily_limit
+        self.clock = clock
+        conn = self._connect()
+        try:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute(_SCHEMA)
+            conn.execute(_POLLERS_SCHEMA)
+        finally:
+            conn.close()
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=10, isolation_level=None)
+
+    def reserve(self, calls=1):
+        """Reserva `calls` chamadas de hoje; retorna False se estourar o limite"""
+        day = _today(self.clock)
+        conn = self._connect()
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            row = conn.execute(
+                'SELECT used FROM quota_usage WHERE service = ? AND day = ?',
+                (self.service, day)
+            ).fetchone()
+            used = row[0] if row else 0
+            if used + calls > self.daily_limit:
+                conn.execute('ROLLBACK')
+                return False
+            conn.execute(
+                'INSERT INTO quota_usage (service, day, used, updated_at) VALUES (?, ?, ?, ?) '
+                'ON CONFLICT(service, day) DO UPDATE SET used = excluded.used, updated_at = excluded.updated_at',
+                (self.service, day, used + calls, (self.clock.now() if self.clock else datetime.now()).isoformat(timespec='seconds'))
+            )
+            conn.execute('COMMIT')
+            return True
+        except Exception:
+            if conn.in_transaction:
+                conn.execute('ROLLBACK')
+            raise
+        finally:
+            conn.close()
+
+    def release(self, calls=1):
+        """Devolve reservas que não chegaram a virar chamada"""
+        conn = self._connect()
+        try:
+            conn.execute(
+                'UPDATE quota_usage SET used = MAX(0, used - ?) WHERE service = ? AND day = ?',
+                (calls, self.service, _today(self.clock))
+            )
+        finally:
+            conn.close()
+
+    def heartbeat(self, poller, ttl=POLLER_TTL_SECONDS):
+        """Marca `poller` como ativo; retorna quantos pollers ativos dividem a cota"""
+        # Relógio real: a vivacidade é entre processos, não no tempo simulado
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute(
+                'INSERT INTO quota_pollers (service, poller, last_seen) VALUES (?, ?, ?) '
+                'ON CONFLICT(service, poller) DO UPDATE SET last_seen = excluded.last_seen',
+                (self.service, poller, now)
+            )
+            conn.execute(
+                'DELETE FROM quota_pollers WHERE service = ? AND last_seen < ?',
+                (self.service, now - ttl)
+            )
+            row = conn.execute(
+                'SELECT COUNT(*) FROM quota_pollers WHERE service = ?',
+                (self.service,)
+            ).fetchone()
+            return max(1, row[0])
+        finally:
+            conn.close()
+
+    def used(self, day=None):
+        """Chamadas contadas no dia (hoje por padrão)"""
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                'SELECT used FROM quota_usage WHERE service = ? AND day = ?',
+                (self.service, day or _today(self.clock))
+            ).fetchone()
+            return row[0] if row else 0
+        finally:
+            conn.close()
+
+    def remaining(self):
+        return max(0, self.daily_limit - self.used())
+
+    def history(self, days=7):
+        """Uso dos últimos `days` dias registrados, do mais recente ao mais antigo"""
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                'SELECT day, used FROM quota_usage WHERE service = ? ORDER BY day DESC LIMIT ?',
+                (self.service, days)
+            ).fetchall()
+            return [{'day': day, 'used': used} for day, used in rows]
+        finally:
+            conn.close()
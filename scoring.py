@@ -0,0 +1,272 @@
+# ═══════════════════════════════════════════════════════════════════════
+# GOLDAI PRO - SCORE DOS SINAIS (ESCALAR E VETORIZADO COM NUMPY)
+# ═══════════════════════════════════════════════════════════════════════
+
+from datetime import datetime
+
+import numpy as np
+
+# Faixas do sinal final
+WEAK_BELOW = 60
+MODERATE_BELOW = 75
+
+# Ajuste da confiança pelo sentimento das notícias
+NEWS_AGREE_BONUS = 12
+NEWS_AGAINST_PENALTY = 18
+
+# Abaixo disso o overhead do numpy passa o ganho (ver benchmarks/bench_scoring.py)
+VECTOR_MIN_ROWS = 16
+
+
+# ─── caminho escalar (um payload por vez) ───────────────────────────────
+
+def technical_strength(tech_data):
+    """Força técnica (0-100) de um payload: ADX, RSI, alinhamento das EMAs e confiança"""
+    score = 0
+
+    adx = tech_data.get('adx', 0)
+    if adx >= 40:
+        score += 20
+    elif adx >= 30:
+        score += 15
+    elif adx >= 25:
+        score += 10
+
+    rsi = tech_data.get('rsi', 50)
+    action = tech_data.get('action', 'NONE')
+
+    if action == 'BUY':
+        if 40 <= rsi <= 60:
+            score += 20
+        elif 30 <= rsi < 40:
+            score += 15
+        elif rsi > 70:
+            score -= 10
+    elif action == 'SELL':
+        if 40 <= rsi <= 60:
+            score += 20
+        elif 60 < rsi <= 70:
+            score += 15
+        elif rsi < 30:
+            score -= 10
+
+    ema5 = tech_data.get('ema5', 0)
+    ema15 = tech_data.get('ema15', 0)
+    ema50 = tech_data.get('ema50', 0)
+
+    if action == 'BUY' and ema5 > ema15 > ema50:
+        score += 30
+    elif action == 'BUY' and ema5 > ema15:
+        score += 20
+    elif action == 'SELL' and ema5 < ema15 < ema50:
+        score += 30
+    elif action == 'SELL' and ema5 < ema15:
+        score += 20
+
+    confidence = tech_data.get('confidence', 0) * 100
+    score += min(confidence * 0.3, 30)
+
+    return min(score, 100)
+
+
+def _none_signal(news_sentiment, technical_strength):
+    return {
+        'signal': 'NONE',
+        'action': 'WAIT',
+        'confidence': 0.0,
+        'reason': 'Sem sinal técnico',
+        'technical_strength': technical_strength,
+        'news_sentiment': news_sentiment
+    }
+
+
+def _signal_record(action, news_sentiment, technical_strength, base_confidence,
+                   adjusted_confidence, final_confidence, signal_type, now=None):
+    if signal_type == 'WEAK':
+        final_action = 'WAIT'
+        reason = f'Confiança baixa: {final_confidence:.1f}%'
+    elif signal_type == 'MODERATE':
+        final_action = action
+        reason = f'Sinal moderado: {final_confidence:.1f}%'
+    else:
+        final_action = action
+        reason = f'Sinal forte: {final_confidence:.1f}%'
+
+    return {
+        'signal': signal_type,
+        'action': final_action,
+        'confidence': round(final_confidence, 2),
+        'reason': reason,
+        'news_sentiment': news_sentiment,
+        'technical_strength': round(technical_strength, 2),
+        'base_confidence': round(base_confidence, 2),
+        'timestamp': (now or datetime.now()).isoformat(),
+        'components': {
+            'technical_score': round(base_confidence, 1),
+            'news_adjustment': round(adjusted_confidence - base_confidence, 1),
+            'technical_strength': round(technical_strength, 1)
+        }
+    }
+
+
+def combine_signals(action, confidence, news_sentiment, technical_strength, now=None):
+    """Confiança final e tipo do sinal (WEAK/MODERATE/STRONG) de um payload"""
+    if action == 'NONE':
+        return _none_signal(news_sentiment, technical_strength)
+
+    # Sempre float, como no caminho vetorizado (100 e 0 não saem como int)
+    technical_strength = float(technical_strength)
+    base_confidence = float(confidence * 100 if confidence <= 1 else confidence)
+    adjusted_confidence = base_confidence
+
+    if action == 'BUY':
+        if news_sentiment == 'BULLISH':
+            adjusted_confidence += NEWS_AGREE_BONUS
+        elif news_sentiment == 'BEARISH':
+            adjusted_confidence -= NEWS_AGAINST_PENALTY
+    elif action == 'SELL':
+        if news_sentiment == 'BEARISH':
+            adjusted_confidence += NEWS_AGREE_BONUS
+        elif news_sentiment == 'BULLISH':
+            adjusted_confidence -= NEWS_AGAINST_PENALTY
+
+    final_confidence = (adjusted_confidence * 0.6) + (technical_strength * 0.4)
+    final_confidence = max(0.0, min(100.0, final_confidence))
+
+    if final_confidence < WEAK_BELOW:
+        signal_type = 'WEAK'
+    elif final_confidence < MODERATE_BELOW:
+        signal_type = 'MODERATE'
+    else:
+        signal_type = 'STRONG'
+
+    return _signal_record(action, news_sentiment, technical_strength, base_confidence,
+                          adjusted_confidence, final_confidence, signal_type, now)
+
+
+# ─── caminho vetorizado (N linhas de uma vez) ───────────────────────────
+#
+# Mesmas operações, na mesma ordem, do caminho escalar: os resultados são
+# idênticos bit a bit (inclusive NaN). min/max do Python viram np.where com
+# a mesma comparação, para empates e NaN caírem do mesmo lado.
+
+def _py_min(a, b):
+    """min(a, b) do Python: b só quando b < a"""
+    return np.where(b < a, b, a)
+
+
+def _py_max(a, b):
+    """max(a, b) do Python: b só quando b > a"""
+    return np.where(b > a, b, a)
+
+
+def technical_strength_array(action, adx, rsi, ema5, ema15, ema50, confidence):
+    """`technical_strength` para colunas inteiras; retorna array float64"""
+    action = np.asarray(action)
+    adx = np.asarray(adx, dtype=np.float64)
+    rsi = np.asarray(rsi, dtype=np.float64)
+    ema5 = np.asarray(ema5, dtype=np.float64)
+    ema15 = np.asarray(ema15, dtype=np.float64)
+    ema50 = np.asarray(ema50, dtype=np.float64)
+    confidence = np.asarray(confidence, dtype=np.float64)
+
+    buy = action == 'BUY'
+    sell = action == 'SELL'
+    rsi_mid = (rsi >= 40) & (rsi <= 60)
+
+    # Pontos inteiros: a soma é exata em float64, qualquer ordem serve
+    score = np.select([adx >= 40, adx >= 30, adx >= 25], [20, 15, 10], 0)
+    score = score + np.select(
+        [
+            buy & rsi_mid, buy & (rsi >= 30) & (rsi < 40), buy & (rsi > 70),
+            sell & rsi_mid, sell & (rsi > 60) & (rsi <= 70), sell & (rsi < 30)
+        ],
+        [20, 15, -10, 20, 15, -10],
+        0
+    )
+    score = score + np.select(
+        [
+            buy & (ema5 > ema15) & (ema15 > ema50), buy & (ema5 > ema15),
+            sell & (ema5 < ema15) & (ema15 < ema50), sell & (ema5 < ema15)
+        ],
+        [30, 20, 30, 20],
+        0
+    )
+
+    score = score + _py_min(confidence * 100 * 0.3, 30)
+    return _py_min(score, 100)
+
+
+def score_arrays(action, confidence, adx, rsi, ema5, ema15, ema50, news_sentiment='NEUTRAL'):
+    """Força técnica, confianças e tipo do sinal para N linhas.
+
+    `news_sentiment` pode ser um rótulo só ou um array por linha. Nada é
+    arredondado aqui; `signal_records` arredonda só na saída.
+    """
+    action = np.asarray(action)
+    confidence = np.asarray(confidence, dtype=np.float64)
+    news_sentiment = np.asarray(news_sentiment)
+
+    strength = technical_strength_array(action, adx, rsi, ema5, ema15, ema50, confidence)
+
+    buy = action == 'BUY'
+    sell = action == 'SELL'
+    bullish = news_sentiment == 'BULLISH'
+    bearish = news_sentiment == 'BEARISH'
+
+    base = np.where(confidence <= 1, confidence * 100, confidence)
+    adjustment = np.select(
+        [buy & bullish, buy & bearish, sell & bearish, sell & bullish],
+        [NEWS_AGREE_BONUS, -NEWS_AGAINST_PENALTY, NEWS_AGREE_BONUS, -NEWS_AGAINST_PENALTY],
+        0
+    )
+    adjusted = np.where(adjustment != 0, base + adjustment, base)
+
+    final = (adjusted * 0.6) + (strength * 0.4)
+    final = _py_max(0, _py_min(100, final))
+
+    signal = np.where(final < WEAK_BELOW, 'WEAK', np.where(final < MODERATE_BELOW, 'MODERATE', 'STRONG'))
+    signal = np.where(action == 'NONE', 'NONE', signal)
+    final_action = np.where((signal == 'NONE') | (signal == 'WEAK'), 'WAIT', action.astype(str))
+
+    return {
+        'technical_strength': strength,
+        'base_confidence': base,
+        'adjusted_confidence': adjusted,
+        'final_confidence': np.where(signal == 'NONE', 0, final),
+        'signal': signal,
+        'action': final_action
+    }
+
+
+def signal_records(rows, news_sentiment, now=None):
+    """Os mesmos dicts de `combine_signals`, calculados em lote para vários payloads"""
+    if len(rows) < VECTOR_MIN_ROWS:
+        return [
+            combine_signals(row.get('action', 'NONE'), row.get('confidence', 0), news_sentiment, technical_strength(row), now)
+            for row in rows
+        ]
+    columns = {
+        name: [row.get(name, default) for row in rows]
+        for name, default in (
+            ('action', 'NONE'), ('confidence', 0), ('adx', 0), ('rsi', 50),
+            ('ema5', 0), ('ema15', 0), ('ema50', 0)
+        )
+    }
+    scores = score_arrays(news_sentiment=news_sentiment, **columns)
+
+    records = []
+    for i, action in enumerate(columns['action']):
+        strength = float(scores['technical_strength'][i])
+        if action == 'NONE':
+            records.append(_none_signal(news_sentiment, strength))
+            continue
+        records.append(_signal_record(
+            action, news_sentiment, strength,
+            float(scores['base_confidence'][i]),
+            float(scores['adjusted_confidence'][i]),
+            float(scores['final_confidence'][i]),
+            str(scores['signal'][i]),
+            now
+        ))
+    return records
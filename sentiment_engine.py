@@ -0,0 +1,191 @@
+# ═══════════════════════════════════════════════════════════════════════
+# GOLDAI PRO - SENTIMENTO COM DECAIMENTO E BUCKETS DE TEMPO
+# ═══════════════════════════════════════════════════════════════════════
+
+import math
+import threading
+import time
+from datetime import datetime, timezone
+
+# Resolução -> (segundos por bucket, quantidade de buckets guardados)
+BUCKET_RESOLUTIONS = {
+    '1m': (60, 120),      # 2 horas
+    '5m': (300, 288),     # 24 horas
+    '1h': (3600, 168),    # 7 dias
+}
+
+DEFAULT_HALF_LIFE_MINUTES = 60
+
+# Mesma zona neutra do agregado por janela (news_cache)
+DECAYED_DEAD_BAND = 0.3
+
+# Formatos do time_published da Alpha Vantage (UTC)
+PUBLISHED_FORMATS = ["%Y%m%dT%H%M%S", "%Y%m%dT%H%M"]
+
+
+def published_ts(item, default=None):
+    """Epoch do campo 'published' da notícia (ou `default` se não parsear)"""
+    value = item.get('published') or ''
+    for fmt in PUBLISHED_FORMATS:
+        try:
+            return datetime.strptime(value, fmt).replace(tzinfo=timezone.utc).timestamp()
+        except ValueError:
+            continue
+    return default
+
+
+class DecayedMass:
+    """Massa com decaimento exponencial, atualizada em O(1).
+
+    Guarda o valor na data `ref` e decai só quando alguém atualiza ou lê.
+    Notícias fora de ordem (mais antigas que `ref`) entram já decaídas.
+    """
+
+    def __init__(self, decay_per_second):
+        self.decay = decay_per_second
+        self.value = 0.0
+        self.ref = None
+
+    def add(self, amount, ts):
+        if self.ref is None:
+            self.ref = ts
+        if ts > self.ref:
+            self.value *= math.exp(-self.decay * (ts - self.ref))
+            self.ref = ts
+            self.value += amount
+        else:
+            self.value += amount * math.exp(-self.decay * (self.ref - ts))
+
+    def at(self, now):
+        if self.ref is None:
+            return 0.0
+        return self.value * math.exp(-self.decay * max(0.0, now - self.ref))
+
+
+class BucketRing:
+    """Buckets de tamanho fixo em um anel: inserção O(1), série O(buckets)"""
+
+    def __init__(self, seconds, size):
+        self.seconds = seconds
+        self.size = size
+        self._index = [None] * size
+        self._data = [None] * size
+        self.newest = None
+
+    def add(self, ts, bullish, bearish, score):
+        i = int(ts // self.seconds)
+        if self.newest is not None and i <= self.newest - self.size:
+            return False
+        slot = i % self.size
+        if self._index[slot] != i:
+            self._index[slot] = i
+            self._data[slot] = [0.0, 0.0, 0, 0.0]
+        bucket = self._data[slot]
+        bucket[0] += bullish
+        bucket[1] += bearish
+        bucket[2] += 1
+        bucket[3] += score
+        self.newest = i if self.newest is None else max(self.newest, i)
+        return True
+
+    def series(self, now, points):
+        """Últimos `points` buckets até `now`, incluindo os vazios"""
+        end = int(now // self.seconds)
+        points = max(1, min(points, self.size))
+        result = []
+        for i in range(end - points + 1, end + 1):
+            slot = i % self.size
+            if self._index[slot] == i:
+                result.append((i * self.seconds, *self._data[slot]))
+            else:
+                result.append((i * self.seconds, 0.0, 0.0, 0, 0.0))
+        return result
+
+
+class SentimentEngine:
+    """Sentimento das notícias com decaimento exponencial pelo horário de publicação.
+
+    Cada notícia soma sua relevância na massa bullish ou bearish (pelo campo
+    'sentiment') e nos buckets de 1m/5m/1h. A massa perde metade do peso a
+    cada `half_life_minutes`, então uma manchete de 3 horas atrás pesa 1/8 de
+    uma recém-publicada (meia-vida padrão de 60 min).
+    """
+
+    def __init__(self, half_life_minutes=DEFAULT_HALF_LIFE_MINUTES):
+        self.half_life_minutes = half_life_minutes
+        decay = math.log(2) / (half_life_minutes * 60)
+        self._lock = threading.Lock()
+        self._bullish = DecayedMass(decay)
+        self._bearish = DecayedMass(decay)
+        self._rings = {
+            name: BucketRing(seconds, size)
+            for name, (seconds, size) in BUCKET_RESOLUTIONS.items()
+        }
+        self.decay = decay
+        self.articles = 0
+
+    def add(self, item, now=None):
+        """Registra uma notícia; sem 'published' válido, usa o horário atual"""
+        ts = published_ts(item, default=now if now is not None else time.time())
+        relevance = item.get('relevance', 0.5)
+        sentiment = item.get('sentiment', 'NEUTRAL')
+        bullish = relevance if sentiment == 'BULLISH' else 0.0
+        bearish = relevance if sentiment == 'BEARISH' else 0.0
+
+        with self._lock:
+            if bullish:
+                self._bullish.add(bullish, ts)
+            if bearish:
+                self._bearish.add(bearish, ts)
+            for ring in self._rings.values():
+                ring.add(ts, bullish, bearish, item.get('score', 0.0))
+            self.articles += 1
+
+    def value(self, now=None):
+        """Massas decaídas em `now` e o rótulo resultante"""
+        now = time.time() if now is None else now
+        with self._lock:
+            bullish = self._bullish.at(now)
+            bearish = self._bearish.at(now)
+
+        if abs(bullish - bearish) < DECAYED_DEAD_BAND:
+            label = 'NEUTRAL'
+        elif bullish > bearish:
+            label = 'BULLISH'
+        else:
+            label = 'BEARISH'
+
+        return {
+            'label': label,
+            'bullish': round(bullish, 4),
+            'bearish': round(bearish, 4),
+            'net': round(bullish - bearish, 4),
+            'half_life_minutes': self.half_life_minutes,
+            'articles': self.articles
+        }
+
+    def label(self, now=None):
+        return self.value(now)['label']
+
+    def series(self, resolution='5m', points=None, now=None):
+        """Série de buckets da resolução pedida (a mais antiga primeiro)"""
+        ring = self._rings[resolution]
+        now = time.time() if now is None else now
+        with self._lock:
+            buckets = ring.series(now, points or ring.size)
+
+        series = []
+        for start, bullish, bearish, count, score in buckets:
+            # Peso do bucket inteiro no fim dele (decaimento até `now`)
+            weight = math.exp(-self.decay * max(0.0, now - (start + ring.seconds)))
+            series.append({
+                'start': datetime.fromtimestamp(start).strftime('%Y-%m-%d %H:%M'),
+                'start_ts': start,
+                'bullish': round(bullish, 4),
+                'bearish': round(bearish, 4),
+                'net': round(bullish - bearish, 4),
+                'decayed_net': round((bullish - bearish) * weight, 4),
+                'count': count,
+                'avg_score': round(score / count, 4) if count else None
+            })
+        return series
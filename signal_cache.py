@@ -0,0 +1,148 @@
+# ═══════════════════════════════════════════════════════════════════════
+# GOLDAI PRO - CACHE DE SINAIS (TTL + LRU)
+# ═══════════════════════════════════════════════════════════════════════
+
+import threading
+import time
+from collections import OrderedDict
+
+# Casas decimais de cada entrada da chave (precisão da quantização; None = valor exato).
+# A confiança entra exata: ela move o score final, comparado com os cortes
+# WEAK/MODERATE/STRONG, e qualquer arredondamento pode trocar o lado do corte.
+SIGNAL_KEY_PRECISION = {
+    'confidence': None,
+    'adx': 2,
+    'rsi': 2,
+    'ema5': 5,
+    'ema15': 5,
+    'ema50': 5,
+}
+
+
+def _sign(value):
+    return (value > 0) - (value < 0)
+
+
+def _threshold_sides(adx, rsi, confidence):
+    """Lado de cada limiar de scoring.technical_strength/combine_signals, com as mesmas comparações"""
+    return (
+        adx >= 25, adx >= 30, adx >= 40,
+        rsi < 30, rsi < 40, rsi <= 60, rsi <= 70,
+        confidence <= 1
+    )
+
+
+def _quantize(value, digits):
+    value = float(value)
+    return value if digits is None else round(value, digits)
+
+
+def signal_key(technical_data, precision=SIGNAL_KEY_PRECISION):
+    """Chave com todas as entradas que mudam a decisão, quantizadas.
+
+    Além dos valores arredondados, entram exatos na chave a ordem entre as
+    EMAs e o lado de cada limiar de ADX/RSI/confiança: ADX 24.996 e 25.004
+    arredondam para 25.00 mas caem em lados diferentes do corte, e um hit
+    do cache não pode devolver uma decisão diferente do cálculo na hora.
+    """
+    ema5 = technical_data.get('ema5', 0)
+    ema15 = technical_data.get('ema15', 0)
+    ema50 = technical_data.get('ema50', 0)
+    sides = _threshold_sides(
+        technical_data.get('adx', 0),
+        technical_data.get('rsi', 50),
+        technical_data.get('confidence', 0)
+    )
+    values = tuple(
+        _quantize(technical_data.get(name, default), digits)
+        for name, digits, default in (
+            ('confidence', precision['confidence'], 0),
+            ('adx', precision['adx'], 0),
+            ('rsi', precision['rsi'], 50),
+            ('ema5', precision['ema5'], 0),
+            ('ema15', precision['ema15'], 0),
+            ('ema50', precision['ema50'], 0),
+        )
+    )
+    return (technical_data.get('action', 'NONE'), *values, _sign(ema5 - ema15), _sign(ema15 - ema50), *sides)
+
+
+class SignalCache:
+    """Cache limitado: sai o menos usado recentemente, e cada entrada expira em `ttl` segundos.
+
+    Cada entrada guarda também as versões dos dados (calendário, notícias)
+    com que foi calculada. Na leitura, versão diferente da atual invalida a
+    entrada ali mesmo: uma mudança nos dados não exige varrer o cache.
+    """
+
+    def __init__(self, maxsize=1024, ttl=120, clock=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._monotonic = clock.monotonic if clock else time.monotonic
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, version=None, now=None):
+        now = self._monotonic() if now is None else now
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            value, expires_at, entry_version = entry
+            if now >= expires_at:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            if entry_version != version:
+                del self._entries[key]
+                self.invalidations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value, version=None, now=None):
+        now = self._monotonic() if now is None else now
+        with self._lock:
+            self._entries[key] = (value, now + self.ttl, version)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def purge_expired(self, now=None):
+        """Remove as entradas vencidas (chamado na limpeza periódica)"""
+        now = self._monotonic() if now is None else now
+        with self._lock:
+            expired = [key for key, (_, expires_at, _) in self._entries.items() if now >= expires_at]
+            for key in expired:
+                del self._entries[key]
+            self.expirations += len(expired)
+            return len(expired)
+
+    def stats(self):
+        """Contadores para o /status"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'ttl_seconds': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups * 100, 1) if lookups else None,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'invalidations': self.invalidations
+            }
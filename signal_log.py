@@ -0,0 +1,313 @@
+# ═══════════════════════════════════════════════════════════════════════
+# GOLDAI PRO - LOG DE SINAIS (APPEND-ONLY, SEGMENTADO)
+# ═══════════════════════════════════════════════════════════════════════
+
+import json
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+# Rotação do segmento atual
+SEGMENT_MAX_BYTES = 4 * 1024 * 1024
+
+# Uma entrada no índice de offsets a cada N registros
+INDEX_EVERY = 64
+
+# Últimos registros em memória (a página mais pedida do /history)
+TAIL_SIZE = 200
+
+_SEGMENT_PREFIX = 'segment_'
+_SEGMENT_SUFFIX = '.jsonl'
+_INDEX_SUFFIX = '.idx'
+
+
+def _index_path(path):
+    return path[:-len(_SEGMENT_SUFFIX)] + _INDEX_SUFFIX
+
+
+def _parse(line):
+    """Registro da linha, ou None se a linha estiver corrompida"""
+    try:
+        record = json.loads(line)
+    except ValueError:
+        return None
+    if not isinstance(record, dict) or 'seq' not in record or 'ts' not in record:
+        return None
+    return record
+
+
+class SignalLog:
+    """Histórico de sinais em arquivos JSON Lines só de append.
+
+    Cada registro ganha `seq` (cursor crescente) e `ts` (epoch, nunca
+    decrescente). Os arquivos giram ao passar de SEGMENT_MAX_BYTES. O índice
+    esparso guarda (seq, ts, arquivo, offset) a cada INDEX_EVERY registros:
+    uma consulta por cursor ou por intervalo de tempo faz uma busca binária
+    e lê só os blocos necessários, nas duas direções. Os últimos TAIL_SIZE
+    registros ficam em memória. Ao girar, o índice do segmento fechado vai
+    para um `.idx` ao lado; na abertura só o último segmento é relido.
+    """
+
+    def __init__(self, directory, segment_max_bytes=SEGMENT_MAX_BYTES):
+        self.directory = directory
+        self.segment_max_bytes = segment_max_bytes
+        self._lock = threading.Lock()
+        self._blocks = []          # (first_seq, first_ts, path, offset)
+        self._block_seqs = []
+        self._block_ts = []
+        self._tail = deque(maxlen=TAIL_SIZE)
+        self._file = None
+        self._path = None
+        self._segment_records = 0
+        self.last_seq = 0
+        self.last_ts = 0.0
+        self.records = 0
+        os.makedirs(directory, exist_ok=True)
+        self._load()
+
+    # ─── abertura / índice ──────────────────────────────────────────────
+
+    def _segments(self):
+        names = sorted(
+            name for name in os.listdir(self.directory)
+            if name.startswith(_SEGMENT_PREFIX) and name.endswith(_SEGMENT_SUFFIX)
+        )
+        return [os.path.join(self.directory, name) for name in names]
+
+    def _add_block(self, seq, ts, path, offset):
+        self._blocks.append((seq, ts, path, offset))
+        self._block_seqs.append(seq)
+        self._block_ts.append(ts)
+
+    def _load(self):
+        """Reconstrói índice e tail: segmentos fechados pelo `.idx`, o último lendo o arquivo"""
+        segments = self._segments()
+        for n, path in enumerate(segments):
+            closed = n < len(segments) - 1
+            if closed and self._load_index(path):
+                continue
+            self._scan_segment(path)
+            if closed:
+                self._save_index(path, self._segment_records)
+
+    def _scan_segment(self, path):
+        count = 0
+        skipped = 0
+        with open(path, 'rb') as f:
+            offset = 0
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break  # registro incompleto (queda no meio da escrita)
+                record = _parse(line)
+                offset += len(line)
+                if record is None:
+                    skipped += 1
+                    continue
+                if count % INDEX_EVERY == 0:
+                    self._add_block(record['seq'], record['ts'], path, offset - len(line))
+                count += 1
+                self._tail.append(record)
+                self.last_seq = record['seq']
+                self.last_ts = record['ts']
+                self.records += 1
+        if skipped:
+            logger.warning(f"[WARN] {skipped} linhas corrompidas ignoradas em {path}")
+        self._path = path
+        self._segment_records = count
+        if os.path.getsize(path) != offset:
+            # Corta o lixo do fim para o próximo append começar numa linha nova
+            with open(path, 'r+b') as f:
+                f.truncate(offset)
+
+    def _load_index(self, path):
+        """Usa o `.idx` salvo se ele ainda corresponde ao segmento; retorna False se não"""
+        try:
+            with open(_index_path(path), encoding='utf-8') as f:
+                saved = json.load(f)
+            if saved['size'] != os.path.getsize(path):
+                return False
+            blocks = [(seq, ts, offset) for seq, ts, offset in saved['blocks']]
+            records, last_seq, last_ts = saved['records'], saved['last_seq'], saved['last_ts']
+        except (OSError, ValueError, KeyError, TypeError):
+            return False
+        for seq, ts, offset in blocks:
+            self._add_block(seq, ts, path, offset)
+        self.records += records
+        self.last_seq = last_seq
+        self.last_ts = last_ts
+        self._path = path
+        self._segment_records = records
+        return True
+
+    def _save_index(self, path, records):
+        """Grava o índice de um segmento fechado (arquivo temporário + rename)"""
+        saved = {
+            'size': os.path.getsize(path),
+            'records': records,
+            'last_seq': self.last_seq,
+            'last_ts': self.last_ts,
+            'blocks': [[seq, ts, offset] for seq, ts, block_path, offset in self._blocks if block_path == path]
+        }
+        tmp_path = _index_path(path) + '.tmp'
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(saved, f)
+            os.replace(tmp_path, _index_path(path))
+        except OSError as e:
+            # Sem .idx o segmento só é relido no próximo boot
+            logger.warning(f"[WARN] Índice de {path} não gravado: {e}")
+
+    def _open_segment(self, first_seq):
+        self._path = os.path.join(self.directory, f"{_SEGMENT_PREFIX}{first_seq:012d}{_SEGMENT_SUFFIX}")
+        self._file = open(self._path, 'ab')
+        self._segment_records = 0
+
+    # ─── escrita ────────────────────────────────────────────────────────
+
+    def append(self, record, now=None):
+        """Grava o registro no fim do log; retorna o seq atribuído"""
+        with self._lock:
+            seq = self.last_seq + 1
+            ts = max(time.time() if now is None else now, self.last_ts)
+            entry = {'seq': seq, 'ts': ts, **record}
+            line = (json.dumps(entry, ensure_ascii=False, separators=(',', ':')) + '\n').encode('utf-8')
+
+            if self._file is None:
+                if self._path and os.path.getsize(self._path) < self.segment_max_bytes:
+                    self._file = open(self._path, 'ab')
+                else:
+                    if self._path:
+                        self._save_index(self._path, self._segment_records)
+                    self._open_segment(seq)
+            elif self._file.tell() >= self.segment_max_bytes:
+                self._file.close()
+                self._save_index(self._path, self._segment_records)
+                self._open_segment(seq)
+
+            offset = self._file.tell()
+            self._file.write(line)
+            self._file.flush()
+
+            if self._segment_records % INDEX_EVERY == 0:
+                self._add_block(seq, ts, self._path, offset)
+            self._segment_records += 1
+            self._tail.append(entry)
+            self.last_seq = seq
+            self.last_ts = ts
+            self.records += 1
+            return seq
+
+    def close(self):
+        with self._lock:
+            if self._file:
+                self._file.close()
+                self._file = None
+
+    # ─── leitura ────────────────────────────────────────────────────────
+
+    def _read_block(self, i):
+        """Registros do bloco i, em ordem crescente"""
+        _, _, path, offset = self._blocks[i]
+        end = None
+        if i + 1 < len(self._blocks) and self._blocks[i + 1][2] == path:
+            end = self._blocks[i + 1][3]
+        records = []
+        with open(path, 'rb') as f:
+            f.seek(offset)
+            data = f.read() if end is None else f.read(end - offset)
+        for line in data.splitlines(keepends=True):
+            if line.endswith(b'\n'):
+                record = _parse(line)
+                if record is not None:
+                    records.append(record)
+        return records
+
+    def page(self, after=None, before=None, since=None, until=None, limit=50):
+        """Uma página do histórico.
+
+        Com `after`: registros com seq > after, do mais antigo ao mais novo.
+        Sem `after`: do mais novo ao mais antigo, com seq < before (se dado).
+        `since`/`until` (epoch) restringem o intervalo de tempo nos dois casos.
+        """
+        def wanted(record):
+            return (
+                (after is None or record['seq'] > after)
+                and (before is None or record['seq'] < before)
+                and (since is None or record['ts'] >= since)
+                and (until is None or record['ts'] <= until)
+            )
+
+        with self._lock:
+            if after is not None:
+                return self._forward(after, before, since, until, wanted, limit)
+            return self._backward(before, since, until, wanted, limit)
+
+    def _forward(self, after, before, since, until, wanted, limit):
+        start = 0
+        if after is not None:
+            start = max(0, bisect_right(self._block_seqs, after) - 1)
+        if since is not None:
+            # bisect_left: blocos anteriores podem terminar com o mesmo ts
+            start = max(start, bisect_left(self._block_ts, since) - 1)
+
+        result = []
+        for i in range(start, len(self._blocks)):
+            for record in self._read_block(i):
+                # seq e ts só crescem: passou do limite, acabou
+                if (before is not None and record['seq'] >= before) or (until is not None and record['ts'] > until):
+                    return result
+                if wanted(record):
+                    result.append(record)
+                    if len(result) >= limit:
+                        return result
+        return result
+
+    def _backward(self, before, since, until, wanted, limit):
+        result = []
+
+        # Primeiro o tail em memória
+        for record in reversed(self._tail):
+            if since is not None and record['ts'] < since:
+                return result
+            if wanted(record):
+                result.append(record)
+                if len(result) >= limit:
+                    return result
+        if len(self._tail) == self.records:
+            return result
+
+        # Depois os blocos em disco, anteriores ao tail
+        upper = self._tail[0]['seq'] - 1 if self._tail else self.last_seq
+        if before is not None:
+            upper = min(upper, before - 1)
+        i = bisect_right(self._block_seqs, upper) - 1
+        if until is not None:
+            i = min(i, bisect_right(self._block_ts, until) - 1)
+
+        while i >= 0:
+            for record in reversed(self._read_block(i)):
+                if since is not None and record['ts'] < since:
+                    return result
+                if record['seq'] <= upper and wanted(record):
+                    result.append(record)
+                    if len(result) >= limit:
+                        return result
+            i -= 1
+        return result
+
+    def stats(self):
+        """Resumo para o /status"""
+        with self._lock:
+            return {
+                'directory': self.directory,
+                'records': self.records,
+                'last_seq': self.last_seq,
+                'segments': len({block[2] for block in self._blocks}),
+                'index_entries': len(self._blocks),
+                'tail_cached': len(self._tail)
+            }
@@ -0,0 +1,64 @@
+# ═══════════════════════════════════════════════════════════════════════
+# GOLDAI PRO - SNAPSHOT EM DISCO (WARM START)
+# ═══════════════════════════════════════════════════════════════════════
+
+import json
+import logging
+import os
+import time
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+# Incrementar quando o formato do snapshot mudar
+SNAPSHOT_VERSION = 1
+
+
+def _encode(value):
+    if isinstance(value, datetime):
+        return {'__dt__': value.isoformat()}
+    raise TypeError(f"Tipo não serializável: {type(value).__name__}")
+
+
+def _decode(obj):
+    if '__dt__' in obj and len(obj) == 1:
+        return datetime.fromisoformat(obj['__dt__'])
+    return obj
+
+
+def save_snapshot(path, payload):
+    """Grava o snapshot de forma atômica (arquivo temporário + rename)"""
+    data = {
+        'version': SNAPSHOT_VERSION,
+        'written_at': time.time(),
+        **payload
+    }
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, default=_encode, ensure_ascii=False, separators=(',', ':'))
+    os.replace(tmp_path, path)
+    return data['written_at']
+
+
+def load_snapshot(path, max_age_seconds):
+    """Lê o snapshot; retorna None se não existir, for de outra versão ou velho demais"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f, object_hook=_decode)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning(f"[WARN] Snapshot inválido em {path}: {e}")
+        return None
+
+    if data.get('version') != SNAPSHOT_VERSION:
+        logger.warning(f"[WARN] Snapshot com versão {data.get('version')} (esperada {SNAPSHOT_VERSION}), ignorando")
+        return None
+
+    age = time.time() - data.get('written_at', 0)
+    if age > max_age_seconds:
+        logger.warning(f"[WARN] Snapshot com {age / 3600:.1f}h de idade, ignorando")
+        return None
+
+    data['age_seconds'] = age
+    return data
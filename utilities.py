@@ -2,7 +2,7 @@
 # GOLDAI PRO - UTILITÁRIOS E FERRAMENTAS
 # ═══════════════════════════════════════════════════════════════════════
 
-import requests
+from http_client import http_get, http_post
 import json
 from datetime import datetime
 import time
@@ -43,7 +43,7 @@ def real_time_monitor(interval_seconds=10):
             
             # Status do sistema
             try:
-                response = requests.get(f"{SERVER_URL}/status", timeout=5)
+                response = http_get(f"{SERVER_URL}/status", timeout=5)
                 if response.status_code == 200:
                     data = response.json()
                     
@@ -105,7 +105,7 @@ def export_calendar_to_csv():
     print("📊 Exportando calendário econômico...\n")
     
     try:
-        response = requests.get(f"{SERVER_URL}/calendar", timeout=10)
+        response = http_get(f"{SERVER_URL}/calendar", timeout=10)
         
         if response.status_code == 200:
             data = response.json()
@@ -155,7 +155,7 @@ def test_trading_signal(action='BUY', confidence=0.75, adx=30, rsi=55):
     }
     
     try:
-        response = requests.post(
+        response = http_post(
             f"{SERVER_URL}/signal",
             json=payload,
             headers={'Content-Type': 'application/json'},
@@ -203,16 +203,22 @@ def test_trading_signal(action='BUY', confidence=0.75, adx=30, rsi=55):
 # 4. ANALISAR NOTÍCIAS
 # ═══════════════════════════════════════════════════════════════════════
 
-def analyze_news(limit=10, sentiment_filter=None):
-    """Analisa notícias recentes"""
+def analyze_news(limit=10, sentiment_filter=None, source=None, min_relevance=None, since=None):
+    """Analisa notícias recentes (filtros aplicados no servidor)"""
     print("📰 Analisando notícias...\n")
     
     try:
         params = {'limit': limit}
         if sentiment_filter:
             params['sentiment'] = sentiment_filter
+        if source:
+            params['source'] = source
+        if min_relevance is not None:
+            params['min_relevance'] = min_relevance
+        if since:
+            params['since'] = since
         
-        response = requests.get(f"{SERVER_URL}/news", params=params, timeout=10)
+        response = http_get(f"{SERVER_URL}/news", params=params, timeout=10)
         
         if response.status_code == 200:
             data = response.json()
@@ -261,16 +267,30 @@ def analyze_news(limit=10, sentiment_filter=None):
 # 5. EXPORTAR HISTÓRICO DE SINAIS
 # ═══════════════════════════════════════════════════════════════════════
 
-def export_signal_history():
-    """Exporta histórico de sinais para CSV"""
+def export_signal_history(since=None, page_size=1000):
+    """Exporta histórico de sinais para CSV (todas as páginas do /history)"""
     print("📊 Exportando histórico de sinais...\n")
     
     try:
-        response = requests.get(f"{SERVER_URL}/history?limit=200", timeout=10)
+        signals = []
+        params = {'limit': page_size}
+        if since:
+            params['since'] = since
         
-        if response.status_code == 200:
+        # Pagina do mais novo para o mais antigo pelo cursor `before`
+        while True:
+            response = http_get(f"{SERVER_URL}/history", params=params, timeout=10)
+            if response.status_code != 200:
+                break
             data = response.json()
-            signals = data.get('signals', [])
+            page = data.get('signals', [])
+            signals.extend(page)
+            if len(page) < page_size:
+                break
+            params['before'] = data['cursor']['before']
+        
+        if response.status_code == 200:
+            signals.reverse()
             stats = data.get('statistics', {})
             
             if not signals:
@@ -283,7 +303,7 @@ def export_signal_history():
             
             # Escrever CSV
             with open(filename, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.DictWriter(f, fieldnames=['timestamp', 'action', 'confidence', 'price'])
+                writer = csv.DictWriter(f, fieldnames=['timestamp', 'action', 'confidence', 'price'], extrasaction='ignore')
                 writer.writeheader()
                 writer.writerows(signals)
             
@@ -311,7 +331,7 @@ def force_update():
     print("🔄 Forçando atualização de dados...\n")
     
     try:
-        response = requests.post(f"{SERVER_URL}/force-update", timeout=10)
+        response = http_post(f"{SERVER_URL}/force-update", timeout=10)
         
         if response.status_code == 200:
             data = response.json()
@@ -352,7 +372,7 @@ def health_check():
     for endpoint, name in endpoints:
         try:
             start = time.time()
-            response = requests.get(f"{SERVER_URL}{endpoint}", timeout=5)
+            response = http_get(f"{SERVER_URL}{endpoint}", timeout=5)
             elapsed = (time.time() - start) * 1000
             
             if response.status_code == 200:
@@ -396,7 +416,7 @@ def generate_report():
             
             # Status
             try:
-                response = requests.get(f"{SERVER_URL}/status", timeout=5)
+                response = http_get(f"{SERVER_URL}/status", timeout=5)
                 if response.status_code == 200:
                     data = response.json()
                     f.write("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n")
@@ -409,7 +429,7 @@ def generate_report():
             
             # Calendário
             try:
-                response = requests.get(f"{SERVER_URL}/calendar", timeout=5)
+                response = http_get(f"{SERVER_URL}/calendar", timeout=5)
                 if response.status_code == 200:
                     data = response.json()
                     f.write("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n")
@@ -426,7 +446,7 @@ def generate_report():
             
             # Notícias
             try:
-                response = requests.get(f"{SERVER_URL}/news?limit=10", timeout=5)
+                response = http_get(f"{SERVER_URL}/news?limit=10", timeout=5)
                 if response.status_code == 200:
                     data = response.json()
                     f.write("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n")
@@ -441,7 +461,7 @@ def generate_report():
             
             # Histórico
             try:
-                response = requests.get(f"{SERVER_URL}/history?limit=50", timeout=5)
+                response = http_get(f"{SERVER_URL}/history?limit=50", timeout=5)
                 if response.status_code == 200:
                     data = response.json()
                     f.write("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n")
@@ -540,7 +560,7 @@ if __name__ == '__main__':
     try:
         # Verificar se servidor está acessível
         try:
-            response = requests.get(f"{SERVER_URL}/health", timeout=3)
+            response = http_get(f"{SERVER_URL}/health", timeout=3)
             if response.status_code != 200:
                 print("⚠️ Servidor não está respondendo corretamente!")
                 print(f"   Certifique-se de que está rodando em {SERVER_URL}\n")